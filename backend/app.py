@@ -1,21 +1,31 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional, Union
-import traceback
 import json
 import os
 from datetime import datetime
 import random
 from contextlib import asynccontextmanager
 
-from backend.model import Model, Link, LinkType, Object, ClassificationTree, formula_to_model, is_valid_example
+from backend.model import Model, Link, LinkType, Object, ClassificationTree, MatchNetwork, formula_to_model, is_valid_example
 from backend.pl1_parser import parse_pl1_formula, parse_pl1_dataset, Formula, Predicate
 from backend.learner import WinstonLearner
+from backend.history import ModelHistory
+from backend.model_codec import encode_model, decode_model, ModelCodecError
+from backend.pl1_index import PL1FileIndex, diff_block_hashes
+from backend.ingest import ingest_examples, ParseCache
+from backend.logs import get_logger, trace_request, get_levels, set_level
+from backend.dataset_cache import content_hash, cache_path, load_compiled_dataset, save_compiled_dataset
+from backend.taxonomy_file import load_taxonomy, TaxonomyFileError
+from backend.batch_compare import BatchExample, iter_batch_examples, compare_examples
 
 app = FastAPI(title="PL1 Learning System")
 
+log = get_logger("api")
+parser_log = get_logger("parser")
+
 # Povolenie CORS pre frontend
 app.add_middleware(
     CORSMiddleware,
@@ -31,9 +41,43 @@ classification_tree = ClassificationTree()
 learner = WinstonLearner(classification_tree)
 dataset_examples = []  # Zoznam všetkých príkladov v datasete
 training_history = []  # História trénovania (použité príklady)
-model_history = []  # Historie stavů modelu pro navigaci vpřed/zpět
+model_history = ModelHistory()  # Historie stavů modelu pro navigaci vpřed/zpět (snímky + rozdíly)
 current_history_index = -1  # Aktuální index v historii modelu
 MAX_HISTORY_SIZE = 30  # Maximálny počet krokov v histórií
+dataset_index = None  # PL1FileIndex, ak bol dataset načítaný zo súboru na serveri
+dataset_source_path = None  # Cesta k súboru načítaného datasetu
+dataset_block_hashes = []  # Hashe blokov príkladov načítaného súboru (pre inkrementálne načítanie)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATASET_CACHE_DIR = os.path.join(DATA_DIR, ".cache")  # Skompilované datasety (.pl1c) a taxonómie (.pl1t) podľa hashu obsahu
+TAXONOMY_PATH = os.path.join(DATA_DIR, "taxonomy.txt")  # Klasifikačný strom tried (riadky "Trieda < Rodič")
+parse_cache = ParseCache()  # Sparsované formuly a modely jednotlivých príkladov podľa hashu textu
+last_debug_trace = None  # Ladiaci záznam poslednej požiadavky s parametrom debug_trace
+dataset_verdicts = MatchNetwork()  # Verdikty príkladov datasetu podľa aktuálneho modelu (aktualizujú sa inkrementálne)
+
+@app.middleware("http")
+async def debug_trace_middleware(request: Request, call_next):
+    """
+    Zapne ladiaci záznam (kruhový buffer správ všetkých subsystémov vrátane DEBUG)
+    pre požiadavku s parametrom ?debug_trace=1 alebo hlavičkou X-Debug-Trace.
+    Záznam je potom dostupný cez GET /api/debug-trace.
+    """
+    global last_debug_trace
+    
+    if not (request.query_params.get("debug_trace") or request.headers.get("X-Debug-Trace")):
+        return await call_next(request)
+    
+    with trace_request() as trace:
+        response = await call_next(request)
+    
+    last_debug_trace = {
+        "method": request.method,
+        "path": request.url.path,
+        "timestamp": datetime.now().isoformat(),
+        "dropped": trace.dropped,
+        "records": trace.to_list()
+    }
+    response.headers["X-Debug-Trace-Records"] = str(len(trace))
+    return response
 
 # Dátové modely pre API
 class PL1Example(BaseModel):
@@ -41,6 +85,13 @@ class PL1Example(BaseModel):
     is_positive: bool
     name: Optional[str] = None
 
+class LogLevelRequest(BaseModel):
+    subsystem: str
+    level: str
+
+class DatasetFileRequest(BaseModel):
+    path: str  # Cesta k súboru .pl1 relatívne k adresáru data/
+
 class TrainingRequest(BaseModel):
     example_ids: List[int]
     retrain_mode: str = "incremental"  # "incremental" alebo "full"
@@ -67,49 +118,22 @@ class ModelVisualization(BaseModel):
 
 # Pomocné funkcie
 def initialize_classification_tree():
-    """Inicializuje klasifikačný strom so základnými triedami."""
+    """
+    Inicializuje klasifikačný strom zo súboru taxonómie (TAXONOMY_PATH).
+    
+    Skompilovaný strom sa ukladá do DATASET_CACHE_DIR, takže pri ďalšom
+    štarte sa načíta bez skladania vzťahov a prepočtu uzáveru predkov.
+    """
     global classification_tree
     
-    # Vytvoríme nový strom
-    classification_tree = ClassificationTree()
-    print(f"Inicializujem klasifikačný strom...")
-    
-    # Základné triedy pre BMW príklady
-    classification_tree.add_relationship("Vehicle", None)  # Koreňová trieda
-    
-    # Triedy BMW
-    classification_tree.add_relationship("BMW", "Vehicle")
-    classification_tree.add_relationship("Series3", "BMW")
-    classification_tree.add_relationship("Series5", "BMW")
-    classification_tree.add_relationship("Series7", "BMW")
-    classification_tree.add_relationship("X5", "BMW")
-    classification_tree.add_relationship("X7", "BMW")
-    
-    # Komponenty
-    classification_tree.add_relationship("Component", None)
-    
-    # Motory
-    classification_tree.add_relationship("Engine", "Component")
-    classification_tree.add_relationship("DieselEngine", "Engine")
-    classification_tree.add_relationship("PetrolEngine", "Engine")
-    classification_tree.add_relationship("HybridEngine", "Engine")
-    
-    # Prevodovky
-    classification_tree.add_relationship("Transmission", "Component")
-    classification_tree.add_relationship("AutomaticTransmission", "Transmission")
-    classification_tree.add_relationship("ManualTransmission", "Transmission")
-    
-    # Pohony
-    classification_tree.add_relationship("DriveSystem", "Component")
-    classification_tree.add_relationship("RWD", "DriveSystem")  # Rear-wheel drive
-    classification_tree.add_relationship("AWD", "DriveSystem")  # All-wheel drive
-    classification_tree.add_relationship("XDrive", "AWD")       # BMW xDrive je typ AWD
-    
-    print(f"Klasifikačný strom inicializovaný, obsahuje {len(classification_tree.parent_map)} vzťahov rodič-dieťa")
-    
-    # Vypíšeme obsah stromu pre debugovanie
-    for child, parent in classification_tree.parent_map.items():
-        print(f"  {child} -> {parent or 'ROOT'}")
+    log.info("Inicializujem klasifikačný strom zo súboru %s...", TAXONOMY_PATH)
+    try:
+        classification_tree = load_taxonomy(TAXONOMY_PATH, cache_dir=DATASET_CACHE_DIR)
+    except (OSError, TaxonomyFileError) as e:
+        log.error("Taxonómiu sa nepodarilo načítať, používam prázdny strom: %s", e)
+        classification_tree = ClassificationTree()
+    
+    log.info("Klasifikačný strom inicializovaný, obsahuje %s vzťahov rodič-dieťa", len(classification_tree.parent_map))
 
 def formula_to_model(formula: Formula) -> Model:
     """Konvertuje PL1 formulu na model."""
@@ -119,12 +143,12 @@ def formula_to_model(formula: Formula) -> Model:
     
     # Kontrola prázdnej formuly
     if not formula or not formula.get_all_predicates():
-        print("Warning: Empty formula or no predicates found")
+        parser_log.warning("Empty formula or no predicates found")
         return Model(objects=[], links=[])
     
     # Extrahuj všetky predikáty z formuly
     predicates = formula.get_all_predicates()
-    print(f"Processing {len(predicates)} predicates")
+    parser_log.debug("Processing %s predicates", len(predicates))
     
     # Najprv spracuj predikáty typu "Ι" (is_a) na identifikáciu objektov a ich tried
     for predicate in predicates:
@@ -145,7 +169,7 @@ def formula_to_model(formula: Formula) -> Model:
             
             # Skontroluj, či objekty existujú
             if source not in object_classes or target not in object_classes:
-                print(f"Warning: Missing object definition for link {source} -> {target}")
+                parser_log.warning("Missing object definition for link %s -> %s", source, target)
                 continue
             
             links.append(Link(source=source, target=target, link_type=LinkType.REGULAR))
@@ -156,7 +180,7 @@ def formula_to_model(formula: Formula) -> Model:
             
             # Skontroluj, či objekty existujú
             if source not in object_classes or target not in object_classes:
-                print(f"Warning: Missing object definition for link {source} -> {target}")
+                parser_log.warning("Missing object definition for link %s -> %s", source, target)
                 continue
             
             links.append(Link(source=source, target=target, link_type=LinkType.MUST))
@@ -167,7 +191,7 @@ def formula_to_model(formula: Formula) -> Model:
             
             # Skontroluj, či objekty existujú
             if source not in object_classes or target not in object_classes:
-                print(f"Warning: Missing object definition for link {source} -> {target}")
+                parser_log.warning("Missing object definition for link %s -> %s", source, target)
                 continue
             
             links.append(Link(source=source, target=target, link_type=LinkType.MUST_NOT))
@@ -179,7 +203,7 @@ def formula_to_model(formula: Formula) -> Model:
             
             # Skontroluj, či objekt existuje
             if obj_name not in object_classes:
-                print(f"Warning: Missing object definition for attribute {obj_name}.{attr_name}")
+                parser_log.warning("Missing object definition for attribute %s.%s", obj_name, attr_name)
                 continue
             
             # Nájdi objekt a pridaj mu atribút
@@ -228,20 +252,64 @@ def generate_model_visualization(model: Model):
     try:
         return model.to_semantic_network()
     except Exception as e:
-        print(f"Error generating model visualization: {str(e)}")
-        traceback.print_exc()
+        log.exception("Error generating model visualization: %s", e)
         return {"nodes": [], "links": [], "error": str(e)}
 
 def get_timestamp():
     """Vráti aktuálny časový údaj vo formáte ISO 8601."""
     return datetime.now().isoformat()
 
+def get_example_formula_text(example: Dict[str, Any]) -> str:
+    """
+    Vráti text formuly príkladu z datasetu.
+    
+    Príklady načítané zo súboru na serveri text nedržia v pamäti,
+    prečíta sa priamo z namapovaného súboru cez index.
+    """
+    if example.get("formula") is not None:
+        return example["formula"]
+    return dataset_index.text(example["id"])
+
+def get_example_parsed_formula(example: Dict[str, Any]) -> Formula:
+    """
+    Vráti sparsovanú formulu príkladu z datasetu.
+    
+    Pri príkladoch načítaných zo súboru (alebo spracovaných paralelne) sa
+    parsuje len tento jeden príklad a výsledok sa neukladá, aby v pamäti
+    nezostávali všetky sparsované príklady.
+    """
+    if example.get("parsed_formula") is not None:
+        return example["parsed_formula"]
+    if example.get("formula") is not None:
+        return parse_pl1_formula(example["formula"])
+    return dataset_index.get(example["id"]).formula
+
+def refresh_dataset_verdicts(parse_missing: bool = False) -> None:
+    """
+    Aktualizuje tabuľku verdiktov datasetu (dataset_verdicts) podľa aktuálneho modelu.
+    
+    Do siete sa pridajú príklady, ktoré už majú model (nahraté alebo použité
+    pri trénovaní), s parse_missing sa sparsujú aj ostatné. Po zmene modelu
+    sa znova vyhodnotia len pravidlá, ktoré sa zmenili.
+    """
+    for example in dataset_examples:
+        if example["id"] in dataset_verdicts:
+            continue
+        try:
+            if example.get("model"):
+                dataset_verdicts.add_example(example["id"], Model.from_dict(example["model"]))
+            elif parse_missing:
+                dataset_verdicts.add_example(example["id"], formula_to_model(get_example_parsed_formula(example)))
+        except Exception as e:
+            log.error("Error adding example %s to verdict table: %s", example["id"], e)
+    dataset_verdicts.update(current_model, classification_tree)
+
 # Inicializácia aplikácie
 @app.on_event("startup")
 async def startup_event():
     """Inicializuje aplikáciu pri štarte."""
     initialize_classification_tree()
-    print("Aplikácia bola inicializovaná.")
+    log.info("Aplikácia bola inicializovaná.")
 
 # API endpointy
 @app.get("/")
@@ -250,81 +318,234 @@ async def root():
     return {"message": "PL1 Learning System API is running"}
 
 @app.post("/api/upload-dataset")
-async def upload_dataset(examples: List[PL1Example]):
-    """Nahrá dataset príkladov vo formáte PL1."""
-    global dataset_examples
+async def upload_dataset(examples: List[PL1Example], parallel: bool = False, workers: Optional[int] = None,
+                         use_cache: bool = True):
+    """
+    Nahrá dataset príkladov vo formáte PL1.
+    
+    Parameter parallel zapne paralelné parsovanie a konverziu príkladov
+    vo viacerých procesoch (vhodné pre datasety so stovkami tisíc príkladov).
+    
+    Sparsované formuly a modely sa uložia do skompilovanej cache (.pl1c)
+    podľa hashu obsahu formúl. Opätovné nahratie rovnakého datasetu sa potom
+    načíta z cache bez parsovania; zastaraná alebo poškodená cache sa prebuduje.
+    """
+    global dataset_examples, dataset_index, dataset_source_path, dataset_block_hashes
     
     try:
         # Vyčisti existujúci dataset
         dataset_examples = []
+        dataset_verdicts.clear()
+        if dataset_index is not None:
+            dataset_index.close()
+            dataset_index = None
+        dataset_source_path = None
+        dataset_block_hashes = []
         
-        print(f"Received {len(examples)} examples for upload")
+        log.info("Received %s examples for upload (parallel=%s)", len(examples), parallel)
         
-        # Spracuj každý príklad
-        for i, example in enumerate(examples):
-            try:
-                print(f"Processing example {i+1}: {example.name}")
-                print(f"Formula: {example.formula}")
-                print(f"Is positive: {example.is_positive}")
-                
-                # Skontroluj, či formula nie je prázdna
-                if not example.formula or not example.formula.strip():
-                    return JSONResponse(
-                        status_code=400,
-                        content={"success": False, "message": f"Príklad {i+1} má prázdnu formulu"}
-                    )
-                
-                # Parsuj formulu
-                try:
-                    formula = parse_pl1_formula(example.formula)
-                    
-                    # Vytvor model z formuly
-                    model = formula_to_model(formula)
-                    
-                    # Pridaj do datasetu
-                    dataset_examples.append({
-                        "id": i,
-                        "formula": example.formula,
-                        "parsed_formula": formula,
-                        "model": model.to_dict(),  # Ulož model ako slovník
-                        "is_positive": example.is_positive,
-                        "name": example.name or f"Example {i+1}",
-                        "used_in_training": False
-                    })
-                    print(f"Example {i+1} processed successfully")
-                except Exception as parse_error:
-                    print(f"Error parsing example {i+1}: {str(parse_error)}")
-                    traceback.print_exc()
-                    return JSONResponse(
-                        status_code=400,
-                        content={"success": False, "message": f"Chyba pri parsovaní príkladu {i+1}: {str(parse_error)}"}
-                    )
-            except Exception as e:
-                print(f"Unexpected error processing example {i+1}: {str(e)}")
-                traceback.print_exc()
+        texts = [example.formula for example in examples]
+        cache_key = content_hash(texts)
+        cache_file = cache_path(DATASET_CACHE_DIR, cache_key)
+        
+        cached = load_compiled_dataset(cache_file, cache_key) if use_cache else None
+        if cached is not None:
+            log.info("Loaded %s examples from compiled cache %s", len(cached), os.path.basename(cache_file))
+            for i, (example, entry) in enumerate(zip(examples, cached)):
+                dataset_examples.append({
+                    "id": i,
+                    "formula": example.formula,
+                    "parsed_formula": entry.formula,
+                    "model": entry.model,
+                    "is_positive": example.is_positive,
+                    "name": example.name or f"Example {i+1}",
+                    "used_in_training": False
+                })
+            return {"success": True, "message": f"Dataset s {len(examples)} príkladmi bol úspešne nahraný."}
+        
+        # Parsuj formuly a vytvor z nich modely
+        results = ingest_examples(
+            texts,
+            formula_to_model,
+            parallel=parallel,
+            workers=workers,
+            cache=parse_cache
+        )
+        
+        # Spracuj výsledky v pôvodnom poradí, prvá chyba ukončí nahrávanie
+        for example, result in zip(examples, results):
+            i = result.index
+            
+            # Skontroluj, či formula nie je prázdna
+            if result.empty:
                 return JSONResponse(
                     status_code=400,
-                    content={"success": False, "message": f"Neočakávaná chyba pri spracovaní príkladu {i+1}: {str(e)}"}
+                    content={"success": False, "message": f"Príklad {i+1} má prázdnu formulu"}
                 )
+            
+            if result.error is not None:
+                log.error("Error parsing example %s: %s", i + 1, result.error)
+                return JSONResponse(
+                    status_code=400,
+                    content={"success": False, "message": f"Chyba pri parsovaní príkladu {i+1}: {result.error}"}
+                )
+            
+            # Pridaj do datasetu
+            dataset_examples.append({
+                "id": i,
+                "formula": example.formula,
+                "parsed_formula": result.formula,
+                "model": result.model,  # Model uložený ako slovník
+                "is_positive": example.is_positive,
+                "name": example.name or f"Example {i+1}",
+                "used_in_training": False
+            })
+        
+        # Ukladá sa len úspešne nahraný dataset
+        if use_cache:
+            save_compiled_dataset(cache_file, cache_key, [(result.formula, result.model) for result in results])
         
         return {"success": True, "message": f"Dataset s {len(examples)} príkladmi bol úspešne nahraný."}
     
     except Exception as e:
-        print(f"Unexpected error in upload_dataset: {str(e)}")
-        traceback.print_exc()
+        log.exception("Unexpected error in upload_dataset: %s", e)
         raise HTTPException(status_code=500, detail=f"Chyba pri nahrávaní datasetu: {str(e)}")
 
+@app.get("/api/parse-cache")
+async def get_parse_cache_stats():
+    """Vráti počítadlá zásahov a výpadkov cache sparsovaných formúl."""
+    return parse_cache.stats()
+
+@app.get("/api/debug-trace")
+async def get_debug_trace():
+    """Vráti ladiaci záznam poslednej požiadavky so zapnutým debug_trace."""
+    if last_debug_trace is None:
+        return {"success": False, "message": "Žiadny ladiaci záznam nie je k dispozícii."}
+    return {"success": True, **last_debug_trace}
+
+@app.get("/api/log-levels")
+async def get_log_levels():
+    """Vráti úrovne logovania jednotlivých subsystémov."""
+    return get_levels()
+
+@app.post("/api/log-levels")
+async def update_log_level(request: LogLevelRequest):
+    """Nastaví úroveň logovania subsystému (parser, learner, api)."""
+    try:
+        set_level(request.subsystem, request.level)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"success": False, "message": str(e)})
+    return {"success": True, "levels": get_levels()}
+
+@app.post("/api/load-dataset-file")
+async def load_dataset_file(request: DatasetFileRequest):
+    """
+    Načíta dataset zo súboru .pl1 v adresári data/ na serveri.
+    
+    Súbor sa nečíta celý - otvorí sa cez PL1FileIndex (mmap + index posunov
+    príkladov uložený vedľa súboru) a príklady sa parsujú až pri prístupe.
+    
+    Pri opätovnom načítaní toho istého súboru sa porovnajú hashe blokov
+    s predchádzajúcou verziou: nezmenené príklady sa prevezmú, sparsujú sa len
+    zmenené a pridané a odpoveď obsahuje ID zmenených, odstránených
+    a presunutých príkladov.
+    """
+    global dataset_examples, dataset_index, dataset_source_path, dataset_block_hashes
+    
+    path = os.path.realpath(os.path.join(DATA_DIR, request.path))
+    if os.path.commonpath([path, os.path.realpath(DATA_DIR)]) != os.path.realpath(DATA_DIR):
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "message": "Súbor musí byť v adresári data/."}
+        )
+    if not os.path.isfile(path):
+        return JSONResponse(
+            status_code=404,
+            content={"success": False, "message": f"Súbor {request.path} neexistuje."}
+        )
+    
+    try:
+        new_index = PL1FileIndex(path)
+        new_hashes = new_index.block_hashes()
+    except Exception as e:
+        log.exception("Error loading dataset file %s: %s", request.path, e)
+        raise HTTPException(status_code=500, detail=f"Chyba pri načítaní súboru: {str(e)}")
+    
+    # Opätovné načítanie toho istého súboru - porovnajú sa hashe blokov s predchádzajúcou verziou
+    reload = dataset_index is not None and dataset_source_path == path
+    diff = diff_block_hashes(dataset_block_hashes if reload else [], new_hashes)
+    
+    previous_examples = dataset_examples
+    if dataset_index is not None:
+        dataset_index.close()
+    dataset_index = new_index
+    dataset_source_path = path
+    dataset_block_hashes = new_hashes
+    
+    # Pre každý príklad držíme len metadáta z hlavičky, formula sa načíta až pri použití.
+    # Nezmenené príklady si ponechajú model a stav z predchádzajúcej verzie.
+    dataset_examples = []
+    dataset_verdicts.clear()
+    for i in range(len(dataset_index)):
+        old_id = diff.retained.get(i)
+        if old_id is not None:
+            dataset_examples.append({**previous_examples[old_id], "id": i})
+            continue
+        
+        name = dataset_index.name(i)
+        dataset_examples.append({
+            "id": i,
+            "formula": None,
+            "parsed_formula": None,
+            "is_positive": dataset_index.is_positive(i),
+            "name": name or f"Example {i+1}",
+            "used_in_training": False
+        })
+    
+    if not reload:
+        return {"success": True, "message": f"Dataset s {len(dataset_examples)} príkladmi bol načítaný zo súboru {request.path}."}
+    
+    # Zmenené a pridané príklady sa hneď sparsujú a skonvertujú, aby sa chyby ukázali pri načítaní
+    errors = []
+    results = ingest_examples(
+        [dataset_index.text(i) for i in diff.changed],
+        formula_to_model,
+        cache=parse_cache
+    )
+    for example_id, result in zip(diff.changed, results):
+        if result.error is not None or result.empty:
+            errors.append({"id": example_id, "message": result.error or "Prázdna formula"})
+        else:
+            dataset_examples[example_id]["model"] = result.model
+    
+    log.info("Reloaded %s: %s changed, %s removed, %s retained",
+             request.path, len(diff.changed), len(diff.removed), len(diff.retained))
+    
+    return {
+        "success": True,
+        "message": f"Dataset zo súboru {request.path} bol aktualizovaný ({len(diff.changed)} zmenených, {len(diff.removed)} odstránených príkladov).",
+        "changed_ids": diff.changed,
+        "removed_ids": diff.removed,
+        "moved_ids": {str(new_id): old_id for new_id, old_id in diff.moved.items()},
+        "errors": errors
+    }
+
 @app.get("/api/dataset")
-async def get_dataset():
-    """Vráti všetky príklady v datasete."""
+async def get_dataset(offset: int = 0, limit: Optional[int] = None):
+    """
+    Vráti príklady v datasete.
+    
+    Parametre offset a limit umožňujú stránkovanie, aby pri veľkých
+    datasetoch nebolo potrebné naraz čítať všetky formuly.
+    """
     global dataset_examples, training_history
     
     examples_to_return = []
     
     # Zlep výpis pre debugging
-    print(f"GET /api/dataset: {len(dataset_examples)} examples available")
+    log.debug("GET /api/dataset: %s examples available", len(dataset_examples))
     used_count = sum(1 for ex in dataset_examples if ex.get("used_in_training", False))
-    print(f"Currently marked as used: {used_count} examples")
+    log.debug("Currently marked as used: %s examples", used_count)
     
     # Zbierame všetky ID z tréningovej histórie
     used_example_ids = set()
@@ -332,22 +553,23 @@ async def get_dataset():
     for entry in training_history:
         if "example_id" in entry:
             used_example_ids.add(entry["example_id"])
-            print(f"Found example_id in history: {entry['example_id']}")
+            log.debug("Found example_id in history: %s", entry['example_id'])
         if "negative_ids" in entry and isinstance(entry["negative_ids"], list):
             for neg_id in entry["negative_ids"]:
                 used_example_ids.add(neg_id)
-                print(f"Found negative_id in history: {neg_id}")
+                log.debug("Found negative_id in history: %s", neg_id)
     
-    print(f"Total IDs found in training history: {len(used_example_ids)}")
+    log.debug("Total IDs found in training history: %s", len(used_example_ids))
     
     # Vytvor zoznam príkladov pre odpoveď
-    for example in dataset_examples:
+    end = len(dataset_examples) if limit is None else offset + limit
+    for example in dataset_examples[offset:end]:
         # Skontrolujeme známy stav aj históriu
         is_used = example["used_in_training"] or example["id"] in used_example_ids
         
         examples_to_return.append({
             "id": example["id"],
-            "formula": example["formula"],
+            "formula": get_example_formula_text(example),
             "is_positive": example["is_positive"],
             "name": example["name"],
             "used_in_training": is_used
@@ -355,10 +577,10 @@ async def get_dataset():
         
         # Aktualizujeme stav v globálnych dátach
         if is_used and not example["used_in_training"]:
-            print(f"Updating example {example['id']} as used based on history")
+            log.debug("Updating example %s as used based on history", example['id'])
             example["used_in_training"] = True
     
-    return {"examples": examples_to_return}
+    return {"examples": examples_to_return, "total": len(dataset_examples)}
 
 # Trieda pre evidenciu použitých heuristík
 class HeuristicTracker:
@@ -387,11 +609,11 @@ def track_winston_learner(original_learner, tracker):
             self.tracker = tracker
             self.last_applied_heuristic = None
             self.classification_tree = original_learner.classification_tree
-            self.debug_enabled = True  # Zapneme debugovanie pre lepšiu diagnostiku
+            self.debug_enabled = False
             
             # Kontrola, či klasifikačný strom obsahuje údaje
             parent_relations = len(self.classification_tree.parent_map)
-            print(f"[WinstonLearnerProxy] Klasifikačný strom obsahuje {parent_relations} vzťahov rodič-dieťa.")
+            log.debug("[WinstonLearnerProxy] Klasifikačný strom obsahuje %s vzťahov rodič-dieťa.", parent_relations)
         
         def update_model(self, current_model, good_example, near_miss):
             result = self.original_learner.update_model(current_model, good_example, near_miss)
@@ -464,13 +686,13 @@ async def train_model(training_request: TrainingRequest):
         example_ids = training_request.example_ids
         retrain_mode = training_request.retrain_mode
         
-        print(f"Training request: {len(example_ids)} examples, retrain_mode={retrain_mode}")
+        log.info("Training request: %s examples, retrain_mode=%s", len(example_ids), retrain_mode)
         
         # Ak je retrain_mode, vynuluj model a históriu
         if retrain_mode:
             current_model = Model()
             training_history.clear()
-            print("Retrain mode: Initialized empty model and cleared training history")
+            log.info("Retrain mode: Initialized empty model and cleared training history")
             
             # Pridaj krok inicializácie
             training_steps.append({
@@ -490,7 +712,7 @@ async def train_model(training_request: TrainingRequest):
                 else:
                     negative_ids.append(eid)
                     
-        print(f"Positive examples: {len(positive_ids)}, Negative examples: {len(negative_ids)}")
+        log.info("Positive examples: %s, Negative examples: %s", len(positive_ids), len(negative_ids))
         
         # Získaj modely pre príklady
         positive_examples = []
@@ -505,15 +727,15 @@ async def train_model(training_request: TrainingRequest):
                     example_model = Model.from_dict(example["model"])
                 else:
                     # Vytvor nový model z formuly
-                    formula = example["parsed_formula"]
+                    formula = get_example_parsed_formula(example)
                     example_model = formula_to_model(formula)
                     example["model"] = example_model.to_dict()
                 
                 # Pridaj tuple (id, model) do zoznamu
                 positive_examples.append((example_id, example_model))
-                print(f"Added positive example {example_id}: {len(example_model.objects)} objects")
+                log.debug("Added positive example %s: %s objects", example_id, len(example_model.objects))
             except Exception as e:
-                print(f"Error processing positive example {example_id}: {str(e)}")
+                log.error("Error processing positive example %s: %s", example_id, e)
                 
         # Vytvor modely pre negatívne príklady
         for example_id in negative_ids:
@@ -524,24 +746,26 @@ async def train_model(training_request: TrainingRequest):
                     example_model = Model.from_dict(example["model"])
                 else:
                     # Vytvor nový model z formuly
-                    formula = example["parsed_formula"]
+                    formula = get_example_parsed_formula(example)
                     example_model = formula_to_model(formula)
                     example["model"] = example_model.to_dict()
                 
                 # Pridaj tuple (id, model) do zoznamu
                 negative_examples.append((example_id, example_model))
-                print(f"Added negative example {example_id}: {len(example_model.objects)} objects")
+                log.debug("Added negative example %s: %s objects", example_id, len(example_model.objects))
             except Exception as e:
-                print(f"Error processing negative example {example_id}: {str(e)}")
+                log.error("Error processing negative example %s: %s", example_id, e)
                 
+        # Príklady s modelom sa zaradia do tabuľky verdiktov, tá sa potom aktualizuje po každom kroku
+        refresh_dataset_verdicts()
+        
         # Priprav learner
         local_learner = WinstonLearner(classification_tree)
-        local_learner.debug_enabled = True  # Zapneme debugovanie pre lepšiu diagnostiku
         
         # KROK 1: Inicializácia modelu (ak ešte nebol inicializovaný alebo je režim pretrénovania)
         if not current_model.objects or retrain_mode:
             if positive_examples:
-                print("Initializing model with positive example")
+                log.info("Initializing model with positive example")
                 
                 # Vyber prvý pozitívny príklad pre inicializáciu
                 example_id, example_model = positive_examples[0]
@@ -567,7 +791,7 @@ async def train_model(training_request: TrainingRequest):
                     "heuristics": []
                 })
                 
-                print(f"Model initialized with positive example {example_id}, model has {len(current_model.objects)} objects")
+                log.info("Model initialized with positive example %s, model has %s objects", example_id, len(current_model.objects))
             else:
                 # Nie je k dispozícii žiadny pozitívny príklad pre inicializáciu
                 return {
@@ -587,7 +811,7 @@ async def train_model(training_request: TrainingRequest):
             
             if len(positive_examples) <= 1 and current_model.objects:
                 # Použitie aktuálneho modelu ako pozitívneho príkladu s negatívnymi príkladmi
-                print(f"Updating model with {len(negative_examples)} negative examples only")
+                log.info("Updating model with %s negative examples only", len(negative_examples))
                 
                 negative_example_ids = [ne[0] for ne in negative_examples]
                 negative_example_models = [ne[1] for ne in negative_examples]
@@ -620,10 +844,11 @@ async def train_model(training_request: TrainingRequest):
                     # Ak sa model zmenil, uloží zmeny
                     if pair_learner.last_applied_heuristic:
                         current_model = updated_model
+                        dataset_verdicts.update(current_model, classification_tree)
                         applied_heuristics.extend(pair_tracker.get_all())
                         used_negative_examples.append(neg_id)
                         
-                        print(f"  Applied heuristic '{pair_learner.last_applied_heuristic}' with negative example {neg_id}")
+                        log.debug("  Applied heuristic '%s' with negative example %s", pair_learner.last_applied_heuristic, neg_id)
                 
                 # Pridaj záznamy do histórie trénovania
                 for neg_id in used_negative_examples:
@@ -648,11 +873,11 @@ async def train_model(training_request: TrainingRequest):
                     "heuristics": step_tracker.get_all()  # Použij heuristiky z tohto kroku
                 })
                 
-                print(f"Model updated with negative examples, model has {len(current_model.objects)} objects and {len(current_model.links)} links")
+                log.info("Model updated with negative examples, model has %s objects and %s links", len(current_model.objects), len(current_model.links))
                 
             else:
                 # Máme viac pozitívnych príkladov, použijeme prvý na ďalšie trénovanie
-                print(f"Updating model with {len(positive_examples) - 1} positive examples and {len(negative_examples)} negative examples")
+                log.info("Updating model with %s positive examples and %s negative examples", len(positive_examples) - 1, len(negative_examples))
                 
                 # Použij len zostávajúce pozitívne príklady (bez prvého, ktorý už bol použitý na inicializáciu)
                 remaining_positive = positive_examples[1:] if positive_examples and not retrain_mode else positive_examples
@@ -683,10 +908,11 @@ async def train_model(training_request: TrainingRequest):
                         # Ak sa model zmenil, uloží zmeny
                         if pair_learner.last_applied_heuristic:
                             current_model = updated_model
+                            dataset_verdicts.update(current_model, classification_tree)
                             applied_heuristics.extend(pair_tracker.get_all())
                             used_negative_examples.append(neg_id)
                             
-                            print(f"  Applied heuristic '{pair_learner.last_applied_heuristic}' with negative example {neg_id}")
+                            log.debug("  Applied heuristic '%s' with negative example %s", pair_learner.last_applied_heuristic, neg_id)
                     
                     # Pridaj záznam do histórie trénovania
                     training_history.append({
@@ -710,11 +936,11 @@ async def train_model(training_request: TrainingRequest):
                         "heuristics": applied_heuristics  # Použij zozbierané heuristiky
                     })
                     
-                    print(f"Model updated with positive example {pos_id} and negative examples, model has {len(current_model.objects)} objects")
+                    log.info("Model updated with positive example %s and negative examples, model has %s objects", pos_id, len(current_model.objects))
                 
                 # Ak nemáme žiadne zostávajúce pozitívne príklady, použijeme len negatívne
                 if not remaining_positive and negative_examples:
-                    print(f"Updating model with just {len(negative_examples)} negative examples")
+                    log.info("Updating model with just %s negative examples", len(negative_examples))
                     
                     negative_example_ids = [ne[0] for ne in negative_examples]
                     
@@ -746,10 +972,11 @@ async def train_model(training_request: TrainingRequest):
                             # Ak sa model zmenil, uloží zmeny
                             if pair_learner.last_applied_heuristic:
                                 current_model = updated_model
+                                dataset_verdicts.update(current_model, classification_tree)
                                 applied_heuristics.extend(pair_tracker.get_all())
                                 used_negative_examples.append(neg_id)
                                 
-                                print(f"  Applied heuristic '{pair_learner.last_applied_heuristic}' with negative example {neg_id}")
+                                log.debug("  Applied heuristic '%s' with negative example %s", pair_learner.last_applied_heuristic, neg_id)
                         
                         # Pridaj záznamy do histórie trénovania
                         for neg_id in used_negative_examples:
@@ -779,13 +1006,13 @@ async def train_model(training_request: TrainingRequest):
                             "heuristics": applied_heuristics  # Použij zozbierané heuristiky
                         })
                         
-                        print(f"Model updated using last positive example with negative examples, model has {len(current_model.objects)} objects and {len(current_model.links)} links")
+                        log.info("Model updated using last positive example with negative examples, model has %s objects and %s links", len(current_model.objects), len(current_model.links))
                     else:
                         # Nemáme žiadny pozitívny príklad, nemôžeme pokračovať s Winstonovým prístupom
-                        print("No positive examples available, cannot apply Winston's algorithm with only negative examples")
+                        log.info("No positive examples available, cannot apply Winston's algorithm with only negative examples")
                 else:
                     # Nie sú k dispozícii žiadne negatívne príklady, skúsime aspoň aktualizovať model s ďalšími pozitívnymi
-                    print("No negative examples available, updating model with remaining positive examples only")
+                    log.info("No negative examples available, updating model with remaining positive examples only")
                     
                     # Použij zvyšné pozitívne príklady (bez prvého, ktorý už bol použitý na inicializáciu)
                     remaining_positive = positive_examples[1:] if positive_examples and not retrain_mode else positive_examples
@@ -807,6 +1034,7 @@ async def train_model(training_request: TrainingRequest):
                         
                         # Aktualizuj aktuálny model
                         current_model = updated_model
+                        dataset_verdicts.update(current_model, classification_tree)
                         
                         # Pridaj záznam do histórie trénovania
                         training_history.append({
@@ -827,7 +1055,7 @@ async def train_model(training_request: TrainingRequest):
                             "heuristics": step_tracker.get_all()  # Použij heuristiky z tohto kroku
                         })
                         
-                        print(f"Applied close_interval heuristic with positive example {pos_id}, model has {len(current_model.objects)} objects")
+                        log.info("Applied close_interval heuristic with positive example %s, model has %s objects", pos_id, len(current_model.objects))
                 
         # Zjednoť zoznam použitých príkladov (odstráň duplicity)
         all_used_example_ids = list(set(used_examples))
@@ -835,11 +1063,11 @@ async def train_model(training_request: TrainingRequest):
         
         # Vypočítaj celkový čas trénovania
         total_time = (datetime.now() - start_time).total_seconds()
-        print(f"Total training time: {total_time:.2f} seconds")
+        log.info("Total training time: %.2f seconds", total_time)
         
         # KROK 5: Príprava odpovede
         training_time = (datetime.now() - start_time).total_seconds()
-        print(f"Training completed in {training_time:.2f} seconds")
+        log.info("Training completed in %.2f seconds", training_time)
         
         # Priprav vizualizáciu modelu
         model_visualization = current_model.to_semantic_network()
@@ -858,10 +1086,11 @@ async def train_model(training_request: TrainingRequest):
         # Na konci po úspěšném tréninku uložíme stav do historie
         # Přidáme na konec funkce před return:
         
+        dataset_verdicts.update(current_model, classification_tree)
+        
         # Uložíme aktuální stav modelu do historie
         save_model_to_history(
             model_state=current_model,
-            visualization=model_visualization,
             steps=training_steps,
             examples_count=used_count
         )
@@ -881,8 +1110,7 @@ async def train_model(training_request: TrainingRequest):
         }
     
     except Exception as e:
-        print(f"Error during training: {str(e)}")
-        traceback.print_exc()
+        log.exception("Error during training: %s", e)
         
         error_step = {
             "step": "error",
@@ -909,8 +1137,8 @@ async def compare_example(example: PL1Example):
         formula = parse_pl1_formula(example.formula)
         example_model = formula_to_model(formula)
         
-        # Porovnaj s naučeným modelom použitím funkcie is_valid_example
-        is_valid, symbolic_differences = is_valid_example(current_model, example_model, classification_tree)
+        # Porovnaj s naučeným modelom - preložený model sa použije znova, kým sa model nezmení
+        is_valid, symbolic_differences = current_model.matcher(classification_tree).match(example_model)
         
         # Vytvor vysvetlenie
         explanation = "Príklad je platný podľa naučeného modelu." if is_valid else "Príklad nie je platný podľa naučeného modelu z nasledujúcich dôvodov:"
@@ -922,9 +1150,89 @@ async def compare_example(example: PL1Example):
         )
     
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Error comparing example: %s", e)
         raise HTTPException(status_code=500, detail=f"Chyba pri porovnávaní príkladu: {str(e)}")
 
+@app.post("/api/compare-batch")
+async def compare_batch(request: Request):
+    """
+    Porovná dávku príkladov s naučeným modelom a výsledky posiela priebežne ako NDJSON.
+    
+    Telo požiadavky je buď JSON zoznam príkladov (ako pri /api/compare,
+    Content-Type application/json), alebo text datasetu .pl1. Všetky príklady
+    sa overujú jedným preloženým modelom (Model.matcher). Každý riadok
+    odpovede je výsledok jedného príkladu, posledný riadok je súhrn
+    s počtami a priepustnosťou (summary=true).
+    """
+    global current_model, classification_tree
+    
+    if not current_model.objects:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "message": "Model ešte nebol natrénovaný."}
+        )
+    
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            items = [PL1Example(**item) for item in json.loads(body)]
+            examples = [BatchExample(text=item.formula, name=item.name, is_positive=item.is_positive) for item in items]
+        else:
+            examples = iter_batch_examples(body.decode("utf-8"))
+    except (ValueError, TypeError) as e:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "message": f"Neplatná dávka príkladov: {str(e)}"}
+        )
+    
+    # Model sa preloží raz - zmena modelu počas porovnávania dávku neovplyvní
+    matcher = current_model.matcher(classification_tree)
+    records = compare_examples(matcher, examples, formula_to_model, cache=parse_cache)
+    log.info("Comparing batch of examples against model with %s objects", len(current_model.objects))
+    
+    return StreamingResponse(
+        (json.dumps(record, ensure_ascii=False) + "\n" for record in records),
+        media_type="application/x-ndjson"
+    )
+
+@app.get("/api/dataset-verdicts")
+async def get_dataset_verdicts(invalid_only: bool = False):
+    """
+    Vráti verdikt aktuálneho modelu pre každý príklad datasetu.
+    
+    Tabuľka sa udržiava inkrementálne (MatchNetwork) - po zmene modelu sa
+    znova vyhodnotia len zmenené pravidlá a príklady, ktorých sa týkajú.
+    Parameter invalid_only vráti len príklady, ktoré model zamieta.
+    """
+    refresh_dataset_verdicts(parse_missing=True)
+    
+    verdicts = []
+    matching_expected = 0
+    for example in dataset_examples:
+        verdict = dataset_verdicts.verdicts.get(example["id"])
+        if verdict is None:
+            continue
+        is_valid, differences = verdict
+        if is_valid == example["is_positive"]:
+            matching_expected += 1
+        if invalid_only and is_valid:
+            continue
+        verdicts.append({
+            "id": example["id"],
+            "name": example["name"],
+            "is_positive": example["is_positive"],
+            "is_valid": is_valid,
+            "differences": differences
+        })
+    
+    return {
+        "verdicts": verdicts,
+        "total": len(dataset_verdicts),
+        "invalid": len(dataset_verdicts.invalid_examples()),
+        "matching_expected": matching_expected,
+        "last_update": dataset_verdicts.last_update
+    }
+
 @app.get("/api/model")
 async def get_model():
     """Vráti aktuálne naučený model vo formáte vhodnom pre vizualizáciu."""
@@ -949,9 +1257,49 @@ async def get_model():
         }
     
     except Exception as e:
-        traceback.print_exc()
+        log.exception("Error getting model: %s", e)
         raise HTTPException(status_code=500, detail=f"Chyba pri získavaní modelu: {str(e)}")
 
+@app.get("/api/model/export")
+async def export_model():
+    """Vráti aktuálny model v binárnom formáte (model_codec) na uloženie."""
+    global current_model
+    
+    try:
+        data = encode_model(current_model)
+    except ModelCodecError as e:
+        log.error("Error exporting model: %s", e)
+        raise HTTPException(status_code=500, detail=f"Model nemožno uložiť: {str(e)}")
+    
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": "attachment; filename=model.pl1m"}
+    )
+
+@app.post("/api/model/import")
+async def import_model(request: Request):
+    """Nahradí aktuálny model modelom uloženým cez /api/model/export a zapíše ho do histórie."""
+    global current_model
+    
+    try:
+        model = decode_model(await request.body())
+    except ModelCodecError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "message": f"Neplatný súbor modelu: {str(e)}"}
+        )
+    
+    current_model = model
+    history_index = save_model_to_history(current_model)
+    log.info("Imported model with %s objects and %s links", len(model.objects), len(model.links))
+    
+    return {
+        "success": True,
+        "message": f"Model s {len(model.objects)} objektmi bol načítaný.",
+        "history_index": history_index
+    }
+
 @app.get("/api/training-history")
 async def get_training_history():
     """Vráti históriu trénovania modelu."""
@@ -1021,7 +1369,7 @@ async def reset_model():
         example["used_in_training"] = False
     
     # Vymažeme historii modelu
-    model_history = []
+    model_history.clear()
     current_history_index = -1
     
     return {"success": True, "message": "Model a historie byly úplně resetovány."}
@@ -1039,7 +1387,7 @@ async def get_model_history():
     
     history_entries = []
     # Zozbieraj informácie o všetkých záznamoch v histórii
-    for i, entry in enumerate(model_history):
+    for i, entry in enumerate(model_history.entries()):
         entry_info = {
             "index": i,
             "timestamp": entry.get("timestamp", ""),
@@ -1072,9 +1420,10 @@ async def step_back_in_history():
     current_history_index -= 1
     
     # Obnovení modelu z historie
-    history_entry = model_history[current_history_index]
-    if history_entry.get("model_state"):
-        current_model = Model.from_dict(history_entry["model_state"])
+    history_entry = model_history.metadata(current_history_index)
+    restored_model = model_history.model_at(current_history_index)
+    if restored_model is not None:
+        current_model = restored_model
     
     # Obnovení informací o použitých příkladech
     used_example_ids = history_entry.get("used_example_ids", [])
@@ -1127,9 +1476,10 @@ async def step_forward_in_history():
     current_history_index += 1
     
     # Obnovení modelu z historie
-    history_entry = model_history[current_history_index]
-    if history_entry.get("model_state"):
-        current_model = Model.from_dict(history_entry["model_state"])
+    history_entry = model_history.metadata(current_history_index)
+    restored_model = model_history.model_at(current_history_index)
+    if restored_model is not None:
+        current_model = restored_model
     
     # Obnovení informací o použitých příkladech
     used_example_ids = history_entry.get("used_example_ids", [])
@@ -1205,9 +1555,9 @@ async def get_model_status():
     # Počet krokov trénovania
     batch_count = len(training_history)
     
-    print(f"Model status: {len(current_model.objects)} objects, {len(current_model.links)} links")
-    print(f"Examples: {used_examples}/{len(dataset_examples)} used total")
-    print(f"Positive: {positive_used}/{total_positive}, Negative: {negative_used}/{total_negative}")
+    log.debug("Model status: %s objects, %s links", len(current_model.objects), len(current_model.links))
+    log.debug("Examples: %s/%s used total", used_examples, len(dataset_examples))
+    log.debug("Positive: %s/%s, Negative: %s/%s", positive_used, total_positive, negative_used, total_negative)
         
     return {
         "object_count": len(current_model.objects),
@@ -1241,11 +1591,12 @@ async def analyze_example(example_id: int):
             )
         
         # Konvertuj formulu na model
-        print(f"Analyzing example {example_id}: {example['name']}")
-        print(f"Formula: {example['formula']}")
+        log.debug("Analyzing example %s: %s", example_id, example['name'])
+        formula_text = get_example_formula_text(example)
+        log.debug("Formula: %s", formula_text)
         
         try:
-            model = formula_to_model(example["parsed_formula"])
+            model = formula_to_model(get_example_parsed_formula(example))
             
             # Zozbieraj detailné informácie o modeli
             objects_info = []
@@ -1294,7 +1645,7 @@ async def analyze_example(example_id: int):
                 "example_id": example_id,
                 "name": example["name"],
                 "is_positive": example["is_positive"],
-                "formula": example["formula"],
+                "formula": formula_text,
                 "model_info": {
                     "object_count": len(model.objects),
                     "link_count": len(model.links),
@@ -1304,8 +1655,7 @@ async def analyze_example(example_id: int):
                 }
             }
         except Exception as model_error:
-            print(f"Error analyzing example: {str(model_error)}")
-            traceback.print_exc()
+            log.exception("Error analyzing example: %s", model_error)
             return JSONResponse(
                 status_code=500,
                 content={
@@ -1313,32 +1663,36 @@ async def analyze_example(example_id: int):
                     "message": f"Chyba pri analýze príkladu: {str(model_error)}",
                     "example_id": example_id,
                     "name": example["name"],
-                    "formula": example["formula"]
+                    "formula": formula_text
                 }
             )
     except Exception as e:
-        print(f"Error accessing example: {str(e)}")
-        traceback.print_exc()
+        log.exception("Error accessing example: %s", e)
         return JSONResponse(
             status_code=500,
             content={"success": False, "message": f"Chyba pri prístupe k príkladu: {str(e)}"}
         )
 
 # Funkcia pre uloženie stavu modelu do historie
-def save_model_to_history(model_state, visualization=None, steps=None, examples_count=0):
+def save_model_to_history(model_state, steps=None, examples_count=0):
+    """
+    Uloží stav modelu do histórie.
+    
+    História drží úplný model len pre občasné snímky, ostatné kroky ukladá
+    ako rozdiel oproti predchádzajúcemu stavu. Vizualizácia sa neukladá -
+    pri návrate v histórii sa vygeneruje z obnoveného modelu.
+    """
     global model_history, current_history_index, dataset_examples, MAX_HISTORY_SIZE
     
     # Pokud jsme se vrátili zpět a pak děláme novou změnu, odstraníme historii vpřed
     if current_history_index < len(model_history) - 1:
-        model_history = model_history[:current_history_index+1]
+        model_history.truncate(current_history_index + 1)
     
     # Získáme seznam ID příkladů, které jsou aktuálně označeny jako použité
     used_example_ids = [example["id"] for example in dataset_examples if example.get("used_in_training", False)]
     
     # Uložíme aktuální stav modelu včetně seznamu použitých příkladů
-    model_history.append({
-        "model_state": model_state.to_dict() if model_state else None,
-        "model_visualization": visualization,
+    model_history.append(model_state, {
         "training_steps": steps,
         "used_examples_count": examples_count,
         "used_example_ids": used_example_ids,  # Ukládáme i ID použitých příkladů
@@ -1348,13 +1702,13 @@ def save_model_to_history(model_state, visualization=None, steps=None, examples_
     # Obmedzíme veľkosť histórie
     if len(model_history) > MAX_HISTORY_SIZE:
         # Odstraníme najstarší záznam a upravíme current_history_index
-        model_history.pop(0)
+        model_history.pop_oldest()
         current_history_index = max(0, current_history_index - 1)
     else:
         # Aktualizujeme index
         current_history_index = len(model_history) - 1
     
-    print(f"Saved model to history at index {current_history_index} with {len(used_example_ids)} used examples (history size: {len(model_history)}/{MAX_HISTORY_SIZE})")
+    log.info("Saved model to history at index %s with %s used examples (history size: %s/%s)", current_history_index, len(used_example_ids), len(model_history), MAX_HISTORY_SIZE)
     return current_history_index
 
 # Nový endpoint pre získanie informácií o modeli a histórii
@@ -1366,7 +1720,7 @@ async def model_info():
     
     # Vytvorenie rovnakej odpovede ako v prípade /api/model-history
     history_entries = []
-    for i, entry in enumerate(model_history):
+    for i, entry in enumerate(model_history.entries()):
         entry_info = {
             "index": i,
             "timestamp": entry.get("timestamp", ""),
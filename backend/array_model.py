@@ -0,0 +1,584 @@
+from collections.abc import MutableMapping
+from copy import deepcopy
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.model import Model, Object, Link, LinkType, AttributeValue, fingerprint_of
+
+try:
+    import numpy as np
+except ImportError:  # NumPy je voliteľná závislosť, bez nej je k dispozícii len Model
+    np = None
+
+# Kódovanie typov spojení v stĺpci link_type
+_LINK_TYPES: Tuple[LinkType, ...] = tuple(LinkType)
+_LINK_TYPE_CODES: Dict[LinkType, int] = {link_type: code for code, link_type in enumerate(_LINK_TYPES)}
+
+# Hodnota v stĺpci atribútu, ktorú objekt nemá
+_MISSING = object()
+
+INITIAL_CAPACITY = 16
+
+def numpy_available() -> bool:
+    """Zistí, či je nainštalovaná NumPy (potrebná pre ArrayModel)."""
+    return np is not None
+
+class _ObjectRow(Object):
+    """
+    Pohľad na jeden riadok objektových stĺpcov ArrayModel.
+    
+    Správa sa ako Object (isinstance, porovnanie, repr), čítanie aj zápis
+    polí ide priamo do stĺpcov modelu. Pohľad platí, kým sa model
+    neprestavia (priradenie model.objects).
+    """
+    
+    # Zápis ide priamo do stĺpcov (property), model o ňom nemusí vedieť
+    __setattr__ = object.__setattr__
+    
+    def __init__(self, store: 'ArrayModel', row: int):
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_row", row)
+    
+    @property
+    def name(self) -> str:
+        return self._store._symbols[self._store._object_columns["name"][self._row]]
+    
+    @name.setter
+    def name(self, value: str) -> None:
+        self._store._object_columns["name"][self._row] = self._store._intern(value)
+    
+    @property
+    def class_name(self) -> str:
+        return self._store._symbols[self._store._object_columns["class_name"][self._row]]
+    
+    @class_name.setter
+    def class_name(self, value: str) -> None:
+        self._store._object_columns["class_name"][self._row] = self._store._intern(value)
+    
+    @property
+    def attributes(self) -> Optional['_RowAttributes']:
+        if not self._store._object_columns["has_attributes"][self._row]:
+            return None
+        return _RowAttributes(self._store, self._row)
+    
+    @attributes.setter
+    def attributes(self, value: Optional[Dict[str, AttributeValue]]) -> None:
+        self._store._set_row_attributes(self._row, value)
+
+class _RowAttributes(MutableMapping):
+    """Slovník atribútov jedného objektu uložený v stĺpcoch atribútov."""
+    
+    def __init__(self, store: 'ArrayModel', row: int):
+        self._store = store
+        self._row = row
+    
+    def __getitem__(self, attr_name: str) -> AttributeValue:
+        column = self._store._attribute_columns.get(attr_name)
+        if column is None or column[self._row] is _MISSING:
+            raise KeyError(attr_name)
+        return column[self._row]
+    
+    def __setitem__(self, attr_name: str, value: AttributeValue) -> None:
+        self._store._attribute_column(attr_name)[self._row] = value
+        self._store._object_columns["has_attributes"][self._row] = True
+    
+    def __delitem__(self, attr_name: str) -> None:
+        column = self._store._attribute_columns.get(attr_name)
+        if column is None or column[self._row] is _MISSING:
+            raise KeyError(attr_name)
+        column[self._row] = _MISSING
+    
+    def __iter__(self) -> Iterator[str]:
+        for attr_name, column in list(self._store._attribute_columns.items()):
+            if column[self._row] is not _MISSING:
+                yield attr_name
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+class _LinkRow(Link):
+    """Pohľad na jeden riadok stĺpcov spojení ArrayModel (pozri _ObjectRow)."""
+    
+    __setattr__ = object.__setattr__
+    
+    def __init__(self, store: 'ArrayModel', row: int):
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_row", row)
+    
+    @property
+    def source(self) -> str:
+        return self._store._symbols[self._store._link_columns["source"][self._row]]
+    
+    @source.setter
+    def source(self, value: str) -> None:
+        self._store._link_columns["source"][self._row] = self._store._intern(value)
+    
+    @property
+    def target(self) -> str:
+        return self._store._symbols[self._store._link_columns["target"][self._row]]
+    
+    @target.setter
+    def target(self, value: str) -> None:
+        self._store._link_columns["target"][self._row] = self._store._intern(value)
+    
+    @property
+    def link_type(self) -> LinkType:
+        return _LINK_TYPES[self._store._link_columns["link_type"][self._row]]
+    
+    @link_type.setter
+    def link_type(self, value: LinkType) -> None:
+        self._store._link_columns["link_type"][self._row] = _LINK_TYPE_CODES[value]
+
+class _RowSequence:
+    """
+    Zoznam objektov alebo spojení ArrayModel.
+    
+    Podporuje operácie, ktoré nad model.objects a model.links používa
+    učiaci algoritmus (iterácia, indexovanie, append, remove, +, in).
+    Prvky sú pohľady na riadky stĺpcov.
+    """
+    
+    def __init__(self, store: 'ArrayModel', kind: str):
+        self._store = store
+        self._kind = kind
+    
+    def _row(self, row: int):
+        if self._kind == "objects":
+            return _ObjectRow(self._store, int(row))
+        return _LinkRow(self._store, int(row))
+    
+    def __len__(self) -> int:
+        return self._store._tables[self._kind].size
+    
+    def __getitem__(self, index):
+        rows = self._store._tables[self._kind].live_rows()
+        if isinstance(index, slice):
+            return [self._row(row) for row in rows[index]]
+        return self._row(rows[index])
+    
+    def __iter__(self):
+        # Riadky sa zistia na začiatku, rovnako ako pri prechádzaní kópie zoznamu
+        return (self._row(row) for row in self._store._tables[self._kind].live_rows())
+    
+    def __contains__(self, item) -> bool:
+        return any(element == item for element in self)
+    
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+    
+    def __add__(self, other) -> list:
+        return list(self) + list(other)
+    
+    def __radd__(self, other) -> list:
+        return list(other) + list(self)
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+    
+    def index(self, item) -> int:
+        for position, element in enumerate(self):
+            if element == item:
+                return position
+        raise ValueError(f"{item!r} nie je v zozname")
+    
+    def append(self, item) -> None:
+        if self._kind == "objects":
+            self._store._append_objects([item])
+        else:
+            self._store._append_links([item])
+    
+    def extend(self, items: Iterable) -> None:
+        items = list(items)
+        if self._kind == "objects":
+            self._store._append_objects(items)
+        else:
+            self._store._append_links(items)
+    
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+    
+    def remove(self, item) -> None:
+        self.pop(self.index(item))
+    
+    def pop(self, index: int = -1):
+        element = self[index]
+        self._store._tables[self._kind].delete([element._row])
+        return element
+    
+    def clear(self) -> None:
+        table = self._store._tables[self._kind]
+        table.delete(table.live_rows())
+
+class _Table:
+    """
+    Stĺpce jednej tabuľky (objekty alebo spojenia) s rezervou na pridávanie.
+    
+    Odobraté riadky sa len označia v stĺpci alive, čísla ostatných riadkov
+    sa nemenia - pohľady na riadky, ktoré má učiaci algoritmus rozpracované,
+    tak ostávajú platné. Tabuľka sa zhustí pri kópii.
+    """
+    
+    def __init__(self, columns: Dict[str, Any]):
+        self.columns = columns
+        self.columns["alive"] = np.zeros(len(next(iter(columns.values()))), dtype=bool)
+        self.used = 0  # Počet použitých riadkov vrátane odobratých
+        self.size = 0  # Počet živých riadkov
+    
+    def capacity(self) -> int:
+        return len(self.columns["alive"])
+    
+    def reserve(self, needed: int) -> None:
+        """Zväčší stĺpce (zdvojnásobením), aby sa do nich zmestilo needed riadkov."""
+        capacity = self.capacity()
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, INITIAL_CAPACITY)
+        for name, column in self.columns.items():
+            self.columns[name] = _grown(column, new_capacity)
+    
+    def add_rows(self, count: int) -> Tuple[int, int]:
+        """Pridá count živých riadkov na koniec a vráti ich rozsah."""
+        start = self.used
+        end = start + count
+        self.reserve(end)
+        self.columns["alive"][start:end] = True
+        self.used = end
+        self.size += count
+        return start, end
+    
+    def live_rows(self):
+        return np.flatnonzero(self.columns["alive"][:self.used])
+    
+    def live(self, column: str):
+        """Hodnoty stĺpca v použitých riadkoch (odobraté treba vylúčiť cez alive)."""
+        return self.columns[column][:self.used]
+    
+    def delete(self, rows) -> None:
+        alive = self.columns["alive"]
+        rows = [row for row in rows if alive[row]]
+        alive[rows] = False
+        self.size -= len(rows)
+    
+    def compacted(self, extra: Optional[Dict[str, Any]] = None) -> Tuple['_Table', Dict[str, Any]]:
+        """
+        Vráti zhustenú kópiu tabuľky (a pridružených stĺpcov extra).
+        
+        Returns:
+            Dvojica (tabuľka, skopírované stĺpce extra)
+        """
+        rows = self.live_rows()
+        capacity = max(len(rows), INITIAL_CAPACITY)
+        table = _Table.__new__(_Table)
+        table.columns = {name: _grown(column[rows], capacity) for name, column in self.columns.items()}
+        table.used = table.size = len(rows)
+        return table, {name: _grown(column[rows], capacity) for name, column in (extra or {}).items()}
+
+def _grown(column, capacity: int):
+    """Kópia stĺpca zväčšená na capacity riadkov (nové riadky sú prázdne)."""
+    if column.dtype == object:
+        grown = np.full(capacity, _MISSING, dtype=object)
+    else:
+        grown = np.zeros(capacity, dtype=column.dtype)
+    grown[:len(column)] = column
+    return grown
+
+class ArrayModel(Model):
+    """
+    Model uložený po stĺpcoch (struct-of-arrays) v poliach NumPy.
+    
+    Názvy objektov, triedy a zdroje/ciele spojení sú celočíselné kódy do
+    spoločnej tabuľky reťazcov, typ spojenia je int8 a každý atribút má
+    vlastný stĺpec. Vyhľadávanie (get_object, links_from, has_link, ...)
+    prebieha vektorovo nad stĺpcami.
+    
+    Rozhranie je rovnaké ako pri Model, takže obe implementácie sa dajú
+    zameniť (pozri convert_model) a porovnať na rovnakých dátach. Vyžaduje
+    balík numpy.
+    """
+    
+    def __init__(self, objects: Optional[List[Object]] = None, links: Optional[List[Link]] = None):
+        if np is None:
+            raise ImportError("ArrayModel vyžaduje balík numpy (pip install numpy)")
+        
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._reset_tables()
+        # Riadky, ktorých meniteľné hodnoty atribútov patria len tomuto modelu;
+        # None znamená, že model nezdieľa hodnoty so žiadnou kópiou
+        self._owned_rows: Optional[set] = None
+        
+        self._append_objects(objects or [])
+        self._append_links(links or [])
+    
+    def _reset_tables(self) -> None:
+        self._tables: Dict[str, _Table] = {
+            "objects": _Table({
+                "name": np.zeros(INITIAL_CAPACITY, dtype=np.int32),
+                "class_name": np.zeros(INITIAL_CAPACITY, dtype=np.int32),
+                "has_attributes": np.zeros(INITIAL_CAPACITY, dtype=bool)
+            }),
+            "links": _Table({
+                "source": np.zeros(INITIAL_CAPACITY, dtype=np.int32),
+                "target": np.zeros(INITIAL_CAPACITY, dtype=np.int32),
+                "link_type": np.zeros(INITIAL_CAPACITY, dtype=np.int8)
+            })
+        }
+        # Stĺpce atribútov patria k tabuľke objektov (rovnaké čísla riadkov)
+        self._attribute_columns: Dict[str, Any] = {}
+    
+    @property
+    def _object_columns(self) -> Dict[str, Any]:
+        return self._tables["objects"].columns
+    
+    @property
+    def _link_columns(self) -> Dict[str, Any]:
+        return self._tables["links"].columns
+    
+    @classmethod
+    def from_model(cls, model: Model) -> 'ArrayModel':
+        """Vytvorí ArrayModel s rovnakými objektmi a spojeniami ako daný model."""
+        return cls(objects=list(model.objects), links=list(model.links))
+    
+    def to_model(self) -> Model:
+        """Vráti obyčajný Model s nezávislými kópiami objektov a spojení."""
+        return Model(
+            objects=[self._detach("objects", row) for row in self._tables["objects"].live_rows()],
+            links=[self._detach("links", row) for row in self._tables["links"].live_rows()]
+        )
+    
+    # --- Tabuľka reťazcov ---
+    
+    def _intern(self, symbol: str) -> int:
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return symbol_id
+    
+    def _lookup(self, symbol: str) -> int:
+        """Kód reťazca alebo -1, ak sa v modeli nevyskytuje."""
+        return self._symbol_ids.get(symbol, -1)
+    
+    # --- Stĺpce ---
+    
+    def _attribute_column(self, attr_name: str):
+        column = self._attribute_columns.get(attr_name)
+        if column is None:
+            column = np.full(self._tables["objects"].capacity(), _MISSING, dtype=object)
+            self._attribute_columns[attr_name] = column
+        return column
+    
+    def _append_objects(self, objects: List[Object]) -> None:
+        table = self._tables["objects"]
+        start, end = table.add_rows(len(objects))
+        for attr_name, column in self._attribute_columns.items():
+            if len(column) < table.capacity():
+                self._attribute_columns[attr_name] = _grown(column, table.capacity())
+        
+        columns = table.columns
+        columns["name"][start:end] = [self._intern(obj.name) for obj in objects]
+        columns["class_name"][start:end] = [self._intern(obj.class_name) for obj in objects]
+        columns["has_attributes"][start:end] = False
+        
+        for row, obj in enumerate(objects, start):
+            attributes = obj.attributes
+            if attributes is not None:
+                self._set_row_attributes(row, dict(attributes))
+    
+    def _append_links(self, links: List[Link]) -> None:
+        start, end = self._tables["links"].add_rows(len(links))
+        columns = self._link_columns
+        columns["source"][start:end] = [self._intern(link.source) for link in links]
+        columns["target"][start:end] = [self._intern(link.target) for link in links]
+        columns["link_type"][start:end] = [_LINK_TYPE_CODES[link.link_type] for link in links]
+    
+    def _set_row_attributes(self, row: int, attributes: Optional[Dict[str, AttributeValue]]) -> None:
+        for column in self._attribute_columns.values():
+            column[row] = _MISSING
+        self._object_columns["has_attributes"][row] = attributes is not None
+        for attr_name, value in (attributes or {}).items():
+            self._attribute_column(attr_name)[row] = value
+    
+    def _detach(self, kind: str, row: int):
+        """Vráti nezávislý Object/Link s hodnotami daného riadku."""
+        if kind == "objects":
+            view = _ObjectRow(self, int(row))
+            attributes = view.attributes
+            return Object(view.name, view.class_name, deepcopy(dict(attributes)) if attributes is not None else None)
+        view = _LinkRow(self, int(row))
+        return Link(view.source, view.target, view.link_type)
+    
+    # --- Rozhranie Model ---
+    
+    @property
+    def objects(self) -> _RowSequence:
+        return _RowSequence(self, "objects")
+    
+    @objects.setter
+    def objects(self, objects: List[Object]) -> None:
+        objects = [self._detach("objects", obj._row) if isinstance(obj, _ObjectRow) else obj for obj in objects]
+        links = self.to_model().links
+        self._reset_tables()
+        self._append_objects(objects)
+        self._append_links(links)
+    
+    @property
+    def links(self) -> _RowSequence:
+        return _RowSequence(self, "links")
+    
+    @links.setter
+    def links(self, links: List[Link]) -> None:
+        links = [Link(link.source, link.target, link.link_type) for link in links]
+        table = self._tables["links"]
+        table.delete(table.live_rows())
+        self._append_links(links)
+    
+    def __repr__(self) -> str:
+        return f"ArrayModel(objects={len(self.objects)}, links={len(self.links)})"
+    
+    def __reduce__(self):
+        model = self.to_model()
+        return (self.__class__, (list(model.objects), list(model.links)))
+    
+    def _matching_rows(self, kind: str, column: str, symbol: str):
+        """Živé riadky tabuľky, ktorých stĺpec obsahuje daný reťazec."""
+        symbol_id = self._lookup(symbol)
+        if symbol_id < 0:
+            return np.empty(0, dtype=np.intp)
+        table = self._tables[kind]
+        return np.flatnonzero((table.live(column) == symbol_id) & table.live("alive"))
+    
+    def get_object(self, name: str) -> Optional[Object]:
+        rows = self._matching_rows("objects", "name", name)
+        return _ObjectRow(self, int(rows[0])) if len(rows) else None
+    
+    def has_object(self, name: str) -> bool:
+        return len(self._matching_rows("objects", "name", name)) > 0
+    
+    def objects_of_class(self, class_name: str, classification_tree=None) -> List[Object]:
+        """Vráti objekty danej triedy, prípadne aj jej podtried (vektorový výber nad stĺpcom tried)."""
+        if classification_tree is None:
+            rows = self._matching_rows("objects", "class_name", class_name)
+        else:
+            table = self._tables["objects"]
+            classes = table.live("class_name")
+            alive = table.live("alive")
+            member_ids = [
+                class_id for class_id in np.unique(classes[alive])
+                if classification_tree.is_subclass(self._symbols[class_id], class_name)
+            ]
+            rows = np.flatnonzero(np.isin(classes, member_ids) & alive)
+        return [_ObjectRow(self, int(row)) for row in rows]
+    
+    def links_from(self, source: str) -> List[Link]:
+        return [_LinkRow(self, int(row)) for row in self._matching_rows("links", "source", source)]
+    
+    def links_to(self, target: str) -> List[Link]:
+        return [_LinkRow(self, int(row)) for row in self._matching_rows("links", "target", target)]
+    
+    def _link_key_rows(self, source: str, target: str, link_type: LinkType):
+        source_id = self._lookup(source)
+        target_id = self._lookup(target)
+        if source_id < 0 or target_id < 0:
+            return np.empty(0, dtype=np.intp)
+        table = self._tables["links"]
+        return np.flatnonzero((table.live("source") == source_id)
+                              & (table.live("target") == target_id)
+                              & (table.live("link_type") == _LINK_TYPE_CODES[link_type])
+                              & table.live("alive"))
+    
+    def has_link_key(self, source: str, target: str, link_type: LinkType) -> bool:
+        return len(self._link_key_rows(source, target, link_type)) > 0
+    
+    def add_link(self, link: Link):
+        if not self.has_link(link):
+            self._append_links([link])
+    
+    def remove_link(self, link: Link):
+        self._tables["links"].delete(self._link_key_rows(link.source, link.target, link.link_type))
+    
+    def get_attribute_value(self, obj_name: str, attr: str) -> Optional[AttributeValue]:
+        column = self._attribute_columns.get(attr)
+        if column is None:
+            return None
+        # Pri duplicitných názvoch rozhoduje prvý objekt, ktorý atribút má
+        for row in self._matching_rows("objects", "name", obj_name):
+            value = column[row]
+            if value is not _MISSING:
+                return value
+        return None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_model().to_dict()
+    
+    def fingerprint(self) -> str:
+        # Bez priebežnej údržby - prepočíta sa z riadkov pri každom volaní
+        return fingerprint_of(chain(self.objects, self.links))
+    
+    # --- Kópia ---
+    
+    def copy(self) -> 'ArrayModel':
+        """
+        Vytvorí kópiu modelu.
+        
+        Stĺpce sa kopírujú zhustené (bez odobratých riadkov), tabuľka
+        reťazcov sa zdieľa - kódy sa do nej len pridávajú. Meniteľné
+        hodnoty atribútov (množiny) sa skopírujú až pri zápise cez
+        writable_object.
+        """
+        duplicate = ArrayModel.__new__(ArrayModel)
+        duplicate._symbols = self._symbols
+        duplicate._symbol_ids = self._symbol_ids
+        objects, duplicate._attribute_columns = self._tables["objects"].compacted(self._attribute_columns)
+        links, _ = self._tables["links"].compacted()
+        duplicate._tables = {"objects": objects, "links": links}
+        self._owned_rows = set()
+        duplicate._owned_rows = set()
+        return duplicate
+    
+    def writable_object(self, obj: Object) -> Object:
+        if not isinstance(obj, _ObjectRow) or obj._store is not self:
+            raise ValueError("Objekt nie je v tomto modeli")
+        row = obj._row
+        if self._owned_rows is not None and row not in self._owned_rows:
+            for column in self._attribute_columns.values():
+                value = column[row]
+                if isinstance(value, (set, dict, list)):
+                    column[row] = deepcopy(value)
+            self._owned_rows.add(row)
+        return obj
+    
+    def writable_link(self, link: Link) -> Link:
+        # Spojenie nemá meniteľné hodnoty, stĺpce sú po kópii vlastné
+        if not isinstance(link, _LinkRow) or link._store is not self:
+            raise ValueError("Spojenie nie je v tomto modeli")
+        return link
+
+# Implementácie modelu, ktoré sa dajú navzájom zameniť
+MODEL_BACKENDS = {
+    "list": Model,
+    "array": ArrayModel
+}
+
+def convert_model(model: Model, backend: str) -> Model:
+    """
+    Prevedie model na zadanú implementáciu ("list" alebo "array").
+    
+    Args:
+        model: Pôvodný model
+        backend: Názov implementácie z MODEL_BACKENDS
+    
+    Returns:
+        Model v požadovanej implementácii (nezávislý od pôvodného)
+    """
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Neznáma implementácia modelu: {backend}")
+    if backend == "array":
+        return ArrayModel.from_model(model)
+    if isinstance(model, ArrayModel):
+        return model.to_model()
+    return deepcopy(model)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import io
+import time
+
+from backend.pl1_parser import Formula, iter_pl1_blocks, split_example_header, is_positive_name
+from backend.model import Model, ModelMatcher
+from backend.ingest import ingest_examples, ParseCache
+
+# Počet príkladov sparsovaných naraz - výsledky sa posielajú po každom úseku
+BATCH_CHUNK_SIZE = 256
+
+@dataclass
+class BatchExample:
+    """
+    Jeden príklad dávkového porovnania.
+    
+    Atributy:
+        text: Text formuly príkladu
+        name: Názov príkladu (prvý riadok hlavičky), ak ho má
+        is_positive: Očakávaný výsledok - či má príklad modelu vyhovovať
+    """
+    text: str
+    name: Optional[str] = None
+    is_positive: bool = True
+
+def iter_batch_examples(text: str) -> Iterator[BatchExample]:
+    """
+    Rozdelí text datasetu .pl1 na príklady bez ich parsovania.
+    
+    Názov a očakávaný výsledok sa určia z hlavičky rovnako ako pri načítaní
+    datasetu, bloky zložené len z komentárov sa preskočia.
+    """
+    for _, lines in iter_pl1_blocks(io.StringIO(text)):
+        header, formula_text = split_example_header(lines)
+        if formula_text:
+            name = header[0] if header else None
+            yield BatchExample(text=formula_text, name=name, is_positive=is_positive_name(name))
+
+def compare_examples(matcher: ModelMatcher, examples: Iterable[BatchExample],
+                     convert: Callable[[Formula], Model], cache: Optional[ParseCache] = None,
+                     chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Porovná príklady s preloženým modelom a vracia výsledky priebežne.
+    
+    Príklady sa parsujú po úsekoch cez ingest_examples (s cache sa už známe
+    formuly neparsujú znova), chyba v príklade sa hlási len pri ňom.
+    
+    Args:
+        matcher: Preložený model (Model.matcher), spoločný pre všetky príklady
+        examples: Príklady v poradí dávky (môže byť aj generátor)
+        convert: Funkcia konvertujúca formulu na model
+        cache: Voliteľná ParseCache
+        chunk_size: Počet príkladov parsovaných naraz
+    
+    Yields:
+        Záznam pre každý príklad (index, name, expected_positive a is_valid
+        s differences, alebo error) a nakoniec súhrn s počtami a priepustnosťou
+        (summary=True)
+    """
+    start = time.perf_counter()
+    counts = {"total": 0, "valid": 0, "invalid": 0, "errors": 0, "matching_expected": 0}
+    
+    examples = iter(examples)
+    while True:
+        chunk: List[BatchExample] = list(islice(examples, chunk_size))
+        if not chunk:
+            break
+        
+        results = ingest_examples([example.text for example in chunk], convert, cache=cache)
+        for example, result in zip(chunk, results):
+            record = {"index": counts["total"], "name": example.name, "expected_positive": example.is_positive}
+            counts["total"] += 1
+            
+            if result.error is not None or result.empty:
+                counts["errors"] += 1
+                record["error"] = result.error or "Prázdna formula"
+            else:
+                is_valid, differences = matcher.match(Model.from_dict(result.model))
+                counts["valid" if is_valid else "invalid"] += 1
+                if is_valid == example.is_positive:
+                    counts["matching_expected"] += 1
+                record["is_valid"] = is_valid
+                record["differences"] = differences
+            yield record
+    
+    elapsed = time.perf_counter() - start
+    yield {
+        "summary": True,
+        **counts,
+        "seconds": round(elapsed, 3),
+        "examples_per_second": round(counts["total"] / elapsed, 1) if elapsed > 0 else None
+    }
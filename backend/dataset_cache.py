@@ -0,0 +1,211 @@
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Tuple
+import gc
+import hashlib
+import marshal
+import os
+import struct
+
+from backend.pl1_parser import Formula, Predicate, SYMBOLS
+
+# Verzia formátu - pri zmene rozloženia alebo konverzie formula -> model ju treba zvýšiť
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".pl1c"
+MAX_CACHE_FILES = 20  # Počet najnovších súborov, ktoré sa v adresári cache ponechajú
+
+# Hlavička: magic, verzia formátu, verzia marshal, hash obsahu, počet príkladov, dĺžka dát
+_HEADER = struct.Struct("<4sHH32sQQ")
+_MAGIC = b"PL1C"
+
+_OPERATORS = ["∧", "∨", "¬", "→", "↔"]
+_OPERATOR_CODES = {operator: code + 1 for code, operator in enumerate(_OPERATORS)}
+
+_LENGTH = struct.Struct("<Q")
+
+@dataclass
+class CachedExample:
+    """
+    Jeden príklad načítaný zo skompilovanej cache.
+    
+    Atributy:
+        formula: Strom formuly s internovanými predikátmi (None, ak sa pri ukladaní nepoznal)
+        model: Model odvodený z formuly ako slovník (formát Model.to_dict)
+    """
+    formula: Optional[Formula]
+    model: Dict[str, Any]
+
+def content_hash(texts: List[str]) -> bytes:
+    """
+    Vypočíta hash obsahu datasetu (SHA-256 nad textami formúl v poradí).
+    
+    Dĺžka každého textu je súčasťou hashu, takže rôzne rozdelenie
+    rovnakého textu na príklady dáva iný hash.
+    """
+    digest = hashlib.sha256()
+    for text in texts:
+        data = text.encode("utf-8")
+        digest.update(_LENGTH.pack(len(data)))
+        digest.update(data)
+    return digest.digest()
+
+def cache_path(cache_dir: str, key: bytes) -> str:
+    """Vráti cestu k súboru cache pre daný hash obsahu."""
+    return os.path.join(cache_dir, key.hex() + CACHE_SUFFIX)
+
+def _encode_formula(formula: Formula) -> Tuple[Tuple[Tuple[str, ...], ...], Any]:
+    """
+    Zakóduje formulu do vnorených n-tíc vhodných pre marshal.
+    
+    Returns:
+        Dvojica (tabuľka predikátov ako n-tice (názov, argumenty...), strom),
+        kde list stromu je index do tabuľky a uzol je n-tica (kód spojky, podformuly...)
+    """
+    predicates = formula.get_all_predicates()
+    predicate_ids = {predicate: i for i, predicate in enumerate(predicates)}
+    table = tuple((predicate.name, *predicate.arguments) for predicate in predicates)
+    
+    def encode(node: Formula) -> Any:
+        if node.operator is None:
+            return predicate_ids[next(iter(node.predicates))]
+        return (_OPERATOR_CODES[node.operator], *(encode(subformula) for subformula in node.subformulas))
+    
+    return table, encode(formula)
+
+def _decode_formula(table: Tuple[Tuple[str, ...], ...], tree: Any, symbol_ids: Dict[str, int]) -> Formula:
+    """Obnoví strom formuly s internovanými predikátmi z výstupu _encode_formula."""
+    predicates = []
+    for names in table:
+        ids = []
+        for name in names:
+            symbol_id = symbol_ids.get(name)
+            if symbol_id is None:
+                symbol_id = symbol_ids[name] = SYMBOLS.intern(name)
+            ids.append(symbol_id)
+        predicates.append(Predicate.from_symbol_ids(ids[0], tuple(ids[1:])))
+    
+    def decode(node: Any) -> Formula:
+        if isinstance(node, int):
+            return Formula(predicates={predicates[node]})
+        
+        subformulas = []
+        all_predicates = set()
+        for child in node[1:]:
+            # Listy (najčastejší prípad) sa vytvárajú priamo bez rekurzie
+            if isinstance(child, int):
+                predicate = predicates[child]
+                subformulas.append(Formula(predicates={predicate}))
+                all_predicates.add(predicate)
+            else:
+                subformula = decode(child)
+                subformulas.append(subformula)
+                all_predicates.update(subformula.predicates)
+        return Formula(predicates=all_predicates, operator=_OPERATORS[node[0] - 1], subformulas=subformulas)
+    
+    return decode(tree)
+
+def save_compiled_dataset(path: str, key: bytes,
+                          examples: List[Tuple[Optional[Formula], Dict[str, Any]]]) -> bool:
+    """
+    Uloží sparsované príklady a ich modely do binárneho súboru .pl1c.
+    
+    Args:
+        path: Cesta k súboru cache
+        key: Hash obsahu zdrojového datasetu (content_hash)
+        examples: Dvojice (formula alebo None, model ako slovník) v poradí datasetu
+    
+    Returns:
+        True, ak sa cache podarilo uložiť
+    """
+    try:
+        formulas = [None if formula is None else _encode_formula(formula) for formula, _ in examples]
+        payload = marshal.dumps((formulas, [model for _, model in examples]))
+    except (ValueError, KeyError):
+        # Hodnoty, ktoré marshal nevie uložiť - dataset sa jednoducho necachuje
+        return False
+    
+    temp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, CACHE_VERSION, marshal.version, key, len(examples), len(payload)))
+            f.write(payload)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+    
+    prune_cache_dir(os.path.dirname(path))
+    return True
+
+def load_compiled_dataset(path: str, key: bytes) -> Optional[List[CachedExample]]:
+    """
+    Načíta príklady zo súboru .pl1c bez parsovania formúl.
+    
+    Args:
+        path: Cesta k súboru cache
+        key: Očakávaný hash obsahu zdrojového datasetu
+    
+    Returns:
+        Zoznam príkladov, alebo None ak cache neexistuje, je zastaraná alebo poškodená
+        (vtedy ju treba prebudovať)
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, marshal_version, stored_key, count, payload_size = _HEADER.unpack(header)
+            if (magic != _MAGIC or version != CACHE_VERSION or
+                    marshal_version != marshal.version or stored_key != key):
+                return None
+            
+            payload = f.read(payload_size)
+            if len(payload) != payload_size:
+                return None
+        
+        # Pri hromadnom vytváraní objektov by cyklický GC opakovane prechádzal
+        # všetko doteraz načítané, preto sa počas dekódovania pozastaví
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            formulas, models = marshal.loads(payload)
+            if len(formulas) != count or len(models) != count:
+                return None
+            
+            symbol_ids = {}
+            examples = [
+                CachedExample(
+                    formula=None if encoded is None else _decode_formula(encoded[0], encoded[1], symbol_ids),
+                    model=model
+                )
+                for encoded, model in zip(formulas, models)
+            ]
+        finally:
+            if gc_enabled:
+                gc.enable()
+    except (OSError, EOFError, ValueError, TypeError, IndexError):
+        return None
+    
+    # Obnovená časová pečiatka - pri čistení cache sa súbor považuje za nedávno použitý
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    
+    return examples
+
+def prune_cache_dir(cache_dir: str, suffix: str = CACHE_SUFFIX) -> None:
+    """Ponechá v adresári cache len MAX_CACHE_FILES naposledy použitých súborov s príponou suffix."""
+    try:
+        entries = [
+            os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+            if name.endswith(suffix)
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for old_path in entries[MAX_CACHE_FILES:]:
+            os.remove(old_path)
+    except OSError:
+        pass
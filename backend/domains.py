@@ -0,0 +1,219 @@
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+import threading
+
+class Interval(tuple):
+    """
+    Uzavretý interval [low, high] povolených hodnôt numerického atribútu.
+    
+    Je nemenný a je to dvojica (n-tica), takže sa rovná, hashuje, vypisuje
+    aj rozbaľuje (low, high = interval) rovnako ako doterajšie intervaly
+    uložené ako obyčajné dvojice.
+    """
+    __slots__ = ()
+    
+    def __new__(cls, low: float, high: float) -> 'Interval':
+        return tuple.__new__(cls, (low, high))
+    
+    def __getnewargs__(self):
+        return tuple(self)
+    
+    @property
+    def low(self) -> float:
+        return self[0]
+    
+    @property
+    def high(self) -> float:
+        return self[1]
+    
+    @classmethod
+    def around(cls, value: float, relative: float, minimum: float) -> 'Interval':
+        """Interval okolo hodnoty s toleranciou max(minimum, |value| * relative)."""
+        tolerance = max(minimum, abs(value) * relative)
+        return cls(value - tolerance, value + tolerance)
+    
+    def contains(self, value: float) -> bool:
+        """Vráti True, ak hodnota leží v intervale (vrátane hraníc)."""
+        return self[0] <= value <= self[1]
+    
+    def widen(self, value: float) -> 'Interval':
+        """Najmenší interval, ktorý obsahuje tento interval aj hodnotu."""
+        if self[0] <= value <= self[1]:
+            return self
+        return Interval(min(self[0], value), max(self[1], value))
+    
+    def union(self, other: 'Interval') -> 'Interval':
+        """Najmenší interval, ktorý obsahuje oba intervaly."""
+        return Interval(min(self[0], other[0]), max(self[1], other[1]))
+    
+    def intersection(self, other: 'Interval') -> Optional['Interval']:
+        """Prienik intervalov, alebo None ak je prázdny."""
+        low, high = max(self[0], other[0]), min(self[1], other[1])
+        return Interval(low, high) if low <= high else None
+
+class _Vocabulary:
+    """
+    Internované hodnoty kategorických atribútov.
+    
+    Každá hodnota dostane trvalé poradové číslo (bit v ValueSet). Slovník
+    je spoločný pre celý proces a len rastie - bity sa preto medzi procesmi
+    neprenášajú, ValueSet sa ukladá ako zoznam hodnôt.
+    """
+    
+    def __init__(self):
+        self.ids: Dict[Hashable, int] = {}
+        self.values: List[Hashable] = []
+        self._lock = threading.Lock()
+    
+    def id_of(self, value: Hashable) -> int:
+        value_id = self.ids.get(value)
+        if value_id is None:
+            with self._lock:
+                value_id = self.ids.get(value)
+                if value_id is None:
+                    value_id = len(self.values)
+                    self.values.append(value)
+                    self.ids[value] = value_id
+        return value_id
+    
+    def bits_of(self, values: Iterable[Hashable]) -> int:
+        bits = 0
+        for value in values:
+            bits |= 1 << self.id_of(value)
+        return bits
+
+_vocabulary = _Vocabulary()
+
+class ValueSet:
+    """
+    Nemenná množina povolených hodnôt kategorického atribútu.
+    
+    Hodnoty sú uložené ako bitová množina nad internovaným slovníkom,
+    takže príslušnosť hodnoty je jedno vyhľadanie v slovníku a zjednotenie,
+    prienik či porovnanie sú operácie nad jedným celým číslom. Prvky sa
+    prechádzajú v poradí, v akom sa hodnoty prvýkrát objavili.
+    
+    Rovná sa aj obyčajnej množine (set, frozenset) s rovnakými prvkami.
+    """
+    __slots__ = ("_bits", "_hash")
+    
+    def __init__(self, values: Iterable[Hashable] = ()):
+        if isinstance(values, ValueSet):
+            bits = values._bits
+        else:
+            bits = _vocabulary.bits_of(values)
+        object.__setattr__(self, "_bits", bits)
+        object.__setattr__(self, "_hash", None)
+    
+    @classmethod
+    def _from_bits(cls, bits: int) -> 'ValueSet':
+        value_set = cls.__new__(cls)
+        object.__setattr__(value_set, "_bits", bits)
+        object.__setattr__(value_set, "_hash", None)
+        return value_set
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ValueSet je nemenná")
+    
+    def __reduce__(self):
+        # Bity platia len v tomto procese - ukladajú sa hodnoty
+        return (ValueSet, (list(self),))
+    
+    def __contains__(self, value: Any) -> bool:
+        try:
+            value_id = _vocabulary.ids.get(value)
+        except TypeError:
+            return False
+        return value_id is not None and (self._bits >> value_id) & 1 == 1
+    
+    def __iter__(self) -> Iterator[Hashable]:
+        bits = self._bits
+        values = _vocabulary.values
+        while bits:
+            lowest = bits & -bits
+            yield values[lowest.bit_length() - 1]
+            bits ^= lowest
+    
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+    
+    def __bool__(self) -> bool:
+        return self._bits != 0
+    
+    def _bits_of(self, other: Iterable[Hashable]) -> int:
+        if isinstance(other, ValueSet):
+            return other._bits
+        return _vocabulary.bits_of(other)
+    
+    def union(self, other: Iterable[Hashable]) -> 'ValueSet':
+        bits = self._bits | self._bits_of(other)
+        return self if bits == self._bits else ValueSet._from_bits(bits)
+    
+    def intersection(self, other: Iterable[Hashable]) -> 'ValueSet':
+        return ValueSet._from_bits(self._bits & self._bits_of(other))
+    
+    def difference(self, other: Iterable[Hashable]) -> 'ValueSet':
+        return ValueSet._from_bits(self._bits & ~self._bits_of(other))
+    
+    def widen(self, value: Hashable) -> 'ValueSet':
+        """Množina rozšírená o jednu hodnotu."""
+        return self.union((value,))
+    
+    def issubset(self, other: Iterable[Hashable]) -> bool:
+        return self._bits & ~self._bits_of(other) == 0
+    
+    def issuperset(self, other: Iterable[Hashable]) -> bool:
+        return self._bits_of(other) & ~self._bits == 0
+    
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __le__ = issubset
+    __ge__ = issuperset
+    
+    def __eq__(self, other):
+        if isinstance(other, ValueSet):
+            return self._bits == other._bits
+        if isinstance(other, (set, frozenset)):
+            return len(other) == len(self) and all(value in self for value in other)
+        return NotImplemented
+    
+    def __hash__(self):
+        # Rovnaký hash ako frozenset s rovnakými prvkami (rovnajú sa)
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(frozenset(self)))
+        return self._hash
+    
+    def __repr__(self):
+        if not self._bits:
+            return "ValueSet()"
+        return "{" + ", ".join(repr(value) for value in self) + "}"
+
+def as_interval(value: Any) -> Optional[Interval]:
+    """
+    Vráti hodnotu atribútu ako Interval, alebo None ak nejde o interval.
+    
+    Obyčajná dvojica (min, max) zo starších modelov sa prevedie na Interval.
+    """
+    if type(value) is Interval:
+        return value
+    if isinstance(value, tuple) and len(value) == 2:
+        return Interval(value[0], value[1])
+    return None
+
+def as_value_set(value: Any) -> Optional[ValueSet]:
+    """
+    Vráti hodnotu atribútu ako ValueSet, alebo None ak nejde o množinu hodnôt.
+    
+    Obyčajná množina (set, frozenset) sa prevedie na ValueSet.
+    """
+    if type(value) is ValueSet:
+        return value
+    if isinstance(value, (set, frozenset)):
+        return ValueSet(value)
+    return None
+
+def to_json_value(value: Any) -> Any:
+    """Prevedie hodnotu atribútu na tvar vhodný pre JSON (ValueSet ako zoznam)."""
+    if isinstance(value, ValueSet):
+        return list(value)
+    return value
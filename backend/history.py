@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.model import Model, ModelPatch
+from backend.model_codec import encode_model, decode_model
+
+KEYFRAME_INTERVAL = 16  # Každý n-tý záznam histórie je úplný snímok modelu
+
+@dataclass
+class HistoryEntry:
+    """
+    Jeden záznam histórie modelu.
+    
+    Atributy:
+        snapshot: Úplný model zakódovaný pomocou encode_model (kľúčový snímok), inak None
+        patch: Rozdiel oproti predchádzajúcemu záznamu, ak nejde o snímok
+        metadata: Údaje záznamu (kroky trénovania, použité príklady, čas, ...)
+        empty: Záznam bez modelu
+    """
+    snapshot: Optional[bytes] = None
+    patch: Optional[ModelPatch] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    empty: bool = False
+
+class ModelHistory:
+    """
+    História stavov modelu uložená ako snímky a rozdiely.
+    
+    Prvý záznam a každý KEYFRAME_INTERVAL-ty záznam je úplný snímok
+    (binárne zakódovaný, takže ho nemožno omylom zmeniť), ostatné záznamy obsahujú len rozdiel (ModelPatch) oproti predchádzajúcemu
+    stavu. Posledne obnovený stav si história pamätá, takže krok späť alebo
+    vpred znamená aplikovať jediný rozdiel.
+    """
+    
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._entries: List[HistoryEntry] = []
+        # Posledne obnovený stav: (index, model), model nikto mimo histórie nedrží
+        self._cursor: Optional[Tuple[int, Model]] = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Prejde údaje (metadata) všetkých záznamov v poradí."""
+        return (entry.metadata for entry in self._entries)
+    
+    def metadata(self, index: int) -> Dict[str, Any]:
+        return self._entries[index].metadata
+    
+    def clear(self) -> None:
+        self._entries = []
+        self._cursor = None
+    
+    def append(self, model: Optional[Model], metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Pridá stav modelu na koniec histórie.
+        
+        Args:
+            model: Stav modelu (None pre záznam bez modelu)
+            metadata: Údaje záznamu
+        
+        Returns:
+            Index nového záznamu
+        """
+        metadata = metadata or {}
+        index = len(self._entries)
+        
+        if model is None:
+            self._entries.append(HistoryEntry(metadata=metadata, empty=True))
+            return index
+        
+        previous = self._model(index - 1) if index > 0 and not self._entries[index - 1].empty else None
+        if previous is None or index % self.keyframe_interval == 0:
+            self._entries.append(HistoryEntry(snapshot=encode_model(model), metadata=metadata))
+        else:
+            self._entries.append(HistoryEntry(patch=previous.diff(model), metadata=metadata))
+        
+        # Nový stav je známy, ďalší rozdiel sa vypočíta od neho
+        self._cursor = (index, model.copy())
+        return index
+    
+    def truncate(self, length: int) -> None:
+        """Ponechá len prvých length záznamov (zahodí históriu vpred)."""
+        del self._entries[length:]
+        if self._cursor is not None and self._cursor[0] >= length:
+            self._cursor = None
+    
+    def pop_oldest(self) -> None:
+        """Odstráni najstarší záznam; nasledujúci sa v prípade potreby stane snímkom."""
+        if len(self._entries) > 1:
+            following = self._entries[1]
+            if following.patch is not None:
+                following.snapshot = encode_model(self._model(1))
+                following.patch = None
+        del self._entries[0]
+        if self._cursor is not None:
+            index, model = self._cursor
+            self._cursor = (index - 1, model) if index > 0 else None
+    
+    def model_at(self, index: int) -> Optional[Model]:
+        """
+        Obnoví stav modelu v zázname index.
+        
+        Returns:
+            Nový model (kópia, ktorú môže volajúci meniť) alebo None pre záznam bez modelu
+        """
+        model = self._model(index)
+        return model.copy() if model is not None else None
+    
+    def _keyframe_of(self, index: int) -> int:
+        """Index najbližšieho snímku na pozícii index alebo pred ňou."""
+        while self._entries[index].snapshot is None:
+            index -= 1
+        return index
+    
+    def _model(self, index: int) -> Optional[Model]:
+        """Stav modelu v zázname index (interná inštancia, nemeniť)."""
+        if index < 0:
+            index += len(self._entries)
+        entry = self._entries[index]
+        if entry.empty:
+            return None
+        
+        keyframe = self._keyframe_of(index)
+        if self._cursor is not None and self._keyframe_of(self._cursor[0]) == keyframe:
+            # Kurzor je za tým istým snímkom - stačí prejsť rozdiely medzi nimi
+            position, model = self._cursor
+            while position > index:
+                model.revert(self._entries[position].patch)
+                position -= 1
+        else:
+            position, model = keyframe, decode_model(self._entries[keyframe].snapshot)
+        
+        while position < index:
+            position += 1
+            model.apply(self._entries[position].patch)
+        
+        self._cursor = (index, model)
+        return model
@@ -0,0 +1,237 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Callable, Dict, Any, Tuple
+import hashlib
+import os
+import threading
+
+from backend.pl1_parser import parse_pl1_formula, Formula
+from backend.model import Model
+
+# Pod týmto počtom príkladov sa paralelné spracovanie neoplatí (réžia procesov)
+MIN_PARALLEL_EXAMPLES = 256
+PARSE_CACHE_SIZE = 50000  # Predvolený počet formúl uchovávaných v ParseCache
+
+@dataclass
+class IngestResult:
+    """
+    Výsledok spracovania jedného príkladu datasetu.
+    
+    Atributy:
+        index: Poradie príkladu v nahrávanom datasete
+        formula: Sparsovaná formula (None pri chybe alebo z pracovného procesu)
+        model: Model príkladu ako slovník (None pri chybe)
+        error: Text chyby pri parsovaní alebo konverzii
+        empty: True, ak príklad obsahuje prázdnu formulu
+    """
+    index: int
+    formula: Optional[Formula] = None
+    model: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    empty: bool = False
+
+def _ingest_chunk(start: int, texts: List[str], convert: Callable[[Formula], Model],
+                  keep_formula: bool = True) -> List[IngestResult]:
+    """
+    Sparsuje a skonvertuje jeden súvislý úsek príkladov.
+    
+    V pracovnom procese sa formula nevracia (keep_formula=False) - prenos celého
+    stromu formuly medzi procesmi by stál viac než jej opätovné sparsovanie,
+    ak ju bude neskôr niekto potrebovať.
+    """
+    results = []
+    for offset, text in enumerate(texts):
+        index = start + offset
+        if not text or not text.strip():
+            results.append(IngestResult(index=index, empty=True))
+            continue
+        
+        try:
+            formula = parse_pl1_formula(text)
+            model = convert(formula)
+            results.append(IngestResult(
+                index=index,
+                formula=formula if keep_formula else None,
+                model=model.to_dict()
+            ))
+        except Exception as e:
+            results.append(IngestResult(index=index, error=str(e)))
+    
+    return results
+
+def normalize_formula_text(text: str) -> str:
+    """
+    Znormalizuje text formuly pre porovnanie obsahu.
+    
+    Odstráni okrajové medzery na riadkoch a prázdne riadky, takže formuly
+    líšiace sa len odsadením alebo zalomením na konci sa považujú za rovnaké.
+    Medzery vnútri riadku sa nemenia (môžu byť súčasťou argumentu v úvodzovkách).
+    """
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+def _copy_model_dict(model: Dict[str, Any]) -> Dict[str, Any]:
+    """Skopíruje slovník modelu tak, aby úpravy jedného príkladu neovplyvnili cache."""
+    return {
+        "objects": [
+            {**obj, "attributes": dict(obj["attributes"]) if obj.get("attributes") is not None else None}
+            for obj in model["objects"]
+        ],
+        "links": [dict(link) for link in model["links"]]
+    }
+
+class ParseCache:
+    """
+    Ohraničená LRU cache sparsovaných formúl a ich modelov.
+    
+    Kľúčom je hash znormalizovaného textu formuly, hodnotou dvojica
+    (Formula, model ako slovník). Pri opätovnom nahratí takmer rovnakého
+    datasetu sa tak parsujú a konvertujú len zmenené príklady.
+    """
+    
+    def __init__(self, max_size: int = PARSE_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[bytes, Tuple[Optional[Formula], Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Vráti kľúč cache pre text formuly."""
+        return hashlib.blake2b(normalize_formula_text(text).encode("utf-8"), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[Tuple[Optional[Formula], Dict[str, Any]]]:
+        """
+        Vráti dvojicu (formula, kópia modelu) alebo None, ak formula v cache nie je.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        formula, model = entry
+        return formula, _copy_model_dict(model)
+    
+    def put(self, key: bytes, formula: Optional[Formula], model: Dict[str, Any]) -> None:
+        """Uloží formulu a model; pri prekročení veľkosti vyhodí najdlhšie nepoužitú položku."""
+        with self._lock:
+            self._entries[key] = (formula, _copy_model_dict(model))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Vyprázdni cache a vynuluje počítadlá."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Vráti počítadlá zásahov a výpadkov cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+_executor = None
+_executor_workers = 0
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Vráti zdieľaný pool procesov, aby sa nevytváral pri každom nahrávaní znova."""
+    global _executor, _executor_workers
+    
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    
+    return _executor
+
+def ingest_examples(texts: List[str], convert: Callable[[Formula], Model],
+                    parallel: bool = False, workers: Optional[int] = None,
+                    cache: Optional[ParseCache] = None) -> List[IngestResult]:
+    """
+    Sparsuje formuly príkladov a vytvorí z nich modely.
+    
+    V paralelnom režime sa dataset rozdelí na hraniciach príkladov na súvislé
+    úseky, ktoré sa spracujú v ProcessPoolExecutor. Výsledky sa vrátia
+    v pôvodnom poradí a chyby sa hlásia pre každý príklad zvlášť, rovnako
+    ako pri sekvenčnom spracovaní.
+    
+    Ak je zadaná cache, príklady s už známou formulou sa neparsujú znova
+    a spracujú sa len zvyšné (zmenené) príklady.
+    
+    Args:
+        texts: Texty formúl príkladov v poradí datasetu
+        convert: Funkcia konvertujúca formulu na model (musí byť definovaná na úrovni modulu)
+        parallel: Ak je True, príklady sa spracujú vo viacerých procesoch
+        workers: Počet procesov (predvolene počet jadier)
+        cache: Voliteľná ParseCache s už sparsovanými formulami
+    
+    Returns:
+        Zoznam IngestResult v rovnakom poradí ako texts
+    """
+    if cache is None:
+        return _ingest_uncached(texts, convert, parallel, workers)
+    
+    results: List[Optional[IngestResult]] = [None] * len(texts)
+    missing_indices = []
+    missing_keys = []
+    for index, text in enumerate(texts):
+        if not text or not text.strip():
+            results[index] = IngestResult(index=index, empty=True)
+            continue
+        
+        key = ParseCache.key(text)
+        entry = cache.get(key)
+        if entry is not None:
+            results[index] = IngestResult(index=index, formula=entry[0], model=entry[1])
+        else:
+            missing_indices.append(index)
+            missing_keys.append(key)
+    
+    computed = _ingest_uncached([texts[index] for index in missing_indices], convert, parallel, workers)
+    for index, key, result in zip(missing_indices, missing_keys, computed):
+        result.index = index
+        if result.error is None:
+            cache.put(key, result.formula, result.model)
+        results[index] = result
+    
+    return results
+
+def _ingest_uncached(texts: List[str], convert: Callable[[Formula], Model],
+                     parallel: bool, workers: Optional[int]) -> List[IngestResult]:
+    """Spracuje všetky príklady bez cache, sekvenčne alebo v pool-e procesov."""
+    workers = workers or os.cpu_count() or 1
+    
+    if not parallel or workers < 2 or len(texts) < MIN_PARALLEL_EXAMPLES:
+        return _ingest_chunk(0, texts, convert)
+    
+    # Niekoľko úsekov na proces, aby sa záťaž vyrovnala aj pri nerovnako veľkých príkladoch
+    chunk_size = max(1, -(-len(texts) // (workers * 4)))
+    executor = _get_executor(workers)
+    
+    futures = [
+        executor.submit(_ingest_chunk, start, texts[start:start + chunk_size], convert, False)
+        for start in range(0, len(texts), chunk_size)
+    ]
+    
+    results = []
+    for future in futures:
+        results.extend(future.result())
+    
+    return results
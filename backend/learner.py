@@ -1,9 +1,15 @@
 from backend.model import Model, Link, LinkType, ClassificationTree, Object
+from backend.domains import Interval, ValueSet, as_interval, as_value_set
+from backend.logs import get_logger
 from typing import List, Dict, Set, Tuple, Optional, Any
 import traceback
+import logging
 from datetime import datetime
 import time
-import copy
+
+log = get_logger("learner")
+
+VALIDATION_CACHE_SIZE = 4096  # Maximální počet zapamatovaných výsledků kontroly příkladu
 
 class WinstonLearner:
     """
@@ -29,11 +35,18 @@ class WinstonLearner:
         # Udržování historie modelů pro BackUp Rule
         self.model_history = []
         self.max_history_size = 5  # Maximální počet uložených historických modelů
+        # Výsledky _is_example_valid podle otisků modelu a příkladu
+        self._validation_cache = {}
     
-    def _debug_log(self, message):
-        """Debugovacie logovanie pre sledovanie priebehu algoritmu."""
-        if self.debug_enabled:
-            print(f"[WinstonLearner] {message}")
+    def _debug_log(self, message, *args):
+        """
+        Debugovacie logovanie pre sledovanie priebehu algoritmu.
+        
+        Správa sa skladá lenivo (argumenty v štýle %), takže pri vypnutom
+        logovaní sa modely a príklady neprevádzajú na text. Úroveň určuje
+        logger subsystému "learner"; debug_enabled zapne výpis pre túto inštanciu.
+        """
+        log.log(logging.INFO if self.debug_enabled else logging.DEBUG, message, *args)
 
     def update_model(self, model: Model, good: Model, near_miss: Model) -> Model:
         """
@@ -71,9 +84,9 @@ class WinstonLearner:
         
         # Debugovanie
         self._debug_log("Začínam aktualizáciu modelu")
-        self._debug_log(f"Pozitívny príklad: {good}")
+        self._debug_log("Pozitívny príklad: %s", good)
         if near_miss:
-            self._debug_log(f"Near-miss príklad: {near_miss}")
+            self._debug_log("Near-miss príklad: %s", near_miss)
         else:
             self._debug_log("Near-miss príklad: None")
         
@@ -120,7 +133,7 @@ class WinstonLearner:
         
         # Výpis aplikovaných heuristík
         if self.applied_heuristics:
-            self._debug_log(f"Aplikované heuristiky: {', '.join(self.applied_heuristics)}")
+            self._debug_log("Aplikované heuristiky: %s", ', '.join(self.applied_heuristics))
         else:
             self._debug_log("Žiadna heuristika nebola aplikovaná")
             
@@ -133,8 +146,12 @@ class WinstonLearner:
         Args:
             model: Model k uložení do historie
         """
-        # Uložíme hlubokou kopii modelu
-        self.model_history.append(copy.deepcopy(model))
+        # Stejný model jako poslední uložený už neukládáme
+        if self.model_history and self.model_history[-1].fingerprint() == model.fingerprint():
+            return
+        
+        # Uložíme kopii modelu (prvky se kopírují až při zápisu)
+        self.model_history.append(model.copy())
         
         # Omezíme velikost historie
         if len(self.model_history) > self.max_history_size:
@@ -177,7 +194,7 @@ class WinstonLearner:
                     class_attributes[class_name][attr_name] = set()
                     
                 # Ak hodnota je už množina, pridáme všetky jej prvky
-                if isinstance(attr_value, set):
+                if as_value_set(attr_value) is not None:
                     class_attributes[class_name][attr_name].update(attr_value)
                 # Ak je to interval, ignorujeme (spracúva sa v close_interval)
                 elif not isinstance(attr_value, tuple):
@@ -194,7 +211,7 @@ class WinstonLearner:
                 
             for attr_name, attr_value in good_obj.attributes.items():
                 # Preskočíme numerické intervaly - tie spracúva close_interval
-                if isinstance(attr_value, tuple) or isinstance(attr_value, set):
+                if isinstance(attr_value, tuple) or as_value_set(attr_value) is not None:
                     continue
                     
                 if attr_name not in class_attributes[class_name]:
@@ -213,6 +230,7 @@ class WinstonLearner:
                 continue
                 
             if not model_obj.attributes:
+                model_obj = updated_model.writable_object(model_obj)
                 model_obj.attributes = {}
                 
             # Pre každý atribút, ktorý máme pre túto triedu
@@ -220,26 +238,29 @@ class WinstonLearner:
                 # Ak máme viac ako jednu hodnotu, vytvoríme množinu
                 if len(values_set) > 1:
                     # Aktuálna hodnota v objekte
-                    current_value = model_obj.attributes.get(attr_name)
+                    current_value = as_value_set(model_obj.attributes.get(attr_name))
                     
                     # Ak aktuálna hodnota nie je množina, aktualizujeme ju
-                    if not isinstance(current_value, set):
-                        model_obj.attributes[attr_name] = values_set
+                    if current_value is None:
+                        model_obj = updated_model.writable_object(model_obj)
+                        model_obj.attributes[attr_name] = ValueSet(values_set)
                         heuristic_applied = True
-                        self._debug_log(f"Vytvorená množina hodnôt pre atribút {attr_name} triedy {class_name}: {values_set}")
+                        self._debug_log("Vytvorená množina hodnôt pre atribút %s triedy %s: %s", attr_name, class_name, values_set)
                     # Ak už máme množinu, skontrolujeme, či treba pridať nové hodnoty
                     elif current_value != values_set:
-                        # Pridáme chýbajúce hodnoty
-                        missing_values = values_set - current_value
+                        # Pridáme chýbajúce hodnoty (nová množina - pôvodnú môžu zdieľať iné objekty)
+                        missing_values = {value for value in values_set if value not in current_value}
                         if missing_values:
-                            current_value.update(missing_values)
+                            model_obj = updated_model.writable_object(model_obj)
+                            model_obj.attributes[attr_name] = current_value.union(missing_values)
                             heuristic_applied = True
-                            self._debug_log(f"Rozšírená množina hodnôt atribútu {attr_name} pre triedu {class_name} o {missing_values}")
+                            self._debug_log("Rozšírená množina hodnôt atribútu %s pre triedu %s o %s", attr_name, class_name, missing_values)
                 # Ak máme len jednu hodnotu a atribút ešte neexistuje, pridáme ho
                 elif len(values_set) == 1 and attr_name not in model_obj.attributes:
+                    model_obj = updated_model.writable_object(model_obj)
                     model_obj.attributes[attr_name] = next(iter(values_set))
                     heuristic_applied = True
-                    self._debug_log(f"Pridaný nový atribút {attr_name} s hodnotou {next(iter(values_set))} pre objekt triedy {class_name}")
+                    self._debug_log("Pridaný nový atribút %s s hodnotou %s pre objekt triedy %s", attr_name, next(iter(values_set)), class_name)
         
         # 4. Osobitné spracovanie pre možnosti ekvivalentných komponentov (napr. rôzne typy motorov)
         # Zbierame komponenty podľa nadradených tried
@@ -263,7 +284,7 @@ class WinstonLearner:
         # Ak máme viac ako jeden typ komponentu pre rodičovskú triedu, vytvoríme pravidlo
         for parent_class, subclasses in component_classes.items():
             if len(subclasses) > 1:
-                self._debug_log(f"Nájdené ekvivalentné komponenty pre triedu {parent_class}: {subclasses}")
+                self._debug_log("Nájdené ekvivalentné komponenty pre triedu %s: %s", parent_class, subclasses)
                 
                 # Pre každý objekt v modeli, ktorý má MUST spojenie s touto komponentou
                 for link in updated_model.links:
@@ -274,19 +295,23 @@ class WinstonLearner:
                         for obj in updated_model.objects:
                             if obj.class_name == source_class:
                                 if not obj.attributes:
+                                    obj = updated_model.writable_object(obj)
                                     obj.attributes = {}
                                     
                                 # Vytvoríme alebo aktualizujeme atribút allowed_components
                                 attr_name = f"allowed_{parent_class.lower()}_types"
                                 
-                                if attr_name not in obj.attributes or not isinstance(obj.attributes[attr_name], set):
-                                    obj.attributes[attr_name] = subclasses
+                                allowed = as_value_set(obj.attributes.get(attr_name))
+                                if allowed is None:
+                                    obj = updated_model.writable_object(obj)
+                                    obj.attributes[attr_name] = ValueSet(subclasses)
                                     heuristic_applied = True
-                                    self._debug_log(f"Vytvorená množina povolených komponentov {attr_name} pre triedu {source_class}: {subclasses}")
-                                elif subclasses - obj.attributes[attr_name]:
-                                    obj.attributes[attr_name].update(subclasses)
+                                    self._debug_log("Vytvorená množina povolených komponentov %s pre triedu %s: %s", attr_name, source_class, subclasses)
+                                elif not allowed.issuperset(subclasses):
+                                    obj = updated_model.writable_object(obj)
+                                    obj.attributes[attr_name] = allowed.union(subclasses)
                                     heuristic_applied = True
-                                    self._debug_log(f"Rozšírená množina povolených komponentov {attr_name} pre triedu {source_class}")
+                                    self._debug_log("Rozšírená množina povolených komponentov %s pre triedu %s", attr_name, source_class)
         
         if heuristic_applied:
             self.applied_heuristics.append("enlarge_set")
@@ -325,28 +350,27 @@ class WinstonLearner:
                 # Najdeme odpovídající objekty v modelu
                 for obj in updated_model.objects:
                     if obj.class_name == good_obj.class_name and obj.attributes:
+                        current_value = obj.attributes.get(attr_name)
+                        interval = as_interval(current_value)
+                        
                         # Pokud atribut existuje a je to interval
-                        if attr_name in obj.attributes and isinstance(obj.attributes[attr_name], tuple) and len(obj.attributes[attr_name]) == 2:
-                            current_min, current_max = obj.attributes[attr_name]
-                            
-                            # Pokud hodnota pozitivního příkladu je mimo interval, aktualizujeme ho
-                            if attr_value < current_min or attr_value > current_max:
-                                # Rozšíříme interval tak, aby zahrnoval novou hodnotu
-                                new_min = min(current_min, attr_value)
-                                new_max = max(current_max, attr_value)
-                                obj.attributes[attr_name] = (new_min, new_max)
+                        if interval is not None:
+                            # Pokud hodnota pozitivního příkladu je mimo interval, rozšíříme ho tak, aby ji zahrnoval
+                            if not interval.contains(attr_value):
+                                interval = interval.widen(attr_value)
+                                obj = updated_model.writable_object(obj)
+                                obj.attributes[attr_name] = interval
                                 self.applied_heuristics.append("close_interval")
-                                self._debug_log(f"Rozšířen interval atributu {attr_name} pro třídu {good_obj.class_name} na ({new_min}, {new_max})")
+                                self._debug_log("Rozšířen interval atributu %s pro třídu %s na (%s, %s)", attr_name, good_obj.class_name, interval.low, interval.high)
                         
                         # Pokud atribut neexistuje nebo není interval, vytvoříme nový interval
-                        elif attr_name not in obj.attributes or not isinstance(obj.attributes[attr_name], tuple):
-                            # Pro nový atribut vytvoříme interval s malou tolerancí
-                            tolerance = max(0.1, abs(attr_value) * 0.05)  # 5% tolerance nebo minimálně 0.1
-                            new_min = attr_value - tolerance
-                            new_max = attr_value + tolerance
-                            obj.attributes[attr_name] = (new_min, new_max)
+                        elif not isinstance(current_value, tuple):
+                            # Pro nový atribut vytvoříme interval s malou tolerancí (5 % nebo minimálně 0.1)
+                            interval = Interval.around(attr_value, 0.05, 0.1)
+                            obj = updated_model.writable_object(obj)
+                            obj.attributes[attr_name] = interval
                             self.applied_heuristics.append("close_interval")
-                            self._debug_log(f"Vytvořen nový interval pro atribut {attr_name} třídy {good_obj.class_name}: ({new_min}, {new_max})")
+                            self._debug_log("Vytvořen nový interval pro atribut %s třídy %s: (%s, %s)", attr_name, good_obj.class_name, interval.low, interval.high)
         
         # 2. Zpracování near-miss příkladů - vyloučení hodnot
         if near_miss:
@@ -363,11 +387,12 @@ class WinstonLearner:
                     for obj in updated_model.objects:
                         if obj.class_name == near_miss_obj.class_name and obj.attributes and attr_name in obj.attributes:
                             # Pokud atribut existuje a je to interval
-                            if isinstance(obj.attributes[attr_name], tuple) and len(obj.attributes[attr_name]) == 2:
-                                current_min, current_max = obj.attributes[attr_name]
+                            interval = as_interval(obj.attributes[attr_name])
+                            if interval is not None:
+                                current_min, current_max = interval
                                 
                                 # Pokud hodnota near-miss příkladu je v intervalu, zúžíme interval
-                                if current_min <= attr_value <= current_max:
+                                if interval.contains(attr_value):
                                     # Vyloučíme hodnotu z intervalu s malou tolerancí
                                     tolerance = max(0.01, abs(attr_value) * 0.01)  # 1% tolerance nebo minimálně 0.01
                                     
@@ -376,16 +401,18 @@ class WinstonLearner:
                                         # Hodnota je blíže k dolní hranici, posuneme dolní hranici nad hodnotu
                                         new_min = attr_value + tolerance
                                         if new_min < current_max:  # Ujistíme se, že interval je stále platný
-                                            obj.attributes[attr_name] = (new_min, current_max)
+                                            obj = updated_model.writable_object(obj)
+                                            obj.attributes[attr_name] = Interval(new_min, current_max)
                                             self.applied_heuristics.append("close_interval")
-                                            self._debug_log(f"Zúžen interval atributu {attr_name} pro třídu {near_miss_obj.class_name} vyloučením hodnoty {attr_value}")
+                                            self._debug_log("Zúžen interval atributu %s pro třídu %s vyloučením hodnoty %s", attr_name, near_miss_obj.class_name, attr_value)
                                     else:
                                         # Hodnota je blíže k horní hranici, posuneme horní hranici pod hodnotu
                                         new_max = attr_value - tolerance
                                         if new_max > current_min:  # Ujistíme se, že interval je stále platný
-                                            obj.attributes[attr_name] = (current_min, new_max)
+                                            obj = updated_model.writable_object(obj)
+                                            obj.attributes[attr_name] = Interval(current_min, new_max)
                                             self.applied_heuristics.append("close_interval")
-                                            self._debug_log(f"Zúžen interval atributu {attr_name} pro třídu {near_miss_obj.class_name} vyloučením hodnoty {attr_value}")
+                                            self._debug_log("Zúžen interval atributu %s pro třídu %s vyloučením hodnoty %s", attr_name, near_miss_obj.class_name, attr_value)
         
         return updated_model
 
@@ -452,70 +479,22 @@ class WinstonLearner:
         Returns:
             True, pokud příklad splňuje všechna pravidla modelu, jinak False
         """
-        # Kontrola, zda příklad má všechny požadované MUST vazby
-        for link in model.links:
-            if link.link_type == LinkType.MUST:
-                # Najdeme všechny objekty ve zdroji třídy
-                source_objects = [obj for obj in example.objects if obj.class_name == link.source]
-                
-                for source_obj in source_objects:
-                    # Hledáme, zda existuje spojení tohoto objektu s objektem cílové třídy
-                    has_target = False
-                    
-                    for example_link in example.links:
-                        if example_link.source == source_obj.name:
-                            target_obj = next((obj for obj in example.objects if obj.name == example_link.target), None)
-                            if target_obj and (target_obj.class_name == link.target or 
-                                               self.classification_tree.is_subclass(target_obj.class_name, link.target)):
-                                has_target = True
-                                break
-                    
-                    if not has_target:
-                        return False
+        key = (model.fingerprint(), example.fingerprint(), self.classification_tree.version)
+        cached = self._validation_cache.get(key)
+        if cached is None:
+            if len(self._validation_cache) >= VALIDATION_CACHE_SIZE:
+                self._validation_cache.clear()
+            cached = self._validation_cache[key] = self._check_example_valid(model, example)
+        return cached
+
+    def _check_example_valid(self, model: Model, example: Model) -> bool:
+        """
+        Vlastní kontrola příkladu proti modelu (bez cache), viz _is_example_valid.
         
-        # Kontrola, zda příklad neobsahuje zakázané MUST_NOT vazby
-        for link in model.links:
-            if link.link_type == LinkType.MUST_NOT:
-                source_objects = [obj for obj in example.objects if obj.class_name == link.source]
-                
-                for source_obj in source_objects:
-                    for example_link in example.links:
-                        if example_link.source == source_obj.name:
-                            target_obj = next((obj for obj in example.objects if obj.name == example_link.target), None)
-                            if target_obj and (target_obj.class_name == link.target or 
-                                               self.classification_tree.is_subclass(target_obj.class_name, link.target)):
-                                return False
-        
-        # Kontrola atributů - pro každý objekt v modelu s definovanými atributy
-        for model_obj in model.objects:
-            if not model_obj.attributes:
-                continue
-                
-            # Najdeme odpovídající objekty ve příkladu
-            for example_obj in example.objects:
-                if example_obj.class_name == model_obj.class_name:
-                    # Kontrola numerických intervalů
-                    for attr_name, model_value in model_obj.attributes.items():
-                        if isinstance(model_value, tuple) and len(model_value) == 2:
-                            # Je to interval
-                            min_val, max_val = model_value
-                            
-                            # Pokud příklad má tento atribut, zkontrolujeme, zda hodnota je v intervalu
-                            if example_obj.attributes and attr_name in example_obj.attributes:
-                                example_value = example_obj.attributes[attr_name]
-                                if isinstance(example_value, (int, float)) and (example_value < min_val or example_value > max_val):
-                                    return False
-                        
-                        # Kontrola množin hodnot
-                        elif isinstance(model_value, set):
-                            # Je to množina přijatelných hodnot
-                            if example_obj.attributes and attr_name in example_obj.attributes:
-                                example_value = example_obj.attributes[attr_name]
-                                if example_value not in model_value:
-                                    return False
-        
-        # Pokud všechny kontroly prošly, příklad je platný
-        return True
+        Pravidla vyhodnocuje stejný ModelMatcher jako is_valid_example, jen
+        v booleovském režimu - skončí u prvního porušení a nevytváří popisy.
+        """
+        return model.matcher(self.classification_tree).accepts(example)
 
     def _propagate_to_common_ancestor(self, model: Model) -> Model:
         """
@@ -538,32 +517,40 @@ class WinstonLearner:
                     classes_with_must[link.source] = []
                 classes_with_must[link.source].append(link.target)
         
-        # Pro každou dvojici tříd zkontrolujeme, zda mají stejné MUST vazby
+        # Dvojice tříd, které mají alespoň jednu společnou MUST vazbu (v pořadí class1, class2)
+        must_targets = {source: set(targets) for source, targets in classes_with_must.items()}
+        classes_by_target = {}
+        for source, targets in must_targets.items():
+            for target in targets:
+                classes_by_target.setdefault(target, []).append(source)
+        position = {source: index for index, source in enumerate(classes_with_must)}
+        pairs = sorted(
+            {(class1, class2) for sources in classes_by_target.values()
+             for class1 in sources for class2 in sources if class1 != class2},
+            key=lambda pair: (position[pair[0]], position[pair[1]])
+        )
+        
+        # Společné předky všech dvojic najdeme naraz
         common_rules = {}
-        for class1 in classes_with_must:
-            for class2 in classes_with_must:
-                if class1 != class2:
-                    # Najdeme společného předka obou tříd
-                    common_ancestor = self.classification_tree.find_common_ancestor(class1, class2)
-                    if common_ancestor:
-                        # Najdeme společné MUST vazby
-                        common_targets = set(classes_with_must[class1]) & set(classes_with_must[class2])
-                        for target in common_targets:
-                            if common_ancestor not in common_rules:
-                                common_rules[common_ancestor] = set()
-                            common_rules[common_ancestor].add(target)
+        for (class1, class2), common_ancestor in zip(pairs, self.classification_tree.find_common_ancestors(pairs)):
+            if common_ancestor:
+                # Najdeme společné MUST vazby
+                common_targets = must_targets[class1] & must_targets[class2]
+                for target in common_targets:
+                    if common_ancestor not in common_rules:
+                        common_rules[common_ancestor] = set()
+                    common_rules[common_ancestor].add(target)
         
         # Přidáme pravidla na společné předky
         for ancestor, targets in common_rules.items():
             for target in targets:
                 # Zkontrolujeme, zda pravidlo už neexistuje
-                if not any(link.source == ancestor and link.target == target and link.link_type == LinkType.MUST 
-                         for link in updated_model.links):
+                new_link = Link(source=ancestor, target=target, link_type=LinkType.MUST)
+                if not updated_model.has_link(new_link):
                     # Přidáme nové pravidlo
-                    new_link = Link(source=ancestor, target=target, link_type=LinkType.MUST)
                     updated_model.add_link(new_link)
                     self.applied_heuristics.append("propagate_to_common_ancestor")
-                    self._debug_log(f"Propagováno pravidlo na společného předka: {ancestor} MUST {target}")
+                    self._debug_log("Propagováno pravidlo na společného předka: %s MUST %s", ancestor, target)
         
         return updated_model
 
@@ -593,12 +580,12 @@ class WinstonLearner:
                     for good_link in good.links:
                         if good_link.source == good_obj.name:
                             # Najít cílový objekt v pozitivním příkladu
-                            good_target_obj = next((obj for obj in good.objects if obj.name == good_link.target), None)
+                            good_target_obj = good.get_object(good_link.target)
                             if good_target_obj:
                                 # Kontrola, zda jsou třídy v hierarchickém vztahu
                                 if (self.classification_tree.is_subclass(good_obj.class_name, source_class) and
                                     self.classification_tree.is_subclass(good_target_obj.class_name, target_class)):
-                                    self._debug_log(f"Detekován konflikt: {good_obj.name}({good_obj.class_name}) -> {good_target_obj.name}({good_target_obj.class_name}) konfliktuje s pravidlem {source_class} -> {target_class}")
+                                    self._debug_log("Detekován konflikt: %s(%s) -> %s(%s) konfliktuje s pravidlem %s -> %s", good_obj.name, good_obj.class_name, good_target_obj.name, good_target_obj.class_name, source_class, target_class)
                                     conflicting_links.append(link)
         
         # Odstranit konfliktní pravidla a vytvořit generalizované pravidlo
@@ -606,7 +593,7 @@ class WinstonLearner:
             # Odstraníme konfliktní pravidlo
             updated_model.links.remove(link)
             self.applied_heuristics.append("resolve_conflict")
-            self._debug_log(f"Odstraněno konfliktní pravidlo: {link.source} -> {link.target} ({link.link_type.value})")
+            self._debug_log("Odstraněno konfliktní pravidlo: %s -> %s (%s)", link.source, link.target, link.link_type.value)
             
             # Hledáme nadřazenou třídu, která by mohla sloužit pro generalizaci
             target_parent = self.classification_tree.get_parent(link.target)
@@ -626,7 +613,7 @@ class WinstonLearner:
                            for l in updated_model.links):
                     updated_model.add_link(generalized_link)
                     self.applied_heuristics.append("generalize_conflict")
-                    self._debug_log(f"Vytvořeno generalizované pravidlo: {generalized_link.source} -> {generalized_link.target} (MUST)")
+                    self._debug_log("Vytvořeno generalizované pravidlo: %s -> %s (MUST)", generalized_link.source, generalized_link.target)
         
         return updated_model
 
@@ -646,7 +633,7 @@ class WinstonLearner:
         
         # Kontrola, zda objekty z příkladu existují v modelu
         for good_obj in good.objects:
-            if not any(obj.name == good_obj.name for obj in updated_model.objects):
+            if not updated_model.has_object(good_obj.name):
                 # Přidání nového objektu
                 updated_model.objects.append(Object(
                     name=good_obj.name,
@@ -654,12 +641,11 @@ class WinstonLearner:
                     attributes=good_obj.attributes
                 ))
                 self.applied_heuristics.append("add_object")
-                self._debug_log(f"Přidán nový objekt: {good_obj.name} ({good_obj.class_name})")
+                self._debug_log("Přidán nový objekt: %s (%s)", good_obj.name, good_obj.class_name)
         
         # Přidání chybějících spojení
         for good_link in good.links:
-            if not any(link.source == good_link.source and link.target == good_link.target 
-                      for link in updated_model.links):
+            if not any(link.target == good_link.target for link in updated_model.links_from(good_link.source)):
                 # Přidání nového spojení
                 updated_model.add_link(Link(
                     source=good_link.source,
@@ -667,7 +653,7 @@ class WinstonLearner:
                     link_type=good_link.link_type
                 ))
                 self.applied_heuristics.append("add_link")
-                self._debug_log(f"Přidáno nové spojení: {good_link.source} -> {good_link.target}")
+                self._debug_log("Přidáno nové spojení: %s -> %s", good_link.source, good_link.target)
             
         return updated_model
 
@@ -697,8 +683,8 @@ class WinstonLearner:
         # previesť na MUST na základe rozdielov medzi good a near_miss
         for good_link in good.links:
             # Nájdeme zodpovedajúce objekty v positive
-            good_source = next((obj for obj in good.objects if obj.name == good_link.source), None)
-            good_target = next((obj for obj in good.objects if obj.name == good_link.target), None)
+            good_source = good.get_object(good_link.source)
+            good_target = good.get_object(good_link.target)
             
             if not good_source or not good_target:
                 continue
@@ -707,8 +693,8 @@ class WinstonLearner:
             near_miss_has_similar_link = False
             
             for near_miss_link in near_miss.links:
-                near_miss_source = next((obj for obj in near_miss.objects if obj.name == near_miss_link.source), None)
-                near_miss_target = next((obj for obj in near_miss.objects if obj.name == near_miss_link.target), None)
+                near_miss_source = near_miss.get_object(near_miss_link.source)
+                near_miss_target = near_miss.get_object(near_miss_link.target)
                 
                 if not near_miss_source or not near_miss_target:
                     continue
@@ -728,7 +714,7 @@ class WinstonLearner:
                         link.source == good_source.class_name and
                         link.target == good_target.class_name):
                         has_conflict = True
-                        self._debug_log(f"Přeskakuji MUST pravidlo kvůli konfliktu: {good_source.class_name} -> {good_target.class_name}")
+                        self._debug_log("Přeskakuji MUST pravidlo kvůli konfliktu: %s -> %s", good_source.class_name, good_target.class_name)
                         break
                 
                 if not has_conflict:
@@ -746,7 +732,7 @@ class WinstonLearner:
                                for link in updated_model.links):
                         updated_model.add_link(must_link)
                         self.applied_heuristics.append("require_link")
-                        self._debug_log(f"Pridané pravidlo MUST: {good_source.class_name} -> {good_target.class_name}")
+                        self._debug_log("Pridané pravidlo MUST: %s -> %s", good_source.class_name, good_target.class_name)
                 
                 # Pridáme tiež väzbu na úrovni konkrétnych objektov, ak ešte neexistuje
                 inst_link = Link(
@@ -758,7 +744,7 @@ class WinstonLearner:
                 if not updated_model.has_link(inst_link):
                     updated_model.add_link(inst_link)
                     self.applied_heuristics.append("require_link")
-                    self._debug_log(f"Pridaná MUST väzba na úrovni objektov: {good_link.source} -> {good_link.target}")
+                    self._debug_log("Pridaná MUST väzba na úrovni objektov: %s -> %s", good_link.source, good_link.target)
         
         return updated_model
 
@@ -793,8 +779,8 @@ class WinstonLearner:
         
         # 2. Pro klíčové rozdíly vytvořit MUST_NOT pravidla
         for near_miss_link in near_miss.links:
-            near_miss_source = next((obj for obj in near_miss.objects if obj.name == near_miss_link.source), None)
-            near_miss_target = next((obj for obj in near_miss.objects if obj.name == near_miss_link.target), None)
+            near_miss_source = near_miss.get_object(near_miss_link.source)
+            near_miss_target = near_miss.get_object(near_miss_link.target)
             
             if not near_miss_source or not near_miss_target:
                 continue
@@ -811,7 +797,7 @@ class WinstonLearner:
                          link.source == near_miss_source.class_name and self.classification_tree.is_subclass(near_miss_target.class_name, link.target) or
                          link.source == near_miss_source.class_name and self.classification_tree.is_subclass(link.target, near_miss_target.class_name))):
                         has_conflict = True
-                        self._debug_log(f"Přeskakuji MUST_NOT pravidlo kvůli konfliktu: {near_miss_source.class_name} -> {near_miss_target.class_name}")
+                        self._debug_log("Přeskakuji MUST_NOT pravidlo kvůli konfliktu: %s -> %s", near_miss_source.class_name, near_miss_target.class_name)
                         break
                 
                 if not has_conflict:
@@ -829,7 +815,7 @@ class WinstonLearner:
                                for link in updated_model.links):
                         updated_model.add_link(must_not_link)
                         self.applied_heuristics.append("forbid_link")
-                        self._debug_log(f"Přidáno pravidlo MUST_NOT pro klíčový rozdíl: {near_miss_source.class_name} -> {near_miss_target.class_name}")
+                        self._debug_log("Přidáno pravidlo MUST_NOT pro klíčový rozdíl: %s -> %s", near_miss_source.class_name, near_miss_target.class_name)
         
                     # Přidat také konkrétní vazbu na úrovni objektů
                     inst_link = Link(
@@ -841,7 +827,7 @@ class WinstonLearner:
                     if not updated_model.has_link(inst_link):
                         updated_model.add_link(inst_link)
                         self.applied_heuristics.append("forbid_link")
-                        self._debug_log(f"Přidána MUST_NOT vazba na úrovni objektů: {near_miss_link.source} -> {near_miss_link.target}")
+                        self._debug_log("Přidána MUST_NOT vazba na úrovni objektů: %s -> %s", near_miss_link.source, near_miss_link.target)
         
         return updated_model
     
@@ -899,8 +885,8 @@ class WinstonLearner:
             # Zjistíme, zda existuje odpovídající spojení v pozitivním příkladu
             has_corresponding = False
             
-            for good_link in good.links:
-                if model_link.source == good_link.source and model_link.target == good_link.target:
+            for good_link in good.links_from(model_link.source):
+                if model_link.target == good_link.target:
                     has_corresponding = True
                     break
                     
@@ -911,8 +897,8 @@ class WinstonLearner:
         # Teď odstráníme označené spojení, ale nejprve zkontrolujeme generická pravidla
         for link_to_remove in links_to_remove:
             # Najdeme objekty pro tuto vazbu
-            source_obj = next((obj for obj in updated_model.objects if obj.name == link_to_remove.source), None)
-            target_obj = next((obj for obj in updated_model.objects if obj.name == link_to_remove.target), None)
+            source_obj = updated_model.get_object(link_to_remove.source)
+            target_obj = updated_model.get_object(link_to_remove.target)
             
             if source_obj and target_obj:
                 # Kontrola, zda existuje generické pravidlo mezi třídami objektů
@@ -925,7 +911,7 @@ class WinstonLearner:
                         (rule_link.target == target_obj.class_name or 
                          self.classification_tree.is_subclass(target_obj.class_name, rule_link.target))):
                         has_generic_rule = True
-                        self._debug_log(f"Ponechávám väzbu {link_to_remove.source} -> {link_to_remove.target} kvůli generickému pravidlu {rule_link.source} -> {rule_link.target}")
+                        self._debug_log("Ponechávám väzbu %s -> %s kvůli generickému pravidlu %s -> %s", link_to_remove.source, link_to_remove.target, rule_link.source, rule_link.target)
                         break
                 
                 # Pokud není generické pravidlo, můžeme spojení odstranit
@@ -933,7 +919,7 @@ class WinstonLearner:
                     updated_model.remove_link(link_to_remove)
                     self.applied_heuristics.append("drop_link")
                     was_applied = True
-                    self._debug_log(f"Odstránená nepodstatná väzba: {link_to_remove.source} -> {link_to_remove.target}")
+                    self._debug_log("Odstránená nepodstatná väzba: %s -> %s", link_to_remove.source, link_to_remove.target)
         
         # Zajistíme, že je heuristika označena jako aplikovaná, pokud nějaká vazba byla odstraněna
         if was_applied:
@@ -971,25 +957,27 @@ class WinstonLearner:
                         )
                         
                         if common_ancestor:
-                            self._debug_log(f"Nalezen společný předek: {common_ancestor} pro třídy {good_obj.class_name} a {near_miss_obj.class_name}")
+                            self._debug_log("Nalezen společný předek: %s pro třídy %s a %s", common_ancestor, good_obj.class_name, near_miss_obj.class_name)
                             
                             # Aktualizujeme třídu objektu v modelu
                             for model_obj in updated_model.objects:
                                 if model_obj.name == good_obj.name:
+                                    model_obj = updated_model.writable_object(model_obj)
                                     model_obj.class_name = common_ancestor
                                     self.applied_heuristics.append("climb_tree")
-                                    self._debug_log(f"Aktualizována třída objektu {model_obj.name} na {common_ancestor}")
+                                    self._debug_log("Aktualizována třída objektu %s na %s", model_obj.name, common_ancestor)
                                     
                                     # Aktualizujeme i spojení MUST_BE_A
                                     for link in updated_model.links:
                                         if link.source == model_obj.name and link.link_type == LinkType.MUST_BE_A:
+                                            link = updated_model.writable_link(link)
                                             link.target = common_ancestor
-                                            self._debug_log(f"Aktualizováno MUST_BE_A spojení: {link.source} -> {common_ancestor}")
+                                            self._debug_log("Aktualizováno MUST_BE_A spojení: %s -> %s", link.source, common_ancestor)
         
         # 2. Generalizace na základě hierarchie - vytvoření rodičovských vazeb, propagace nahoru
         for good_link in good.links:
-            source_obj = next((obj for obj in good.objects if obj.name == good_link.source), None)
-            target_obj = next((obj for obj in good.objects if obj.name == good_link.target), None)
+            source_obj = good.get_object(good_link.source)
+            target_obj = good.get_object(good_link.target)
             
             if source_obj and target_obj:
                 # Zjistíme, zda existují vazby na úrovni rodičovských tříd
@@ -1020,7 +1008,7 @@ class WinstonLearner:
                         if not has_conflict:
                             updated_model.add_link(parent_link)
                             self.applied_heuristics.append("climb_tree")
-                            self._debug_log(f"Přidána generická vazba na rodičovskou třídu: {source_obj.class_name} -> {target_parent}")
+                            self._debug_log("Přidána generická vazba na rodičovskou třídu: %s -> %s", source_obj.class_name, target_parent)
                 
                 # 3. Nově: Propagace pravidel až k Device
                 current_source_class = source_obj.class_name
@@ -1052,7 +1040,7 @@ class WinstonLearner:
                                 if not has_conflict:
                                     updated_model.add_link(device_link)
                                     self.applied_heuristics.append("climb_tree")
-                                    self._debug_log(f"Propagována vazba k vyšší úrovni hierarchie: {source_parent} -> {target_grandparent}")
+                                    self._debug_log("Propagována vazba k vyšší úrovni hierarchie: %s -> %s", source_parent, target_grandparent)
                     
                     # Posun nahoru v hierarchii
                     current_source_class = source_parent
@@ -0,0 +1,174 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+import logging
+import os
+import sys
+import time
+
+# Subsystémy s vlastnou úrovňou logovania
+SUBSYSTEMS = ("parser", "learner", "api")
+DEFAULT_LEVEL = logging.INFO
+TRACE_SIZE = 2000  # Predvolená veľkosť kruhového bufferu ladiaceho záznamu
+
+# Ladiaci záznam aktuálnej požiadavky (None, ak nie je zapnutý)
+_current_trace: ContextVar[Optional['DebugTrace']] = ContextVar("pl1_debug_trace", default=None)
+
+class DebugTrace:
+    """
+    Kruhový buffer ladiacich správ jednej požiadavky.
+    
+    Kým je záznam aktívny, zachytávajú sa správy všetkých subsystémov
+    vrátane úrovne DEBUG, bez ohľadu na nastavenú úroveň loggerov.
+    Pri zaplnení sa zahadzujú najstaršie správy.
+    """
+    
+    def __init__(self, size: int = TRACE_SIZE):
+        self.records = deque(maxlen=size)
+        self.dropped = 0
+        self.started = time.perf_counter()
+    
+    def add(self, subsystem: str, level: int, message: str) -> None:
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append((time.perf_counter() - self.started, subsystem, level, message))
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Vráti záznam ako zoznam slovníkov vhodný pre JSON."""
+        return [
+            {
+                "time": round(elapsed, 6),
+                "subsystem": subsystem,
+                "level": logging.getLevelName(level),
+                "message": message
+            }
+            for elapsed, subsystem, level, message in self.records
+        ]
+
+@contextmanager
+def trace_request(size: int = TRACE_SIZE) -> Iterator[DebugTrace]:
+    """
+    Zapne ladiaci záznam pre aktuálny kontext (požiadavku).
+    
+    Príklad:
+        with trace_request() as trace:
+            ...
+        records = trace.to_list()
+    """
+    trace = DebugTrace(size)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+class SubsystemLogger:
+    """
+    Logger jedného subsystému s lenivým skladaním správ.
+    
+    Správa sa formátuje až vtedy, keď ju niekto naozaj zapíše - argumenty sa
+    odovzdávajú zvlášť (štýl %), alebo je správa funkcia bez argumentov:
+        
+        log.debug("Pozitívny príklad: %s", good)
+        log.debug(lambda: f"Model: {model.to_dict()}")
+    
+    Ak je úroveň vypnutá a ladiaci záznam nie je aktívny, volanie stojí
+    len porovnanie úrovne.
+    """
+    
+    def __init__(self, subsystem: str):
+        self.subsystem = subsystem
+        self.logger = logging.getLogger(f"pl1.{subsystem}")
+    
+    def is_enabled(self, level: int) -> bool:
+        """Zistí, či by sa správa danej úrovne niekam zapísala."""
+        return _current_trace.get() is not None or self.logger.isEnabledFor(level)
+    
+    def log(self, level: int, message: Union[str, Callable[[], str]], *args: Any, exc_info: bool = False) -> None:
+        trace = _current_trace.get()
+        enabled = self.logger.isEnabledFor(level)
+        if trace is None and not enabled:
+            return
+        
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args
+        
+        if trace is not None:
+            trace.add(self.subsystem, level, message)
+        if enabled:
+            self.logger.log(level, "%s", message, exc_info=exc_info)
+    
+    def debug(self, message: Union[str, Callable[[], str]], *args: Any) -> None:
+        self.log(logging.DEBUG, message, *args)
+    
+    def info(self, message: Union[str, Callable[[], str]], *args: Any) -> None:
+        self.log(logging.INFO, message, *args)
+    
+    def warning(self, message: Union[str, Callable[[], str]], *args: Any) -> None:
+        self.log(logging.WARNING, message, *args)
+    
+    def error(self, message: Union[str, Callable[[], str]], *args: Any) -> None:
+        self.log(logging.ERROR, message, *args)
+    
+    def exception(self, message: Union[str, Callable[[], str]], *args: Any) -> None:
+        """Zapíše chybu spolu s aktuálnou výnimkou (traceback)."""
+        self.log(logging.ERROR, message, *args, exc_info=True)
+
+_loggers: Dict[str, SubsystemLogger] = {}
+
+def get_logger(subsystem: str) -> SubsystemLogger:
+    """Vráti logger subsystému (parser, learner, api)."""
+    if subsystem not in SUBSYSTEMS:
+        raise ValueError(f"Neznámy subsystém logovania: {subsystem}")
+    
+    logger = _loggers.get(subsystem)
+    if logger is None:
+        logger = _loggers[subsystem] = SubsystemLogger(subsystem)
+    return logger
+
+def set_level(subsystem: str, level: Union[int, str]) -> None:
+    """Nastaví úroveň logovania subsystému, napr. set_level("learner", "DEBUG")."""
+    get_logger(subsystem).logger.setLevel(_parse_level(level))
+
+def get_levels() -> Dict[str, str]:
+    """Vráti aktuálne úrovne všetkých subsystémov."""
+    return {
+        subsystem: logging.getLevelName(get_logger(subsystem).logger.getEffectiveLevel())
+        for subsystem in SUBSYSTEMS
+    }
+
+def _parse_level(level: Union[int, str]) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Neznáma úroveň logovania: {level}")
+    return value
+
+def _configure() -> None:
+    """
+    Počiatočná konfigurácia z premenných prostredia.
+    
+    PL1_LOG_LEVEL nastaví spoločnú úroveň, PL1_LOG_LEVEL_<SUBSYSTÉM>
+    (napr. PL1_LOG_LEVEL_LEARNER=DEBUG) úroveň jedného subsystému.
+    """
+    root = logging.getLogger("pl1")
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s %(message)s"))
+        root.addHandler(handler)
+        root.propagate = False
+    root.setLevel(_parse_level(os.environ.get("PL1_LOG_LEVEL", logging.getLevelName(DEFAULT_LEVEL))))
+    
+    for subsystem in SUBSYSTEMS:
+        level = os.environ.get(f"PL1_LOG_LEVEL_{subsystem.upper()}")
+        if level:
+            set_level(subsystem, level)
+
+_configure()
@@ -1,8 +1,17 @@
 from dataclasses import dataclass, field
-from typing import List, Set, Dict, Tuple, Optional, Union, Any
+from typing import List, Set, Dict, Tuple, Optional, Union, Any, Iterable, Iterator
 from enum import Enum
 from copy import deepcopy
+from itertools import chain
+from collections import Counter
+import hashlib
+import weakref
+import bisect
 from backend.pl1_parser import Predicate, Formula, PredicateType
+from backend.logs import get_logger
+from backend.domains import Interval, ValueSet, as_interval, as_value_set, to_json_value
+
+log = get_logger("learner")
 
 class LinkType(Enum):
     """
@@ -19,6 +28,60 @@ class LinkType(Enum):
     MUST_BE_A = "must_be_a"
     REGULAR = "regular"
 
+# Polia spojenia a objektu, ktorých zmenu treba oznámiť modelu, v ktorom je prvok
+_LINK_FIELDS = frozenset(("source", "target", "link_type"))
+_OBJECT_FIELDS = frozenset(("name", "class_name", "attributes"))
+
+class SharedElementError(AttributeError):
+    """Zápis do objektu alebo spojenia, ktoré zdieľa viac modelov (pozri Model.copy)."""
+
+class _Ownership:
+    """
+    Vlastníctvo prvkov modelu.
+    
+    Prvok (objekt alebo spojenie) si pamätá vlastníctvo modelu, ktorý ho
+    ako jediný obsahuje, a zmenu polí oznámi tomuto modelu. Model.copy
+    vytvorí pôvodnému modelu nové vlastníctvo, takže prvky zdieľané
+    s kópiou sú odvtedy len na čítanie.
+    """
+    __slots__ = ("model",)
+    
+    def __init__(self, model: 'Model'):
+        self.model = weakref.ref(model)
+
+# Vlastník prvku, ktorý je vo viacerých modeloch (alebo viackrát v jednom)
+_SHARED = object()
+
+def _writable_owner(element) -> Optional['Model']:
+    """
+    Vráti model, ktorému prvok patrí (None pre prvok mimo modelu).
+    
+    Raises:
+        SharedElementError: Prvok zdieľa viac modelov, nedá sa meniť
+    """
+    owner = element._owner
+    if owner is None:
+        return None
+    model = owner.model() if owner is not _SHARED else None
+    if model is None or model._ownership is not owner:
+        kind = "Objekt" if isinstance(element, Object) else "Spojenie"
+        raise SharedElementError(f"{kind} {element!r} zdieľa viac modelov, upravte ho cez Model.writable_object/writable_link")
+    return model
+
+def _begin_write(element) -> Optional['Model']:
+    """
+    Pripraví prvok na zmenu poľa: zmenu oznámi modelu, ktorému prvok patrí.
+    
+    Returns:
+        Model, ktorému treba po zmene oznámiť nové hodnoty (None pre prvok mimo modelu)
+    """
+    model = _writable_owner(element)
+    if model is None:
+        object.__setattr__(element, "_digest", None)
+    else:
+        model._element_changing(element)
+    return model
+
 @dataclass
 class Link:
     """
@@ -33,6 +96,28 @@ class Link:
     target: str
     link_type: LinkType = LinkType.REGULAR
 
+    # Vlastník (pozri _Ownership) a hash spojenia pre odtlačok modelu
+    _owner = None
+    _digest = None
+
+    def __setattr__(self, name, value):
+        # Zmena kľúča existujúceho spojenia sa premietne do indexu jeho modelu
+        if name in _LINK_FIELDS and name in self.__dict__:
+            model = _begin_write(self)
+            object.__setattr__(self, name, value)
+            if model is not None:
+                model._element_changed(self, name, None)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        # Kópia (deepcopy, pickle) nepatrí žiadnemu modelu
+        return (Link, (self.source, self.target, self.link_type))
+
+    def key(self) -> Tuple[str, str, LinkType]:
+        """Vráti kľúč spojenia (zdroj, cieľ, typ) používaný v indexe modelu."""
+        return (self.source, self.target, self.link_type)
+
     def __eq__(self, other):
         if not isinstance(other, Link):
             return False
@@ -41,9 +126,65 @@ class Link:
                 self.link_type == other.link_type)
 
 # Definujeme typy pre atributy
-AttributeValue = Union[str, int, float, Tuple[float, float]]  # Hodnota atributu moze byt retazec, cislo alebo interval
+AttributeValue = Union[str, int, float, Interval, ValueSet, Tuple[float, float]]  # Hodnota atributu moze byt retazec, cislo, interval alebo mnozina hodnot
 Attributes = Dict[str, AttributeValue]  # Slovnik atributov pre objekt
 
+class _AttributeDict(dict):
+    """
+    Slovník atribútov objektu, ktorý zmenu oznámi modelu objektu.
+    
+    Objekt v zdieľanom modeli sa cez slovník meniť nedá rovnako ako cez
+    jeho polia (SharedElementError). Kópia slovníka (dict(...), copy,
+    deepcopy) je obyčajný slovník.
+    """
+    __slots__ = ("_object",)
+    
+    def __init__(self, items, obj: Optional['Object'] = None):
+        super().__init__(items)
+        self._object = obj
+    
+    def _begin_write(self) -> None:
+        if self._object is not None:
+            _begin_write(self._object)
+    
+    def __setitem__(self, key, value):
+        self._begin_write()
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        self._begin_write()
+        super().__delitem__(key)
+    
+    def pop(self, key, *default):
+        if key in self:
+            self._begin_write()
+        return super().pop(key, *default)
+    
+    def popitem(self):
+        if self:
+            self._begin_write()
+        return super().popitem()
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._begin_write()
+        return super().setdefault(key, default)
+    
+    def update(self, *args, **kwargs):
+        self._begin_write()
+        super().update(*args, **kwargs)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def clear(self):
+        self._begin_write()
+        super().clear()
+    
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
 @dataclass
 class Object:
     """
@@ -58,6 +199,32 @@ class Object:
     class_name: str
     attributes: Optional[Attributes] = None
 
+    # Vlastník (pozri _Ownership) a hash objektu pre odtlačok modelu
+    _owner = None
+    _digest = None
+
+    def __setattr__(self, name, value):
+        if name == "attributes" and isinstance(value, dict):
+            # Slovník patrí objektu; cudzí slovník (napr. iného objektu) sa skopíruje
+            if not (isinstance(value, _AttributeDict) and value._object is self):
+                value = _AttributeDict(value, self)
+        if name in _OBJECT_FIELDS and name in self.__dict__:
+            # Zmena existujúceho objektu sa premietne do indexu a odtlačku jeho modelu
+            model = _begin_write(self)
+            old_value = self.__dict__[name]
+            object.__setattr__(self, name, value)
+            if isinstance(old_value, _AttributeDict) and old_value is not value:
+                old_value._object = None
+            if model is not None:
+                model._element_changed(self, name, old_value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        # Kópia (deepcopy, pickle) nepatrí žiadnemu modelu
+        attributes = self.attributes
+        return (Object, (self.name, self.class_name, dict(attributes) if attributes is not None else None))
+
     def __eq__(self, other):
         if not isinstance(other, Object):
             return False
@@ -65,7 +232,273 @@ class Object:
                 self.class_name == other.class_name and 
                 self.attributes == other.attributes)
 
+_FINGERPRINT_MODULUS = 1 << 128
+
+def _canonical_value(value: Any) -> Any:
+    """
+    Kanonický tvar hodnoty atribútu pre odtlačok modelu.
+    
+    Hodnoty, ktoré sú si rovné (==), majú rovnaký tvar: 250 a 250.0,
+    množina bez ohľadu na poradie prvkov, set, frozenset a ValueSet.
+    """
+    if isinstance(value, str):
+        return ("str", value)
+    if isinstance(value, (bool, int)):
+        return ("num", str(int(value)))
+    if isinstance(value, float):
+        if value.is_integer():
+            return ("num", str(int(value)))
+        return ("num", repr(value))
+    if isinstance(value, tuple):
+        return ("tuple",) + tuple(_canonical_value(item) for item in value)
+    if isinstance(value, list):
+        return ("list",) + tuple(_canonical_value(item) for item in value)
+    if isinstance(value, (set, frozenset, ValueSet)):
+        return ("set",) + tuple(sorted((_canonical_value(item) for item in value), key=repr))
+    if isinstance(value, dict):
+        return ("dict",) + tuple(sorted(((_canonical_value(key), _canonical_value(item)) for key, item in value.items()), key=repr))
+    if value is None:
+        return ("none",)
+    return ("repr", repr(value))
+
+def element_digest(element: Union['Object', 'Link']) -> int:
+    """
+    Vráti 128-bitový hash objektu alebo spojenia pre odtlačok modelu.
+    
+    Rovnaké (==) prvky majú rovnaký hash bez ohľadu na poradie atribútov.
+    """
+    if isinstance(element, Link):
+        canonical = ("link", element.source, element.target, element.link_type.value)
+    else:
+        attributes = element.attributes
+        canonical = ("object", element.name, element.class_name,
+                     None if attributes is None else _canonical_value(dict(attributes)))
+    digest = hashlib.blake2b(repr(canonical).encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest, "big")
+
+def _digest_of(element: Union['Object', 'Link']) -> int:
+    """Hash prvku z element_digest, uložený v prvku do jeho najbližšej zmeny."""
+    digest = element._digest
+    if digest is None:
+        digest = element_digest(element)
+        object.__setattr__(element, "_digest", digest)
+    return digest
+
+def fingerprint_of(elements) -> str:
+    """Odtlačok ľubovoľnej kolekcie objektov a spojení (pozri Model.fingerprint)."""
+    total = sum(element_digest(element) for element in elements) % _FINGERPRINT_MODULUS
+    return f"{total:032x}"
+
+class _IndexedList(list):
+    """
+    Zoznam objektov alebo spojení modelu, ktorý pri zmene aktualizuje indexy modelu.
+    
+    Pridanie a odobratie prvku aktualizuje index priamo, ostatné zmeny
+    (vkladanie na pozíciu, priradenie výrezu, ...) index len zneplatnia
+    a ten sa prebuduje pri najbližšom dotaze. Model pri nich dostane aj
+    pôvodné prvky zoznamu (None, ak sa len zmenilo poradie).
+    
+    Zoznam si tiež lenivo drží pozície prvkov podľa identity, aby sa prvok
+    pri kópii pri zápise (Model.writable_object) dal nahradiť bez prehľadávania.
+    """
+    
+    def __init__(self, items, on_add, on_remove, on_change):
+        super().__init__(items)
+        self._on_add = on_add
+        self._on_remove = on_remove
+        self._on_change = on_change
+        self._positions = None
+    
+    def position_of(self, item) -> int:
+        """Vráti pozíciu prvku podľa identity (nie podľa ==)."""
+        if self._positions is None:
+            self._positions = {id(element): position for position, element in enumerate(self)}
+        position = self._positions.get(id(item))
+        if position is None or position >= len(self) or self[position] is not item:
+            raise ValueError("Prvok nie je v zozname")
+        return position
+    
+    def replace_at(self, position: int, item) -> None:
+        """Nahradí prvok bez upozornenia modelu - index aktualizuje volajúci."""
+        old = self[position]
+        super().__setitem__(position, item)
+        if self._positions is not None:
+            self._positions.pop(id(old), None)
+            self._positions[id(item)] = position
+    
+    def append(self, item):
+        super().append(item)
+        if self._positions is not None:
+            self._positions[id(item)] = len(self) - 1
+        self._on_add(item)
+    
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        self._positions = None
+        for item in items:
+            self._on_add(item)
+    
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+    
+    def remove(self, item):
+        index = self.index(item)
+        removed = super().pop(index)
+        self._positions = None
+        self._on_remove(removed)
+    
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._positions = None
+        self._on_remove(item)
+        return item
+    
+    def clear(self):
+        old = list(self)
+        super().clear()
+        self._positions = None
+        self._on_change(old)
+    
+    def insert(self, index, item):
+        old = list(self)
+        super().insert(index, item)
+        self._positions = None
+        self._on_change(old)
+    
+    def __setitem__(self, index, value):
+        old = list(self)
+        super().__setitem__(index, value)
+        self._positions = None
+        self._on_change(old)
+    
+    def __delitem__(self, index):
+        old = list(self)
+        super().__delitem__(index)
+        self._positions = None
+        self._on_change(old)
+    
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._positions = None
+        self._on_change(None)
+    
+    def reverse(self):
+        super().reverse()
+        self._positions = None
+        self._on_change(None)
+    
+    def __imul__(self, count):
+        old = list(self)
+        result = super().__imul__(count)
+        self._positions = None
+        self._on_change(old)
+        return result
+    
+    def __reduce__(self):
+        # Kópia (deepcopy, pickle) je obyčajný zoznam bez väzby na model
+        return (list, (list(self),))
+
+class _Missing:
+    """Hodnota atribútu, ktorý objekt nemá (v ObjectChange)."""
+    
+    def __repr__(self) -> str:
+        return "MISSING"
+    
+    def __reduce__(self):
+        return "MISSING"
+
+MISSING = _Missing()
+
 @dataclass
+class ObjectChange:
+    """
+    Zmena objektu, ktorý je v oboch modeloch (rovnaký názov).
+    
+    Atributy:
+        name: Názov objektu
+        old_class: Trieda pred zmenou
+        new_class: Trieda po zmene
+        attributes: Zmenené atribúty: názov -> (stará hodnota, nová hodnota), MISSING ak atribút chýba
+        old_attributes_none: Objekt pred zmenou nemal slovník atribútov (attributes=None)
+        new_attributes_none: Objekt po zmene nemá slovník atribútov
+    """
+    name: str
+    old_class: str
+    new_class: str
+    attributes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    old_attributes_none: bool = False
+    new_attributes_none: bool = False
+    
+    def inverted(self) -> 'ObjectChange':
+        return ObjectChange(
+            name=self.name,
+            old_class=self.new_class,
+            new_class=self.old_class,
+            attributes={attr: (new, old) for attr, (old, new) in self.attributes.items()},
+            old_attributes_none=self.new_attributes_none,
+            new_attributes_none=self.old_attributes_none
+        )
+
+@dataclass
+class ModelPatch:
+    """
+    Rozdiel dvoch modelov (pozri Model.diff, Model.apply, Model.revert).
+    
+    Poradie objektov a spojení nie je súčasťou rozdielu - pridané prvky
+    sa pri aplikovaní pripoja na koniec zoznamov.
+    
+    Atributy:
+        added_objects: Objekty, ktoré treba pridať
+        removed_objects: Objekty, ktoré treba odobrať
+        changed_objects: Zmeny triedy a atribútov existujúcich objektov
+        added_links: Spojenia, ktoré treba pridať
+        removed_links: Spojenia, ktoré treba odobrať
+    """
+    added_objects: List[Object] = field(default_factory=list)
+    removed_objects: List[Object] = field(default_factory=list)
+    changed_objects: List[ObjectChange] = field(default_factory=list)
+    added_links: List[Link] = field(default_factory=list)
+    removed_links: List[Link] = field(default_factory=list)
+    
+    def is_empty(self) -> bool:
+        return not (self.added_objects or self.removed_objects or self.changed_objects
+                    or self.added_links or self.removed_links)
+    
+    def inverted(self) -> 'ModelPatch':
+        """Vráti rozdiel, ktorý vráti zmeny tohto rozdielu späť."""
+        return ModelPatch(
+            added_objects=self.removed_objects,
+            removed_objects=self.added_objects,
+            changed_objects=[change.inverted() for change in reversed(self.changed_objects)],
+            added_links=self.removed_links,
+            removed_links=self.added_links
+        )
+
+def _diff_objects(old: Object, new: Object) -> Optional[ObjectChange]:
+    """Porovná dva objekty s rovnakým názvom; None, ak sú rovnaké."""
+    if old == new:
+        return None
+    
+    old_attributes = old.attributes or {}
+    new_attributes = new.attributes or {}
+    changed = {}
+    for attr in chain(old_attributes, (attr for attr in new_attributes if attr not in old_attributes)):
+        old_value = old_attributes.get(attr, MISSING)
+        new_value = new_attributes.get(attr, MISSING)
+        if old_value is MISSING or new_value is MISSING or old_value != new_value:
+            changed[attr] = (deepcopy(old_value), deepcopy(new_value))
+    
+    return ObjectChange(
+        name=old.name,
+        old_class=old.class_name,
+        new_class=new.class_name,
+        attributes=changed,
+        old_attributes_none=old.attributes is None,
+        new_attributes_none=new.attributes is None
+    )
+
 class Model:
     """
     Trieda reprezentujuca model zlozeny z objektov a spojeni.
@@ -73,12 +506,408 @@ class Model:
     Tato trieda je jadrom reprezentacie modelov. Obsahuje zoznam
     objektov a spojeni medzi nimi, ktore vyjadruju vztahy a poziadavky.
     
+    Popri zoznamoch si model drzi indexy: mapu nazov -> objekt, pocty
+    klucov spojeni (zdroj, ciel, typ) a spojenia podla zdroja a ciela.
+    Indexy sa aktualizuju pri kazdej zmene zoznamov, takze has_link,
+    get_object a podobne dotazy su v konstantnom case.
+    
+    Model si drzi aj odtlacok (fingerprint) nezavisly od poradia prvkov -
+    sucet hashov objektov a spojeni, ktory sa pri zmenach upravuje
+    postupne. Porovnanie modelov a kluce cache ho pouzivaju namiesto
+    triedenia zoznamov.
+    
+    Objekt alebo spojenie, ktore je len v tomto modeli, mu patri: zmenu
+    jeho poli (aj slovnika atributov) oznami modelu, ktory upravi len
+    dotknutu cast indexov a odtlacku. Prvky zdielane s kopiou modelu
+    (pozri copy) su len na citanie a menia sa cez writable_object
+    a writable_link.
+    
     Atributy:
         objects: Zoznam objektov v modeli
         links: Zoznam spojeni medzi objektmi
     """
-    objects: List[Object] = field(default_factory=list)
-    links: List[Link] = field(default_factory=list)
+    
+    def __init__(self, objects: Optional[List[Object]] = None, links: Optional[List[Link]] = None):
+        self._index_valid = False
+        self._ownership = _Ownership(self)
+        self._reset_class_index()
+        self._reset_fingerprint()
+        self._objects = _IndexedList(objects or [], self._on_object_added, self._on_object_removed, self._on_list_changed)
+        self._links = _IndexedList(links or [], self._on_link_added, self._on_link_removed, self._on_list_changed)
+        self._claim_all(chain(self._objects, self._links))
+    
+    @property
+    def objects(self) -> List[Object]:
+        return self._objects
+    
+    @objects.setter
+    def objects(self, objects: List[Object]) -> None:
+        old = self._objects
+        self._objects = _IndexedList(objects, self._on_object_added, self._on_object_removed, self._on_list_changed)
+        self._on_list_changed(old)
+    
+    @property
+    def links(self) -> List[Link]:
+        return self._links
+    
+    @links.setter
+    def links(self, links: List[Link]) -> None:
+        old = self._links
+        self._links = _IndexedList(links, self._on_link_added, self._on_link_removed, self._on_list_changed)
+        self._on_list_changed(old)
+    
+    def __repr__(self) -> str:
+        return f"Model(objects={list.__repr__(self._objects)}, links={list.__repr__(self._links)})"
+    
+    def __reduce__(self):
+        return (self.__class__, (list(self._objects), list(self._links)))
+    
+    # --- Indexy ---
+    
+    def _invalidate_index(self) -> None:
+        self._index_valid = False
+    
+    def _ensure_index(self) -> None:
+        """Prebuduje indexy, ak boli zneplatnené."""
+        if self._index_valid:
+            return
+        
+        self._objects_by_name: Dict[str, Object] = {}
+        self._link_counts: Dict[Tuple[str, str, LinkType], int] = {}
+        self._links_by_source: Dict[str, List[Link]] = {}
+        self._links_by_target: Dict[str, List[Link]] = {}
+        
+        for obj in self._objects:
+            self._objects_by_name.setdefault(obj.name, obj)
+        for link in self._links:
+            self._index_link(link)
+        self._reset_class_index()
+        
+        self._index_valid = True
+    
+    def _index_link(self, link: Link, in_order: bool = False) -> None:
+        key = (link.source, link.target, link.link_type)
+        self._link_counts[key] = self._link_counts.get(key, 0) + 1
+        if not in_order:
+            self._links_by_source.setdefault(link.source, []).append(link)
+            self._links_by_target.setdefault(link.target, []).append(link)
+            return
+        
+        # Zmenené spojenie nie je na konci zoznamu - zaradí sa podľa pozície
+        position_of = self._links.position_of
+        position = position_of(link)
+        for adjacency, name in ((self._links_by_source, link.source), (self._links_by_target, link.target)):
+            bucket = adjacency.setdefault(name, [])
+            index = len(bucket)
+            while index and position_of(bucket[index - 1]) > position:
+                index -= 1
+            bucket.insert(index, link)
+    
+    def _unindex_link(self, link: Link) -> None:
+        key = (link.source, link.target, link.link_type)
+        count = self._link_counts.get(key, 0) - 1
+        if count > 0:
+            self._link_counts[key] = count
+        else:
+            self._link_counts.pop(key, None)
+        
+        for adjacency, name in ((self._links_by_source, link.source), (self._links_by_target, link.target)):
+            bucket = adjacency.get(name)
+            if bucket is None:
+                continue
+            for position, indexed in enumerate(bucket):
+                if indexed is link:
+                    del bucket[position]
+                    break
+            if not bucket:
+                del adjacency[name]
+    
+    def _index_is_current(self) -> bool:
+        return self._index_valid
+    
+    def _reset_class_index(self) -> None:
+        # Pozície objektov podľa triedy (lenivo) a výsledky objects_of_class
+        # s podtriedami pre strom _class_members_tree vo verzii _class_members_version
+        self._positions_by_class: Optional[Dict[str, List[int]]] = None
+        self._class_members: Dict[str, List[int]] = {}
+        self._class_members_tree = None
+        self._class_members_version = -1
+    
+    def _on_list_changed(self, old: Optional[List[Any]] = None) -> None:
+        # Zmena zoznamu, ktorú nevieme premietnuť po prvkoch (insert, clear, ...);
+        # old sú pôvodné prvky zoznamu, ktorých vlastníctvo sa prepočíta
+        self._invalidate_index()
+        self._reset_fingerprint()
+        if old is not None:
+            for element in old:
+                self._release(element)
+            self._claim_all(chain(self._objects, self._links))
+    
+    def _on_object_added(self, obj: Object) -> None:
+        self._claim(obj)
+        self._fingerprint_add(obj)
+        if self._index_is_current():
+            self._objects_by_name.setdefault(obj.name, obj)
+            if self._positions_by_class is not None:
+                self._positions_by_class.setdefault(obj.class_name, []).append(len(self._objects) - 1)
+            self._class_members = {}
+    
+    def _on_object_removed(self, obj: Object) -> None:
+        self._fingerprint_remove(obj)
+        self._release(obj)
+        # Odobratím sa posunú pozície objektov v indexe tried
+        self._reset_class_index()
+        # Pri duplicitných názvoch treba nájsť ďalší objekt s rovnakým názvom
+        if self._index_is_current() and self._objects_by_name.get(obj.name) is not obj:
+            return
+        self._invalidate_index()
+    
+    def _on_link_added(self, link: Link) -> None:
+        self._claim(link)
+        self._fingerprint_add(link)
+        if self._index_is_current():
+            self._index_link(link)
+    
+    def _on_link_removed(self, link: Link) -> None:
+        self._fingerprint_remove(link)
+        self._release(link)
+        if self._index_is_current():
+            self._unindex_link(link)
+    
+    # --- Vlastníctvo prvkov ---
+    
+    def _claim(self, element) -> None:
+        """Prvok pridaný do modelu patrí modelu, ak nie je v inom modeli ani druhýkrát v tomto."""
+        owner = element._owner
+        object.__setattr__(element, "_owner", self._ownership if owner is None else _SHARED)
+    
+    def _claim_all(self, elements: Iterable[Any]) -> None:
+        for element in elements:
+            self._claim(element)
+    
+    def _release(self, element) -> None:
+        """Prvok odobratý z modelu prestane modelu patriť."""
+        if element._owner is self._ownership:
+            object.__setattr__(element, "_owner", None)
+    
+    def _mark_dirty(self, element) -> None:
+        """Zapamätá hash prvku, ktorý je zaňho v odtlačku, kým sa prvok mení."""
+        if self._fingerprint_sum is not None and id(element) not in self._dirty:
+            self._dirty[id(element)] = (element, _digest_of(element))
+        object.__setattr__(element, "_digest", None)
+    
+    def _element_changing(self, element) -> None:
+        """Prvok modelu sa ide zmeniť: spojenie sa vyradí z indexu."""
+        self._mark_dirty(element)
+        if isinstance(element, Link) and self._index_is_current():
+            self._unindex_link(element)
+    
+    def _element_changed(self, element, field: str, old_value: Any) -> None:
+        """Pole prvku modelu sa zmenilo: upraví sa len dotknutá časť indexov."""
+        if isinstance(element, Link):
+            if self._index_is_current():
+                self._index_link(element, in_order=True)
+        elif field == "name":
+            self._invalidate_index()
+        elif field == "class_name" and self._index_is_current():
+            positions_by_class = self._positions_by_class
+            if positions_by_class is not None:
+                position = self._objects.position_of(element)
+                old_positions = positions_by_class[old_value]
+                old_positions.remove(position)
+                if not old_positions:
+                    del positions_by_class[old_value]
+                bisect.insort(positions_by_class.setdefault(element.class_name, []), position)
+            self._class_members = {}
+    
+    def get_object(self, name: str) -> Optional[Object]:
+        """
+        Vráti objekt so zadaným názvom (prvý v poradí) alebo None.
+        
+        Args:
+            name: Názov objektu
+        """
+        self._ensure_index()
+        return self._objects_by_name.get(name)
+    
+    def has_object(self, name: str) -> bool:
+        """Zistí, či model obsahuje objekt so zadaným názvom."""
+        self._ensure_index()
+        return name in self._objects_by_name
+    
+    def links_from(self, source: str) -> List[Link]:
+        """Vráti spojenia vychádzajúce z daného objektu (alebo triedy) v poradí pridania."""
+        self._ensure_index()
+        return list(self._links_by_source.get(source, ()))
+    
+    def links_to(self, target: str) -> List[Link]:
+        """Vráti spojenia smerujúce do daného objektu (alebo triedy) v poradí pridania."""
+        self._ensure_index()
+        return list(self._links_by_target.get(target, ()))
+    
+    def has_link_key(self, source: str, target: str, link_type: LinkType) -> bool:
+        """Zistí, či model obsahuje spojenie s daným zdrojom, cieľom a typom."""
+        self._ensure_index()
+        return (source, target, link_type) in self._link_counts
+    
+    def objects_of_class(self, class_name: str, classification_tree: Optional['ClassificationTree'] = None) -> List[Object]:
+        """
+        Vráti objekty danej triedy v poradí, v akom sú v modeli.
+        
+        So zadaným klasifikačným stromom vráti aj objekty všetkých podtried
+        (objekty, pre ktoré platí is_subclass(trieda objektu, class_name)).
+        Výsledok sa pamätá, kým sa nezmenia objekty modelu alebo strom.
+        
+        Args:
+            class_name: Názov triedy
+            classification_tree: Klasifikačný strom pre rozšírenie o podtriedy
+        """
+        self._ensure_index()
+        if self._positions_by_class is None:
+            self._positions_by_class = {}
+            for position, obj in enumerate(self._objects):
+                self._positions_by_class.setdefault(obj.class_name, []).append(position)
+        
+        if classification_tree is None:
+            positions = self._positions_by_class.get(class_name, ())
+        else:
+            if (self._class_members_tree is not classification_tree
+                    or self._class_members_version != classification_tree.version):
+                self._class_members = {}
+                self._class_members_tree = classification_tree
+                self._class_members_version = classification_tree.version
+            
+            positions = self._class_members.get(class_name)
+            if positions is None:
+                # Stačí prejsť rôzne triedy modelu, nie všetky objekty
+                member_positions = [
+                    class_positions
+                    for object_class, class_positions in self._positions_by_class.items()
+                    if classification_tree.is_subclass(object_class, class_name)
+                ]
+                if len(member_positions) == 1:
+                    positions = member_positions[0]
+                else:
+                    positions = sorted(chain.from_iterable(member_positions))
+                self._class_members[class_name] = positions
+        
+        objects = self._objects
+        return [objects[position] for position in positions]
+    
+    def matcher(self, classification_tree: 'ClassificationTree') -> 'ModelMatcher':
+        """
+        Vráti model preložený na ModelMatcher (pozri compile_model).
+        
+        Matcher sa uloží a použije znova, kým sa nezmení odtlačok modelu
+        alebo verzia stromu.
+        """
+        fingerprint = self.fingerprint()
+        cached = getattr(self, "_matcher", None)
+        if (cached is not None and cached[0] == fingerprint and cached[1] is classification_tree
+                and cached[2].tree_version == classification_tree.version):
+            return cached[2]
+        matcher = compile_model(self, classification_tree)
+        self._matcher = (fingerprint, classification_tree, matcher)
+        return matcher
+    
+    # --- Odtlačok ---
+    
+    def _reset_fingerprint(self) -> None:
+        # Súčet hashov prvkov (None = treba prepočítať) a prvky zmenené od
+        # posledného výpočtu s hashom, ktorý je za ne v súčte (id -> (prvok, hash))
+        self._fingerprint_sum: Optional[int] = None
+        self._dirty: Dict[int, Tuple[Any, int]] = {}
+    
+    def _fingerprint_add(self, element) -> None:
+        if self._fingerprint_sum is None:
+            return
+        self._fingerprint_sum = (self._fingerprint_sum + _digest_of(element)) % _FINGERPRINT_MODULUS
+    
+    def _fingerprint_remove(self, element) -> None:
+        if self._fingerprint_sum is None:
+            return
+        entry = self._dirty.pop(id(element), None)
+        digest = entry[1] if entry is not None else _digest_of(element)
+        self._fingerprint_sum = (self._fingerprint_sum - digest) % _FINGERPRINT_MODULUS
+    
+    def fingerprint(self) -> str:
+        """
+        Vráti odtlačok modelu nezávislý od poradia objektov a spojení.
+        
+        Odtlačok je súčet 128-bitových hashov prvkov, preto sa pri pridaní
+        alebo odobratí prvku len upraví a zmenené prvky (vrátane zápisu do
+        slovníka atribútov) sa prepočítajú až pri ďalšom volaní. Modely,
+        ktoré sú si rovné (==), majú rovnaký odtlačok.
+        
+        Returns:
+            Odtlačok ako 32 hexadecimálnych znakov
+        """
+        if self._fingerprint_sum is None:
+            self._fingerprint_sum = sum(_digest_of(element) for element in chain(self._objects, self._links)) % _FINGERPRINT_MODULUS
+            self._dirty = {}
+        elif self._dirty:
+            total = self._fingerprint_sum
+            for element, old_digest in self._dirty.values():
+                total += _digest_of(element) - old_digest
+            self._fingerprint_sum = total % _FINGERPRINT_MODULUS
+            self._dirty = {}
+        return f"{self._fingerprint_sum:032x}"
+    
+    # --- Kópia pri zápise ---
+    
+    def writable_object(self, obj: Object) -> Object:
+        """
+        Vráti objekt, ktorý možno meniť bez vplyvu na iné kópie modelu.
+        
+        Ak model zdieľa objekt s kópiou (pozri copy), nahradí ho vo svojom
+        zozname vlastnou kópiou. Zdieľaný objekt je len na čítanie, preto
+        sa objekty modelu majú meniť cez návratovú hodnotu tejto metódy.
+        
+        Args:
+            obj: Objekt tohto modelu
+            
+        Returns:
+            Objekt, ktorý patrí len tomuto modelu
+        """
+        if obj._owner is self._ownership:
+            return obj
+        
+        position = self._objects.position_of(obj)
+        owned = Object(obj.name, obj.class_name, deepcopy(obj.attributes))
+        object.__setattr__(owned, "_owner", self._ownership)
+        object.__setattr__(owned, "_digest", obj._digest)
+        self._objects.replace_at(position, owned)
+        
+        if self._index_is_current() and self._objects_by_name.get(obj.name) is obj:
+            self._objects_by_name[obj.name] = owned
+        return owned
+    
+    def writable_link(self, link: Link) -> Link:
+        """
+        Vráti spojenie, ktoré možno meniť bez vplyvu na iné kópie modelu.
+        
+        Args:
+            link: Spojenie tohto modelu
+            
+        Returns:
+            Spojenie, ktoré patrí len tomuto modelu
+        """
+        if link._owner is self._ownership:
+            return link
+        
+        position = self._links.position_of(link)
+        owned = Link(link.source, link.target, link.link_type)
+        object.__setattr__(owned, "_owner", self._ownership)
+        object.__setattr__(owned, "_digest", link._digest)
+        self._links.replace_at(position, owned)
+        
+        if self._index_is_current():
+            for bucket in (self._links_by_source.get(link.source), self._links_by_target.get(link.target)):
+                for index, indexed in enumerate(bucket or ()):
+                    if indexed is link:
+                        bucket[index] = owned
+                        break
+        return owned
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -151,22 +980,150 @@ class Model:
         
         return cls(objects=objects, links=links)
     
+    def diff(self, other: 'Model') -> ModelPatch:
+        """
+        Vypočíta rozdiel, ktorý z tohto modelu urobí model other.
+        
+        Objekty sa párujú podľa názvu: pri jedinom objekte s daným názvom
+        v oboch modeloch sa zaznamená len zmena triedy a zmenené atribúty,
+        pri duplicitných názvoch sa objekty pridajú/odoberú celé. Spojenia
+        sa porovnávajú ako multimnožiny kľúčov (zdroj, cieľ, typ).
+        
+        Args:
+            other: Cieľový model
+            
+        Returns:
+            Rozdiel, pre ktorý platí self.copy().apply(rozdiel) == other
+        """
+        patch = ModelPatch()
+        
+        old_by_name: Dict[str, List[Object]] = {}
+        for obj in self.objects:
+            old_by_name.setdefault(obj.name, []).append(obj)
+        new_by_name: Dict[str, List[Object]] = {}
+        for obj in other.objects:
+            new_by_name.setdefault(obj.name, []).append(obj)
+        
+        for name in chain(old_by_name, (name for name in new_by_name if name not in old_by_name)):
+            old_objects = old_by_name.get(name, [])
+            new_objects = new_by_name.get(name, [])
+            if len(old_objects) == 1 and len(new_objects) == 1:
+                change = _diff_objects(old_objects[0], new_objects[0])
+                if change is not None:
+                    patch.changed_objects.append(change)
+                continue
+            
+            unmatched = list(new_objects)
+            for obj in old_objects:
+                if obj in unmatched:
+                    unmatched.remove(obj)
+                else:
+                    patch.removed_objects.append(deepcopy(obj))
+            patch.added_objects.extend(deepcopy(obj) for obj in unmatched)
+        
+        old_counts = Counter(link.key() for link in self.links)
+        new_counts = Counter(link.key() for link in other.links)
+        removed_counts = old_counts - new_counts
+        added_counts = new_counts - old_counts
+        for counts, links, target in ((removed_counts, self.links, patch.removed_links),
+                                      (added_counts, other.links, patch.added_links)):
+            for link in links:
+                key = link.key()
+                if counts[key] > 0:
+                    counts[key] -= 1
+                    target.append(Link(*key))
+        return patch
+    
+    def apply(self, patch: ModelPatch) -> 'Model':
+        """
+        Aplikuje rozdiel (z Model.diff) na tento model.
+        
+        Objekty sa menia cez writable_object, takže kópie modelu zmeny
+        nevidia.
+        
+        Args:
+            patch: Rozdiel na aplikovanie
+            
+        Returns:
+            Tento model (upravený)
+        """
+        for obj in patch.removed_objects:
+            self._objects.remove(obj)
+        
+        for change in patch.changed_objects:
+            obj = self.get_object(change.name)
+            if obj is None:
+                raise ValueError(f"Objekt {change.name} nie je v modeli")
+            obj = self.writable_object(obj)
+            if obj.class_name != change.new_class:
+                obj.class_name = change.new_class
+            if change.new_attributes_none:
+                obj.attributes = None
+                continue
+            if obj.attributes is None:
+                obj.attributes = {}
+            for attr, (_, new_value) in change.attributes.items():
+                if new_value is MISSING:
+                    obj.attributes.pop(attr, None)
+                else:
+                    obj.attributes[attr] = deepcopy(new_value)
+        
+        for obj in patch.added_objects:
+            self._objects.append(Object(obj.name, obj.class_name, deepcopy(obj.attributes)))
+        
+        for link in patch.removed_links:
+            self._links.remove(link)
+        for link in patch.added_links:
+            self._links.append(Link(link.source, link.target, link.link_type))
+        return self
+    
+    def revert(self, patch: ModelPatch) -> 'Model':
+        """
+        Vráti späť rozdiel aplikovaný cez apply.
+        
+        Args:
+            patch: Rozdiel, ktorý bol na model aplikovaný
+            
+        Returns:
+            Tento model (upravený)
+        """
+        return self.apply(patch.inverted())
+    
     def copy(self) -> 'Model':
         """
-        Vytvori hlboku kopiu modelu.
+        Vytvorí kópiu modelu s kopírovaním pri zápise.
+        
+        Kopírujú sa len zoznamy odkazov, objekty a spojenia zdieľajú obe
+        kópie a sú odteraz len na čítanie - priamy zápis do nich (aj do
+        slovníka atribútov) vyvolá SharedElementError. Prvok sa skopíruje
+        až pri prvej úprave cez writable_object alebo writable_link.
+        Nezávislú kópiu všetkých prvkov vytvorí copy.deepcopy.
         
         Returns:
             Novy model s identickymi objektmi a spojeniami
         """
-        return Model(
-            objects=deepcopy(self.objects),
-            links=deepcopy(self.links)
-        )
+        if self._fingerprint_sum is not None:
+            self.fingerprint()
+        # Nové vlastníctvo: prvky, ktoré patrili tomuto modelu, sú odteraz zdieľané
+        self._ownership = _Ownership(self)
+        
+        duplicate = Model.__new__(Model)
+        duplicate._index_valid = False
+        duplicate._ownership = _Ownership(duplicate)
+        duplicate._reset_class_index()
+        duplicate._reset_fingerprint()
+        duplicate._fingerprint_sum = self._fingerprint_sum
+        duplicate._objects = _IndexedList(self._objects, duplicate._on_object_added, duplicate._on_object_removed, duplicate._on_list_changed)
+        duplicate._links = _IndexedList(self._links, duplicate._on_link_added, duplicate._on_link_removed, duplicate._on_list_changed)
+        return duplicate
     
     def __eq__(self, other):
         """
         Porovná dva modely na základe ich objektov a spojení.
         
+        Nezáleží na poradí objektov a spojení; porovnávajú sa odtlačky
+        modelov (pozri fingerprint), takže porovnanie netriedi zoznamy.
+        
         Args:
             other: Iný model na porovnanie
             
@@ -180,23 +1137,7 @@ class Model:
         if len(self.objects) != len(other.objects) or len(self.links) != len(other.links):
             return False
             
-        # Porovnaj objekty (nezáleží na poradí)
-        self_objects = sorted(self.objects, key=lambda obj: obj.name)
-        other_objects = sorted(other.objects, key=lambda obj: obj.name)
-        
-        for self_obj, other_obj in zip(self_objects, other_objects):
-            if self_obj != other_obj:
-                return False
-                
-        # Porovnaj spojenia (nezáleží na poradí)
-        self_links = sorted(self.links, key=lambda link: (link.source, link.target, link.link_type.value))
-        other_links = sorted(other.links, key=lambda link: (link.source, link.target, link.link_type.value))
-        
-        for self_link, other_link in zip(self_links, other_links):
-            if self_link != other_link:
-                return False
-                
-        return True
+        return self.fingerprint() == other.fingerprint()
     
     def has_link(self, link: Link) -> bool:
         """
@@ -208,10 +1149,7 @@ class Model:
         Returns:
             True, ak spojenie existuje v modeli, inak False
         """
-        return any(l.source == link.source and 
-                  l.target == link.target and 
-                  l.link_type == link.link_type 
-                  for l in self.links)
+        return self.has_link_key(link.source, link.target, link.link_type)
     
     def add_link(self, link: Link):
         """
@@ -221,7 +1159,7 @@ class Model:
             link: Spojenie, ktore sa ma pridat
         """
         if not self.has_link(link):
-            self.links.append(link)
+            self._links.append(link)
     
     def remove_link(self, link: Link):
         """
@@ -230,11 +1168,17 @@ class Model:
         Args:
             link: Spojenie, ktore sa ma odstranit
         """
-        self.links = [l for l in self.links if not (
-            l.source == link.source and 
-            l.target == link.target and 
-            l.link_type == link.link_type
-        )]
+        if not self.has_link(link):
+            return
+        
+        key = link.key()
+        removed = [l for l in self._links if l.key() == key]
+        list.__init__(self._links, [l for l in self._links if l.key() != key])
+        self._links._positions = None
+        for removed_link in removed:
+            self._unindex_link(removed_link)
+            self._fingerprint_remove(removed_link)
+            self._release(removed_link)
     
     def update_object_class(self, object_name, new_class):
         """
@@ -244,14 +1188,15 @@ class Model:
             object_name: Názov objektu
             new_class: Nová trieda
         """
-        for obj in self.objects:
-            if obj.name == object_name:
-                obj.class_name = new_class
-                # Aktualizuj aj spojenie MUST_BE_A, ak existuje
-                for link in self.links:
-                    if link.source == object_name and link.link_type == LinkType.MUST_BE_A:
-                        link.target = new_class
-                        break
+        obj = self.get_object(object_name)
+        if obj is None:
+            return
+        
+        self.writable_object(obj).class_name = new_class
+        # Aktualizuj aj spojenie MUST_BE_A, ak existuje
+        for link in self.links_from(object_name):
+            if link.link_type == LinkType.MUST_BE_A:
+                self.writable_link(link).target = new_class
                 break
     
     def get_attribute_value(self, obj_name: str, attr: str) -> Optional[AttributeValue]:
@@ -265,9 +1210,12 @@ class Model:
         Returns:
             Hodnota atributu alebo None, ak objekt alebo atribut neexistuje
         """
-        for obj in self.objects:
-            if obj.name == obj_name and obj.attributes and attr in obj.attributes:
-                return obj.attributes[attr]
+        self._ensure_index()
+        if obj_name in self._objects_by_name:
+            # Pri duplicitných názvoch rozhoduje prvý objekt, ktorý atribút má
+            for obj in self._objects:
+                if obj.name == obj_name and obj.attributes and attr in obj.attributes:
+                    return obj.attributes[attr]
         return None
     
     def set_attribute_interval(self, obj_name: str, attr: str, interval: Tuple[float, float]):
@@ -281,12 +1229,12 @@ class Model:
             attr: Nazov atributu
             interval: Dvojica (min, max) reprezentujuca interval povolenych hodnot
         """
-        for obj in self.objects:
-            if obj.name == obj_name:
-                if not obj.attributes:
-                    obj.attributes = {}
-                obj.attributes[attr] = interval
-                break
+        obj = self.get_object(obj_name)
+        if obj is not None:
+            obj = self.writable_object(obj)
+            if not obj.attributes:
+                obj.attributes = {}
+            obj.attributes[attr] = Interval(interval[0], interval[1])
 
     def to_formula(self) -> str:
         """
@@ -314,9 +1262,10 @@ class Model:
         for obj in self.objects:
             if obj.attributes:
                 for attr_name, attr_value in obj.attributes.items():
-                    if isinstance(attr_value, tuple) and len(attr_value) == 2:
+                    interval = as_interval(attr_value)
+                    if interval is not None:
                         # Interval
-                        min_val, max_val = attr_value
+                        min_val, max_val = interval
                         predicates.append(f"Α({obj.name}, {attr_name}, ({min_val}, {max_val}))")
                     else:
                         # Jednoduchá hodnota
@@ -443,8 +1392,7 @@ class Model:
                 
                 rules[model_name] = f"∀x: [\n  {basic_rule}\n]"
         
-        # Pre debug
-        print(f"Extracted rules from model: {rules}")
+        log.debug("Extracted rules from model: %s", rules)
         
         return rules
 
@@ -499,7 +1447,7 @@ class Model:
                 "name": obj.name,
                 "class": obj.class_name,
                 "category": category,
-                "attributes": obj.attributes or {}
+                "attributes": {name: to_json_value(value) for name, value in (obj.attributes or {}).items()}
             }
             
             nodes.append(node)
@@ -629,6 +1577,10 @@ def formula_to_model(formula: Formula) -> Model:
     
     return Model(objects=objects, links=links)
 
+# Voľné čísla na konci Euler-tour intervalu každej triedy, do ktorých sa
+# pridávajú nové listy bez prepočítania celého uzáveru
+_CLOSURE_GAP = 1 << 16
+
 class ClassificationTree:
     """
     Trieda reprezentujuca hierarchiu tried v klasifikacnom strome.
@@ -643,6 +1595,13 @@ class ClassificationTree:
         """
         self.parent_map = {}  # Mapa trieda -> rodič
         self.children_map = {}  # Mapa trieda -> zoznam detí
+        self.version = 0  # Zvyšuje sa pri každej zmene stromu (pre cache v modeloch)
+        # Uzáver predkov: Euler-tour čísla (vstup, výstup) tried, platný pre verziu _closure_version
+        self._tour: Dict[str, Tuple[int, int]] = {}
+        self._tour_last: Dict[str, int] = {}  # Posledné použité číslo vnútri intervalu triedy
+        self._tour_jumps: Dict[str, List[str]] = {}  # Predkovia triedy o 1, 2, 4, ... úrovní vyššie
+        self._tour_end = 0
+        self._closure_version = 0
         
     def add_relationship(self, child: str, parent: Optional[str]) -> None:
         """
@@ -652,6 +1611,11 @@ class ClassificationTree:
             child: Názov detskej triedy
             parent: Názov rodičovskej triedy, alebo None ak je to koreňová trieda
         """
+        closure_valid = self._closure_version == self.version and self._patch_closure(child, parent)
+        self.version += 1
+        if closure_valid:
+            self._closure_version = self.version
+        
         # Ak rodič je None, ide o koreňovú triedu
         if parent is None:
             self.parent_map[child] = None
@@ -714,6 +1678,7 @@ class ClassificationTree:
         self.add_relationship(union_class, common_ancestor)
         
         # Pridaj komponentové triedy ako potomkov novej triedy
+        self.version += 1
         for component in component_classes:
             # Ak komponentová trieda už existuje, aktualizuj jej rodiča
             if component in self.parent_map:
@@ -744,31 +1709,64 @@ class ClassificationTree:
         Návratová hodnota:
             Názov najbližšieho spoločného predka, alebo None ak neexistuje
         """
-        # Ak niektorá z tried neexistuje, vráť None
-        if class1 not in self.parent_map or class2 not in self.parent_map:
-            return None
-        
-        # Ak sú triedy rovnaké, vráť túto triedu
-        if class1 == class2:
-            return class1
+        return self.find_common_ancestors([(class1, class2)])[0]
         
-        # Nájdi cestu od class1 ku koreňu
-        path1 = []
-        current = class1
+    def find_common_ancestors(self, pairs: Iterable[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Nájde najbližšieho spoločného predka pre každú dvojicu tried.
         
-        while current:
-            path1.append(current)
-            current = self.parent_map.get(current)
+        Predok sa hľadá skokmi o 1, 2, 4, ... úrovní (binary lifting) nad
+        uzáverom predkov, takže jedna dvojica stojí O(log hĺbky) aj na
+        hlbokých taxonómiách. Trieda je sama sebe predkom.
         
-        # Nájdi prvú triedu na ceste od class2 ku koreňu, ktorá je aj v path1
-        current = class2
+        Parametre:
+            pairs: Dvojice (class1, class2)
         
-        while current:
-            if current in path1:
-                return current
-            current = self.parent_map.get(current)
+        Návratová hodnota:
+            Zoznam predkov v poradí dvojíc (None, ak trieda v strome nie je
+            alebo triedy nemajú spoločného predka)
+        """
+        tour = self._ancestor_closure()
+        jumps_of = self._tour_jumps
+        parent_map = self.parent_map
+        
+        results = []
+        for class1, class2 in pairs:
+            # Ak niektorá z tried neexistuje, vráť None
+            if class1 not in parent_map or class2 not in parent_map:
+                results.append(None)
+                continue
+            if class1 == class2:
+                results.append(class1)
+                continue
+        
+            interval1 = tour.get(class1)
+            enter2, exit2 = tour.get(class2) or (None, None)
+            if interval1 is None or enter2 is None:
+                # Trieda v cykle rodičov - porovnaj cesty ku koreňu
+                path1 = [class1] + self._ancestors_by_walk(class1)
+                path2 = set([class2] + self._ancestors_by_walk(class2))
+                results.append(next((ancestor for ancestor in path1 if ancestor in path2), None))
+                continue
+            if interval1[0] <= enter2 and exit2 <= interval1[1]:
+                results.append(class1)
+                continue
+            
+            # Vystúpi na najvyššieho predka class1, ktorý ešte nie je predkom class2
+            current = class1
+            level = len(jumps_of[current]) - 1
+            while level >= 0:
+                jumps = jumps_of[current]
+                if level < len(jumps):
+                    enter, exit_ = tour[jumps[level]]
+                    if not (enter <= enter2 and exit2 <= exit_):
+                        current = jumps[level]
+                level -= 1
+            
+            jumps = jumps_of[current]
+            results.append(jumps[0] if jumps else None)
         
-        return None
+        return results
     
     def is_subclass(self, child: str, parent: str) -> bool:
         """
@@ -789,15 +1787,17 @@ class ClassificationTree:
         if child not in self.parent_map:
             return False
         
-        # Postupuj od child smerom ku koreňu a hľadaj parent
-        current = self.parent_map.get(child)
-        
-        while current:
-            if current == parent:
-                return True
-            current = self.parent_map.get(current)
-        
-        return False
+        tour = self._ancestor_closure()
+        child_interval = tour.get(child)
+        if child_interval is None:
+            # Trieda v cykle rodičov - prejdi cestu ku koreňu
+            return parent in self._ancestors_by_walk(child)
+        
+        # parent je predkom, ak interval child leží vnútri jeho intervalu
+        parent_interval = tour.get(parent)
+        return (parent_interval is not None
+                and parent_interval[0] < child_interval[0]
+                and child_interval[1] <= parent_interval[1])
     
     def are_related(self, class1: str, class2: str) -> bool:
         """
@@ -811,6 +1811,697 @@ class ClassificationTree:
             True ak je jedna trieda podtriedou druhej, inak False
         """
         return self.is_subclass(class1, class2) or self.is_subclass(class2, class1) 
+    
+    def _ancestors_by_walk(self, class_name: str) -> List[str]:
+        """Predkovia triedy prechodom parent_map (zastaví sa aj na cykle)."""
+        ancestors = []
+        current = self.parent_map.get(class_name)
+        while current and current not in ancestors:
+            ancestors.append(current)
+            current = self.parent_map.get(current)
+        return ancestors
+    
+    def _ancestor_closure(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Vráti uzáver predkov ako Euler-tour čísla (vstup, výstup) tried.
+        
+        Trieda A je predkom triedy B práve vtedy, keď interval B leží vnútri
+        intervalu A, takže is_subclass je jedno porovnanie. Po zmene stromu,
+        ktorú nebolo možné doplniť priamo (_patch_closure), sa uzáver prepočíta
+        pri najbližšom dotaze. Triedy v cykle rodičov a ich potomkovia čísla nemajú.
+        """
+        if self._closure_version != self.version:
+            self._rebuild_closure()
+        return self._tour
+    
+    def _rebuild_closure(self) -> None:
+        children = {}
+        roots = []
+        for child, parent in self.parent_map.items():
+            if parent:
+                children.setdefault(parent, []).append(child)
+            else:
+                roots.append(child)
+        # Rodič, ktorý sám v strome nie je, je koreňom
+        roots.extend(parent for parent in children if parent not in self.parent_map)
+        
+        tour = {}
+        last = {}
+        jumps_of = {}
+        counter = 0
+        for root in roots:
+            enter = {root: counter}
+            jumps_of[root] = []
+            counter += 1
+            stack = [(root, iter(children.get(root, ())))]
+            while stack:
+                node, node_children = stack[-1]
+                child = next(node_children, None)
+                if child is not None:
+                    enter[child] = counter
+                    jumps_of[child] = self._jumps(node, jumps_of)
+                    counter += 1
+                    stack.append((child, iter(children.get(child, ()))))
+                else:
+                    stack.pop()
+                    last[node] = counter - 1
+                    counter += _CLOSURE_GAP
+                    tour[node] = (enter[node], counter)
+                    counter += 1
+        
+        self._tour = tour
+        self._tour_last = last
+        self._tour_jumps = jumps_of
+        self._tour_end = counter
+        self._closure_version = self.version
+    
+    def _patch_closure(self, child: str, parent: Optional[str]) -> bool:
+        """
+        Doplní do platného uzáveru vzťah, ktorý sa práve pridáva.
+        
+        Zvládne novú koreňovú triedu, nový list pod existujúcou triedou
+        (ak je v jej intervale voľné miesto) a vzťah, ktorý už v strome je.
+        
+        Returns:
+            True, ak uzáver po pridaní vzťahu zostane platný
+        """
+        if child in self.parent_map:
+            return self.parent_map[child] == parent
+        if child in self._tour:
+            # Trieda už je rodičom iných tried - mení sa celý jej podstrom
+            return False
+        
+        if not parent:
+            start = self._tour_end
+            self._tour[child] = (start, start + 1 + _CLOSURE_GAP)
+            self._tour_last[child] = start
+            self._tour_jumps[child] = []
+            self._tour_end = start + 2 + _CLOSURE_GAP
+            return True
+        
+        parent_interval = self._tour.get(parent)
+        if parent_interval is None:
+            return False
+        # Nový list dostane štvrtinu voľného miesta na konci intervalu rodiča
+        start = self._tour_last[parent] + 1
+        span = (parent_interval[1] - start) // 4
+        if span < 2:
+            return False
+        self._tour[child] = (start, start + span)
+        self._tour_last[child] = start
+        self._tour_last[parent] = start + span
+        self._tour_jumps[child] = self._jumps(parent, self._tour_jumps)
+        return True
+    
+    @staticmethod
+    def _jumps(parent: str, jumps_of: Dict[str, List[str]]) -> List[str]:
+        """Predkovia triedy s rodičom parent o 1, 2, 4, ... úrovní vyššie."""
+        jumps = [parent]
+        while True:
+            ancestor_jumps = jumps_of[jumps[-1]]
+            if len(jumps) > len(ancestor_jumps):
+                return jumps
+            jumps.append(ancestor_jumps[len(jumps) - 1])
+
+@dataclass
+class Violation:
+    """
+    Porušenie pravidla modelu príkladom (štruktúrovaný rozdiel).
+    
+    Overovanie vytvára len tieto záznamy, text pre používateľa sa skladá
+    až pri čítaní message (alebo str).
+    
+    Atributy:
+        kind: Druh porušenia - class, missing_link, class_link, forbidden_link,
+            missing_attribute, interval, value_set alebo value
+        subject: Objekt (alebo zdroj spojenia), ktorého sa porušenie týka
+        expected: Čo vyžaduje model - trieda, cieľ spojenia, interval, množina alebo hodnota
+        actual: Čo obsahuje príklad - trieda objektu, cieľ zakázaného spojenia alebo hodnota
+        attribute: Názov atribútu pri porušeniach atribútov
+    """
+    kind: str
+    subject: str
+    expected: Any = None
+    actual: Any = None
+    attribute: Optional[str] = None
+    
+    @property
+    def message(self) -> str:
+        """Popis porušenia v tvare, aký vracia is_valid_example."""
+        kind = self.kind
+        if kind == "class":
+            return (f"Objekt {self.subject} má triedu {self.actual},"
+                    f" ale mal by mať triedu {self.expected} alebo jej podtriedu")
+        if kind == "missing_link":
+            return f"Chýba požadované spojenie: {self.subject} → {self.expected}"
+        if kind == "class_link":
+            return f"Objekt {self.subject} (triedy {self.actual}) musí byť spojený s objektom triedy {self.expected}"
+        if kind == "forbidden_link":
+            return f"Obsahuje zakázané spojenie: {self.subject} → {self.actual}"
+        if kind == "missing_attribute":
+            return f"Chýba atribút {self.attribute} objektu {self.subject}"
+        if kind == "interval":
+            min_val, max_val = self.expected
+            return f"Hodnota atribútu {self.attribute} objektu {self.subject} musí byť v intervale [{min_val}, {max_val}], ale je {self.actual}"
+        if kind == "value_set":
+            return f"Hodnota atribútu {self.attribute} objektu {self.subject} musí byť jedna z {self.expected}, ale je {self.actual}"
+        return f"Hodnota atribútu {self.attribute} objektu {self.subject} musí byť {self.expected}, ale je {self.actual}"
+    
+    def __str__(self) -> str:
+        return self.message
+
+class _SubclassSet(dict):
+    """
+    Podtriedy triedy target: trieda -> True/False (je podtriedou target).
+    
+    Množina sa rozvíja postupne o triedy, na ktoré sa matcher pýta
+    (subclasses[trieda]) - rozvinutie celej taxonómie vopred by pri veľkých
+    stromoch trvalo dlhšie než samotné porovnávanie.
+    """
+    __slots__ = ("target", "_tree")
+    
+    def __init__(self, target: str, classification_tree: ClassificationTree):
+        super().__init__({target: True})
+        self.target = target
+        self._tree = classification_tree
+    
+    def __missing__(self, class_name: str) -> bool:
+        result = self[class_name] = self._tree.is_subclass(class_name, self.target)
+        return result
+
+def _compile_attribute_check(obj_name: str, attr_name: str, model_value: AttributeValue):
+    """
+    Vráti funkciu, ktorá pre hodnotu atribútu príkladu vráti Violation alebo None.
+    """
+    interval = as_interval(model_value)
+    if interval is not None:
+        contains = interval.contains
+        
+        def check_interval(value):
+            if isinstance(value, (int, float)) and not contains(value):
+                return Violation("interval", obj_name, interval, value, attr_name)
+            return None
+        return check_interval
+    
+    value_set = as_value_set(model_value)
+    if value_set is not None:
+        def check_value_set(value):
+            if as_value_set(value) is not None:
+                # Množina v príklade sa porovná s množinou modelu ako celok
+                if model_value != value:
+                    return Violation("value", obj_name, model_value, value, attr_name)
+            elif value not in value_set:
+                return Violation("value_set", obj_name, value_set, value, attr_name)
+            return None
+        return check_value_set
+    
+    def check_value(value):
+        if model_value != value:
+            return Violation("value", obj_name, model_value, value, attr_name)
+        return None
+    return check_value
+
+class ModelMatcher:
+    """
+    Naučený model preložený na pravidlá pre opakované overovanie príkladov.
+    
+    Pri preklade sa raz prejdú spojenia modelu a rozdelia na generické
+    pravidlá MUST medzi triedami, MUST medzi konkrétnymi objektmi a zakázané
+    spojenia MUST_NOT, triedy objektov modelu sa uložia do mapy a kontroly
+    atribútov sa naviažu na funkcie. Každá trieda z pravidiel má jednu
+    množinu podtried a objekty príkladu danej triedy sa hľadajú raz pre
+    všetky pravidlá s touto triedou.
+    
+    Overovanie má dva režimy nad rovnakými pravidlami: violations (a match)
+    vráti všetky porušenia v poradí is_valid_example, accepts skončí pri
+    prvom porušení a nevytvára žiadne texty - pre kontroly vnútri learnera.
+    
+    Matcher platí pre model a strom v stave pri preklade - po zmene modelu
+    alebo stromu treba vytvoriť nový (pozri Model.matcher).
+    """
+    
+    def __init__(self, model: Model, classification_tree: ClassificationTree):
+        self.classification_tree = classification_tree
+        self.tree_version = classification_tree.version
+        subclass_sets: Dict[str, _SubclassSet] = {}
+        
+        def subclass_set(class_name: str) -> _SubclassSet:
+            subclasses = subclass_sets.get(class_name)
+            if subclasses is None:
+                subclasses = subclass_sets[class_name] = _SubclassSet(class_name, classification_tree)
+            return subclasses
+        
+        # Trieda objektu modelu podľa názvu (rovnaký objekt ako vráti get_object)
+        self._class_sets: Dict[str, _SubclassSet] = {}
+        for obj in model.objects:
+            if obj.name not in self._class_sets:
+                self._class_sets[obj.name] = subclass_set(model.get_object(obj.name).class_name)
+        
+        model_classes = set(obj.class_name for obj in model.objects)
+        # Pravidlá MUST v poradí modelu: (zdrojová trieda, cieľová trieda, podtriedy cieľa)
+        # pre generické spojenia, (zdroj, cieľ, None) pre konkrétne objekty
+        self._must_rules: List[Tuple[str, str, Optional[_SubclassSet]]] = []
+        self._must_not_rules: List[Tuple[str, str]] = []
+        for link in model.links:
+            if link.link_type == LinkType.MUST:
+                if link.source in model_classes and link.target in model_classes:
+                    subclass_set(link.source)
+                    self._must_rules.append((link.source, link.target, subclass_set(link.target)))
+                else:
+                    self._must_rules.append((link.source, link.target, None))
+            elif link.link_type == LinkType.MUST_NOT:
+                self._must_not_rules.append((link.source, link.target))
+        self._subclass_sets = subclass_sets
+        
+        # Kontroly atribútov: (názov objektu, [(atribút, kontrola)])
+        self._attribute_rules = [
+            (obj.name, [
+                (attr_name, _compile_attribute_check(obj.name, attr_name, value))
+                for attr_name, value in obj.attributes.items()
+            ])
+            for obj in model.objects if obj.attributes
+        ]
+    
+    def match(self, example: Model) -> Tuple[bool, List[str]]:
+        """
+        Overí príklad podľa preloženého modelu.
+        
+        Args:
+            example: Príklad, ktorý sa má vyhodnotiť
+        
+        Returns:
+            Tuple (bool, list[str]) ako is_valid_example
+        """
+        violations = self.violations(example)
+        return not violations, [violation.message for violation in violations]
+    
+    def violations(self, example: Model) -> List[Violation]:
+        """Všetky porušenia pravidiel modelu príkladom v poradí is_valid_example."""
+        return list(self._iter_violations(example))
+    
+    def accepts(self, example: Model) -> bool:
+        """Či príklad spĺňa model - overovanie skončí pri prvom porušení."""
+        return next(self._iter_violations(example), None) is None
+    
+    def _iter_violations(self, example: Model) -> Iterator[Violation]:
+        # Príklad sa prejde raz a objekty (prvý s daným názvom, ako get_object)
+        # aj ciele spojení podľa zdroja sa zoberú z tohto prechodu, takže
+        # pravidlá sa nepýtajú indexu príkladu pre každé spojenie zvlášť
+        example_objects = list(example.objects)
+        objects_by_name: Dict[str, Object] = {}
+        for obj in example_objects:
+            objects_by_name.setdefault(obj.name, obj)
+        targets_by_source: Dict[str, List[str]] = {}
+        for link in example.links:
+            targets_by_source.setdefault(link.source, []).append(link.target)
+        
+        for example_obj in example_objects:
+            subclasses = self._class_sets.get(example_obj.name)
+            if subclasses is not None and not subclasses[example_obj.class_name]:
+                yield Violation("class", example_obj.name, subclasses.target, example_obj.class_name)
+        
+        # Objekty príkladu podľa triedy (vrátane podtried) a názvy objektov, ktoré
+        # get_object vráti s takou triedou - spoločné pre pravidlá s rovnakou triedou
+        members: Dict[str, List[Object]] = {}
+        member_names: Dict[str, Set[str]] = {}
+        
+        def objects_of_class(class_name: str) -> List[Object]:
+            objects = members.get(class_name)
+            if objects is None:
+                subclasses = self._subclass_sets[class_name]
+                objects = members[class_name] = [obj for obj in example_objects if subclasses[obj.class_name]]
+            return objects
+        
+        for source, target, target_subclasses in self._must_rules:
+            if target_subclasses is None:
+                if target not in targets_by_source.get(source, ()):
+                    yield Violation("missing_link", source, target)
+                continue
+            
+            source_objects = objects_of_class(source)
+            if not source_objects or not objects_of_class(target):
+                continue
+            names = member_names.get(target)
+            if names is None:
+                names = member_names[target] = {
+                    name for name, obj in objects_by_name.items() if target_subclasses[obj.class_name]
+                }
+            for source_obj in source_objects:
+                if names.isdisjoint(targets_by_source.get(source_obj.name, ())):
+                    yield Violation("class_link", source_obj.name, target, source_obj.class_name)
+        
+        for source, target in self._must_not_rules:
+            for link_target in targets_by_source.get(source, ()):
+                if link_target == target:
+                    yield Violation("forbidden_link", source, actual=target)
+        
+        for obj_name, checks in self._attribute_rules:
+            example_obj = objects_by_name.get(obj_name)
+            if not example_obj or not example_obj.attributes:
+                continue
+            example_attributes = example_obj.attributes
+            for attr_name, check in checks:
+                if attr_name not in example_attributes:
+                    yield Violation("missing_attribute", obj_name, attribute=attr_name)
+                    continue
+                violation = check(example_attributes[attr_name])
+                if violation is not None:
+                    yield violation
+
+def compile_model(model: Model, classification_tree: ClassificationTree) -> ModelMatcher:
+    """
+    Preloží model na ModelMatcher pre opakované overovanie príkladov.
+    
+    Pre model, ktorý sa medzi porovnaniami nemení, je vhodnejšie
+    Model.matcher - vráti uložený matcher, kým sa model alebo strom nezmení.
+    """
+    return ModelMatcher(model, classification_tree)
+
+@dataclass
+class _ExampleFacts:
+    """Príklad rozložený pre MatchNetwork - rovnaké mapy ako v ModelMatcher.match."""
+    objects: List[Object]
+    objects_by_name: Dict[str, Object]
+    positions_by_name: Dict[str, List[int]]
+    targets_by_source: Dict[str, List[str]]
+    
+    @classmethod
+    def of(cls, example: Model) -> '_ExampleFacts':
+        objects = list(example.objects)
+        objects_by_name: Dict[str, Object] = {}
+        positions_by_name: Dict[str, List[int]] = {}
+        for position, obj in enumerate(objects):
+            objects_by_name.setdefault(obj.name, obj)
+            positions_by_name.setdefault(obj.name, []).append(position)
+        targets_by_source: Dict[str, List[str]] = {}
+        for link in example.links:
+            targets_by_source.setdefault(link.source, []).append(link.target)
+        return cls(objects, objects_by_name, positions_by_name, targets_by_source)
+
+class MatchNetwork:
+    """
+    Inkrementálne overovanie množiny príkladov podľa meniaceho sa modelu.
+    
+    Model sa rozloží na uzly pravidiel rovnako ako v ModelMatcher: trieda
+    objektu podľa názvu, spojenie MUST medzi objektmi, generické MUST medzi
+    triedami, MUST_NOT a kontrola jedného atribútu. Kľúč uzla je obsah
+    pravidla, takže uzol prežije zmenu modelu, ak sa jeho pravidlo nezmenilo.
+    Každý uzol si pamätá príklady, ktoré zamietol, aj s popismi rozdielov.
+    
+    Pri update sa vyhodnotia len nové uzly, a to len nad príkladmi, ktoré
+    podľa indexov príkladov (názvy objektov, spojenia, triedy) môžu pravidlo
+    porušiť. Verdikt sa znova poskladá len pre príklady, ktoré zamietol
+    pridaný alebo odstránený uzol. Tabuľka verdicts potom zodpovedá
+    is_valid_example pre každý príklad (vrátane poradia rozdielov).
+    
+    Po zmene stromu (iný strom alebo verzia) sa sieť vyhodnotí celá znova.
+    """
+    
+    def __init__(self):
+        self.verdicts: Dict[Any, Tuple[bool, List[str]]] = {}  # ID príkladu -> (platný, rozdiely)
+        self.checks = 0  # Počet vyhodnotení pravidla nad príkladom (pre štatistiky a testy)
+        self.last_update: Dict[str, int] = {}
+        self._examples: Dict[Any, _ExampleFacts] = {}
+        # Indexy príkladov: názov objektu / spojenie (zdroj, cieľ) / trieda -> ID príkladov
+        self._by_name: Dict[str, Set[Any]] = {}
+        self._by_link: Dict[Tuple[str, str], Set[Any]] = {}
+        self._by_class: Dict[str, Set[Any]] = {}
+        # Uzly: kľúč pravidla -> {ID zamietnutého príkladu: porušenia (Violation)}
+        self._memory: Dict[tuple, Dict[Any, list]] = {}
+        self._class_keys: Dict[str, tuple] = {}  # Názov objektu modelu -> kľúč uzla triedy
+        self._layout: List[tuple] = []  # Uzly MUST, MUST_NOT a atribútov v poradí is_valid_example
+        self._positions: Dict[tuple, List[int]] = {}  # Kľúč uzla -> pozície v _layout
+        self._rejections: Dict[Any, Set[tuple]] = {}  # ID príkladu -> uzly mimo tried, ktoré ho zamietli
+        self._attribute_checks: Dict[tuple, Any] = {}
+        self._subclass_sets: Dict[str, _SubclassSet] = {}
+        self._tree: Optional[ClassificationTree] = None
+        self._tree_version = -1
+    
+    def __len__(self) -> int:
+        return len(self._examples)
+    
+    def __contains__(self, example_id) -> bool:
+        return example_id in self._examples
+    
+    def add_example(self, example_id, example: Model) -> Tuple[bool, List[str]]:
+        """
+        Pridá (alebo nahradí) príklad a vyhodnotí ho všetkými uzlami siete.
+        
+        Returns:
+            Verdikt príkladu podľa modelu posledného update
+        """
+        if example_id in self._examples:
+            self.remove_example(example_id)
+        facts = self._examples[example_id] = _ExampleFacts.of(example)
+        for name in facts.positions_by_name:
+            self._by_name.setdefault(name, set()).add(example_id)
+        for source, targets in facts.targets_by_source.items():
+            for target in targets:
+                self._by_link.setdefault((source, target), set()).add(example_id)
+        for obj in facts.objects:
+            self._by_class.setdefault(obj.class_name, set()).add(example_id)
+        
+        rejections = self._rejections[example_id] = set()
+        for key, memory in self._memory.items():
+            messages = self._check(key, facts)
+            if messages:
+                memory[example_id] = messages
+                rejections.add(key)
+        verdict = self.verdicts[example_id] = self._assemble(example_id)
+        return verdict
+    
+    def remove_example(self, example_id) -> None:
+        """Odstráni príklad zo siete aj z tabuľky verdiktov."""
+        facts = self._examples.pop(example_id, None)
+        if facts is None:
+            return
+        
+        def discard(index, key):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(example_id)
+                if not ids:
+                    del index[key]
+        
+        for name in facts.positions_by_name:
+            discard(self._by_name, name)
+        for source, targets in facts.targets_by_source.items():
+            for target in targets:
+                discard(self._by_link, (source, target))
+        for obj in facts.objects:
+            discard(self._by_class, obj.class_name)
+        for memory in self._memory.values():
+            memory.pop(example_id, None)
+        del self._rejections[example_id]
+        del self.verdicts[example_id]
+    
+    def clear(self) -> None:
+        """Odstráni všetky príklady, uzly modelu zostanú."""
+        for example_id in list(self._examples):
+            self.remove_example(example_id)
+    
+    def update(self, model: Model, classification_tree: ClassificationTree) -> Set[Any]:
+        """
+        Prestaví sieť na nový model a aktualizuje tabuľku verdiktov.
+        
+        Args:
+            model: Nový stav modelu
+            classification_tree: Klasifikačný strom pre vzťahy medzi triedami
+        
+        Returns:
+            ID príkladov, ktorých verdikt sa znova poskladal
+        """
+        # Odtlačok modelu tu nestačí - 250 a 250.0 majú rovnaký odtlačok, ale iný popis rozdielu
+        tree_changed = classification_tree is not self._tree or classification_tree.version != self._tree_version
+        checks_before = self.checks
+        if tree_changed:
+            self._tree = classification_tree
+            self._tree_version = classification_tree.version
+            self._subclass_sets = {}
+            self._memory = {}
+            self._attribute_checks = {}
+            self._rejections = {example_id: set() for example_id in self._examples}
+        
+        class_keys, layout, attribute_values = self._rule_keys(model)
+        keys = set(class_keys.values())
+        keys.update(layout)
+        affected: Set[Any] = set(self._examples) if tree_changed else set()
+        
+        removed = [key for key in self._memory if key not in keys]
+        for key in removed:
+            for example_id in self._memory.pop(key):
+                self._rejections[example_id].discard(key)
+                affected.add(example_id)
+            self._attribute_checks.pop(key, None)
+        added = [key for key in keys if key not in self._memory]
+        for key in added:
+            if key[0] == "attribute":
+                self._attribute_checks[key] = _compile_attribute_check(key[1], key[2], attribute_values[key])
+            memory = self._memory[key] = self._evaluate(key)
+            for example_id in memory:
+                self._rejections[example_id].add(key)
+                affected.add(example_id)
+        
+        # Zmenené poradie zachovaných pravidiel mení poradie rozdielov
+        retained = [key for key in self._layout if key in keys]
+        if retained != [key for key in layout if key not in added]:
+            affected.update(example_id for example_id, (is_valid, _) in self.verdicts.items() if not is_valid)
+        
+        self._class_keys = class_keys
+        self._layout = layout
+        self._positions = {}
+        for position, key in enumerate(layout):
+            self._positions.setdefault(key, []).append(position)
+        for example_id in affected:
+            self.verdicts[example_id] = self._assemble(example_id)
+        
+        self.last_update = {
+            "added_rules": len(added),
+            "removed_rules": len(removed),
+            "reevaluated_examples": len(affected),
+            "checks": self.checks - checks_before
+        }
+        if added or removed:
+            log.debug("MatchNetwork: +%s/-%s pravidiel, %s príkladov znova vyhodnotených",
+                      len(added), len(removed), len(affected))
+        return affected
+    
+    def invalid_examples(self) -> List[Any]:
+        """ID príkladov, ktoré model podľa posledného update zamieta."""
+        return [example_id for example_id, (is_valid, _) in self.verdicts.items() if not is_valid]
+    
+    def _rule_keys(self, model: Model) -> Tuple[Dict[str, tuple], List[tuple], Dict[tuple, AttributeValue]]:
+        class_keys: Dict[str, tuple] = {}
+        for obj in model.objects:
+            if obj.name not in class_keys:
+                class_keys[obj.name] = ("class", obj.name, obj.class_name)
+        
+        model_classes = set(obj.class_name for obj in model.objects)
+        must: List[tuple] = []
+        must_not: List[tuple] = []
+        for link in model.links:
+            if link.link_type == LinkType.MUST:
+                if link.source in model_classes and link.target in model_classes:
+                    must.append(("must_class", link.source, link.target))
+                else:
+                    must.append(("must", link.source, link.target))
+            elif link.link_type == LinkType.MUST_NOT:
+                must_not.append(("must_not", link.source, link.target))
+        
+        # Typ a repr hodnoty: 250 a 250.0 sa porovnajú rovnako, ale rozdiel sa vypíše inak
+        attribute_values: Dict[tuple, AttributeValue] = {}
+        attributes: List[tuple] = []
+        for obj in model.objects:
+            for attr_name, value in (obj.attributes or {}).items():
+                key = ("attribute", obj.name, attr_name, type(value), repr(value))
+                attribute_values[key] = value
+                attributes.append(key)
+        return class_keys, must + must_not + attributes, attribute_values
+    
+    def _subclass_set(self, class_name: str) -> _SubclassSet:
+        subclasses = self._subclass_sets.get(class_name)
+        if subclasses is None:
+            subclasses = self._subclass_sets[class_name] = _SubclassSet(class_name, self._tree)
+        return subclasses
+    
+    def _members(self, class_name: str) -> Set[Any]:
+        subclasses = self._subclass_set(class_name)
+        members: Set[Any] = set()
+        for example_class, example_ids in self._by_class.items():
+            if subclasses[example_class]:
+                members.update(example_ids)
+        return members
+    
+    def _evaluate(self, key: tuple) -> Dict[Any, list]:
+        """Vyhodnotí nový uzol nad príkladmi, ktoré môžu jeho pravidlo porušiť."""
+        kind = key[0]
+        if kind in ("class", "attribute"):
+            candidates = self._by_name.get(key[1], ())
+        elif kind == "must":
+            present = self._by_link.get((key[1], key[2]), ())
+            candidates = [example_id for example_id in self._examples if example_id not in present]
+        elif kind == "must_not":
+            candidates = self._by_link.get((key[1], key[2]), ())
+        else:
+            candidates = self._members(key[1]) & self._members(key[2])
+        
+        memory = {}
+        for example_id in candidates:
+            messages = self._check(key, self._examples[example_id])
+            if messages:
+                memory[example_id] = messages
+        return memory
+    
+    def _check(self, key: tuple, facts: _ExampleFacts) -> list:
+        """Porušenia jedného pravidla jedným príkladom (ako ModelMatcher.violations)."""
+        self.checks += 1
+        kind = key[0]
+        
+        if kind == "class":
+            _, name, class_name = key
+            subclasses = self._subclass_set(class_name)
+            return [
+                (position, Violation("class", name, class_name, facts.objects[position].class_name))
+                for position in facts.positions_by_name.get(name, ())
+                if not subclasses[facts.objects[position].class_name]
+            ]
+        
+        if kind == "must":
+            _, source, target = key
+            if target in facts.targets_by_source.get(source, ()):
+                return []
+            return [Violation("missing_link", source, target)]
+        
+        if kind == "must_not":
+            _, source, target = key
+            count = facts.targets_by_source.get(source, []).count(target)
+            return [Violation("forbidden_link", source, actual=target)] * count
+        
+        if kind == "must_class":
+            _, source, target = key
+            source_subclasses = self._subclass_set(source)
+            target_subclasses = self._subclass_set(target)
+            source_objects = [obj for obj in facts.objects if source_subclasses[obj.class_name]]
+            if not source_objects or not any(target_subclasses[obj.class_name] for obj in facts.objects):
+                return []
+            names = {name for name, obj in facts.objects_by_name.items() if target_subclasses[obj.class_name]}
+            return [
+                Violation("class_link", obj.name, target, obj.class_name)
+                for obj in source_objects
+                if names.isdisjoint(facts.targets_by_source.get(obj.name, ()))
+            ]
+        
+        _, name, attr_name = key[:3]
+        example_obj = facts.objects_by_name.get(name)
+        if not example_obj or not example_obj.attributes:
+            return []
+        if attr_name not in example_obj.attributes:
+            return [Violation("missing_attribute", name, attribute=attr_name)]
+        violation = self._attribute_checks[key](example_obj.attributes[attr_name])
+        return [] if violation is None else [violation]
+    
+    def _assemble(self, example_id) -> Tuple[bool, List[str]]:
+        facts = self._examples[example_id]
+        memory = self._memory
+        class_messages = []
+        for name in facts.positions_by_name:
+            key = self._class_keys.get(name)
+            if key is not None:
+                class_messages.extend(memory[key].get(example_id, ()))
+        class_messages.sort(key=lambda entry: entry[0])
+        
+        differences = [violation.message for _, violation in class_messages]
+        
+        # Rozdiely ostatných uzlov v poradí pravidiel modelu (uzol môže byť v modeli viackrát)
+        rule_messages = []
+        for key in self._rejections[example_id]:
+            if key[0] != "class":
+                messages = memory[key][example_id]
+                rule_messages.extend((position, messages) for position in self._positions[key])
+        rule_messages.sort(key=lambda entry: entry[0])
+        for _, violations in rule_messages:
+            differences.extend(violation.message for violation in violations)
+        return not differences, differences
 
 def is_valid_example(model: Model, example: Model, classification_tree: ClassificationTree) -> tuple[bool, list[str]]:
     """
@@ -825,125 +2516,6 @@ def is_valid_example(model: Model, example: Model, classification_tree: Classifi
         Tuple (bool, list[str]), kde prvy prvok je True, ak priklad je platny,
         inak False, a druhy prvok je zoznam dovodov neplatnosti.
     """
-    is_valid = True
-    differences = []
-    
-    # Zistenie tried objektov v príklade a v modeli (pre generické pravidlá)
-    example_classes = set(obj.class_name for obj in example.objects)
-    model_classes = set(obj.class_name for obj in model.objects)
-    
-    # Kontrola všetkých objektov v príklade, či majú zodpovedajúce triedy v modeli
-    for example_obj in example.objects:
-        model_obj = next(
-            (obj for obj in model.objects if obj.name == example_obj.name), None
-        )
-        if model_obj and model_obj.class_name != example_obj.class_name:
-            # Ak sa názvy tried nezhodujú, skontroluj či je podtriedou
-            if not classification_tree.is_subclass(
-                example_obj.class_name, model_obj.class_name
-            ):
-                is_valid = False
-                diff = (
-                    f"Objekt {example_obj.name} má triedu {example_obj.class_name},"
-                    f" ale mal by mať triedu {model_obj.class_name} alebo jej podtriedu"
-                )
-                differences.append(diff)
-    
-    # Kontrola všetkých spojení MUST v modeli
-    for model_link in model.links:
-        if model_link.link_type == LinkType.MUST:
-            # Najprv skontrolujeme, či ide o generické spojenie medzi triedami
-            is_class_link = False
-            if model_link.source in model_classes and model_link.target in model_classes:
-                is_class_link = True
-                
-                # Nájdi objekty v príklade, ktoré patria k zdrojovej triede
-                source_class_objects = []
-                for obj in example.objects:
-                    if obj.class_name == model_link.source or classification_tree.is_subclass(obj.class_name, model_link.source):
-                        source_class_objects.append(obj)
-                
-                # Nájdi objekty v príklade, ktoré patria k cieľovej triede
-                target_class_objects = []
-                for obj in example.objects:
-                    if obj.class_name == model_link.target or classification_tree.is_subclass(obj.class_name, model_link.target):
-                        target_class_objects.append(obj)
-                
-                # Skontroluj, či každý objekt zdrojovej triedy má spojenie s objektom cieľovej triedy
-                for source_obj in source_class_objects:
-                    has_link_to_target_class = False
-                    for example_link in example.links:
-                        if example_link.source == source_obj.name:
-                            target_obj = next((obj for obj in example.objects if obj.name == example_link.target), None)
-                            if target_obj and (target_obj in target_class_objects):
-                                has_link_to_target_class = True
-                                break
-                    
-                    if not has_link_to_target_class and len(target_class_objects) > 0:
-                        is_valid = False
-                        diff = f"Objekt {source_obj.name} (triedy {source_obj.class_name}) musí byť spojený s objektom triedy {model_link.target}"
-                        differences.append(diff)
-            
-            # Ak nejde o generické spojenie, skontrolujeme konkrétne objekty
-            if not is_class_link:
-                has_link = False
-                for example_link in example.links:
-                    if (
-                        example_link.source == model_link.source
-                        and example_link.target == model_link.target
-                    ):
-                        has_link = True
-                        break
-                if not has_link:
-                    is_valid = False
-                    diff = f"Chýba požadované spojenie: {model_link.source} → {model_link.target}"
-                    differences.append(diff)
-    
-    # Kontrola všetkých spojení MUST_NOT v modeli
-    for model_link in model.links:
-        if model_link.link_type == LinkType.MUST_NOT:
-            for example_link in example.links:
-                if (
-                    example_link.source == model_link.source
-                    and example_link.target == model_link.target
-                ):
-                    is_valid = False
-                    diff = f"Obsahuje zakázané spojenie: {model_link.source} → {model_link.target}"
-                    differences.append(diff)
-    
-    # Kontrola atribútov
-    for model_obj in model.objects:
-        if model_obj.attributes:
-            example_obj = next(
-                (obj for obj in example.objects if obj.name == model_obj.name), None
-            )
-            if example_obj and example_obj.attributes:
-                for attr_name, model_attr_value in model_obj.attributes.items():
-                    if attr_name not in example_obj.attributes:
-                        is_valid = False
-                        diff = f"Chýba atribút {attr_name} objektu {model_obj.name}"
-                        differences.append(diff)
-                    else:
-                        example_attr_value = example_obj.attributes[attr_name]
-                        # Ak je hodnota v modeli interval
-                        if (
-                            isinstance(model_attr_value, tuple)
-                            and len(model_attr_value) == 2
-                        ):
-                            min_val, max_val = model_attr_value
-                            # Skontroluj, či hodnota v príklade je v intervale
-                            if isinstance(example_attr_value, (int, float)):
-                                if (
-                                    example_attr_value < min_val
-                                    or example_attr_value > max_val
-                                ):
-                                    is_valid = False
-                                    diff = f"Hodnota atribútu {attr_name} objektu {model_obj.name} musí byť v intervale [{min_val}, {max_val}], ale je {example_attr_value}"
-                                    differences.append(diff)
-                        # Ak je hodnota v modeli konkrétna hodnota
-                        elif model_attr_value != example_attr_value:
-                            is_valid = False
-                            diff = f"Hodnota atribútu {attr_name} objektu {model_obj.name} musí byť {model_attr_value}, ale je {example_attr_value}"
-                            differences.append(diff)
-    
-    return is_valid, differences 
\ No newline at end of file
+    # Jeden overovací mechanizmus pre celý systém - pravidlá vyhodnocuje ModelMatcher
+    return compile_model(model, classification_tree).match(example)
+    
\ No newline at end of file
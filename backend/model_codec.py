@@ -0,0 +1,254 @@
+from typing import Any, List, Optional, Tuple, Type
+import gc
+import marshal
+import os
+import struct
+
+from backend.model import Model, Object, Link, LinkType
+from backend.domains import Interval, ValueSet
+
+try:
+    import msgpack
+except ImportError:  # msgpack je voliteľný - bez neho sa použije marshal zo štandardnej knižnice
+    msgpack = None
+
+# Verzia formátu - pri zmene rozloženia dát ju treba zvýšiť
+MODEL_CODEC_VERSION = 2
+MODEL_SUFFIX = ".pl1m"
+
+# Serializácia dát za hlavičkou
+FORMAT_MARSHAL = 1  # Štandardná knižnica, čitateľné len rovnakou alebo novšou verziou marshal
+FORMAT_MSGPACK = 2  # Prenosné medzi verziami Pythonu, vyžaduje msgpack
+
+# Hlavička: magic, verzia formátu, serializácia, verzia marshal, počet objektov, počet spojení
+_HEADER = struct.Struct("<4sBBHII")
+_MAGIC = b"PL1M"
+
+# Kódy typov spojení sú súčasťou formátu - nezávisia od poradia v LinkType
+_LINK_TYPES = (LinkType.MUST, LinkType.MUST_NOT, LinkType.MUST_BE_A, LinkType.REGULAR)
+_LINK_TYPE_CODES = {link_type: code for code, link_type in enumerate(_LINK_TYPES)}
+
+# Rozšírené typy msgpack pre hodnoty, ktoré msgpack sám nerozlíši od zoznamu
+_EXT_TUPLE = 1
+_EXT_SET = 2
+_EXT_FROZENSET = 3
+_EXT_TYPES = {tuple: _EXT_TUPLE, set: _EXT_SET, frozenset: _EXT_FROZENSET}
+_EXT_CONSTRUCTORS = {_EXT_TUPLE: tuple, _EXT_SET: set, _EXT_FROZENSET: frozenset}
+
+# Druh hodnoty atribútu - doménové typy sa ukladajú ako obyčajné hodnoty a pri načítaní obnovia
+_VALUE_PLAIN = 0
+_VALUE_INTERVAL = 1
+_VALUE_SET = 2
+_VALUE_KINDS = {Interval: _VALUE_INTERVAL, ValueSet: _VALUE_SET}
+
+class ModelCodecError(ValueError):
+    """Model sa nedá zakódovať, alebo dáta nie sú platný zakódovaný model."""
+
+def msgpack_available() -> bool:
+    """Vráti True, ak je nainštalovaný msgpack (prenosný formát)."""
+    return msgpack is not None
+
+def _pack_ext(value: Any) -> Any:
+    """Zakóduje n-ticu alebo množinu ako rozšírený typ msgpack."""
+    code = _EXT_TYPES.get(type(value))
+    if code is None:
+        raise TypeError(f"Hodnotu typu {type(value).__name__} nemožno zakódovať")
+    return msgpack.ExtType(code, _msgpack_dumps(list(value)))
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    constructor = _EXT_CONSTRUCTORS.get(code)
+    if constructor is None:
+        raise ModelCodecError(f"Neznámy rozšírený typ {code}")
+    return constructor(_msgpack_loads(data))
+
+def _msgpack_dumps(value: Any) -> bytes:
+    # strict_types - n-tice nesmú splynúť so zoznamami, prejdú cez _pack_ext
+    return msgpack.packb(value, default=_pack_ext, strict_types=True, use_bin_type=True)
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_unpack_ext, raw=False, strict_map_key=False)
+
+def _encode_payload(model: Model) -> List[Any]:
+    """
+    Prevedie model na vnorené zoznamy pre serializáciu.
+    
+    Názvy objektov, tried a atribútov sú v tabuľke symbolov a v dátach
+    sa na ne odkazuje indexom. Objekty sú ploché trojice (názov, trieda,
+    atribúty), atribúty trojice (názov, druh hodnoty, hodnota), spojenia
+    trojice (zdroj, cieľ, kód typu).
+    
+    Returns:
+        Zoznam [symboly, objekty, spojenia]
+    """
+    symbol_ids = {}
+    symbol = symbol_ids.setdefault
+    
+    objects = []
+    for obj in model.objects:
+        if obj.attributes is None:
+            attributes = None
+        else:
+            attributes = []
+            for name, value in obj.attributes.items():
+                kind = _VALUE_KINDS.get(type(value), _VALUE_PLAIN)
+                if kind == _VALUE_INTERVAL:
+                    value = [value[0], value[1]]
+                elif kind == _VALUE_SET:
+                    value = list(value)
+                attributes.extend((symbol(name, len(symbol_ids)), kind, value))
+        objects.extend((symbol(obj.name, len(symbol_ids)), symbol(obj.class_name, len(symbol_ids)), attributes))
+    
+    links = []
+    for link in model.links:
+        links.extend((symbol(link.source, len(symbol_ids)), symbol(link.target, len(symbol_ids)),
+                      _LINK_TYPE_CODES[link.link_type]))
+    
+    return [list(symbol_ids), objects, links]
+
+def _decode_payload(payload: Any) -> Tuple[List[Object], List[Link]]:
+    """Obnoví objekty a spojenia z dát vytvorených _encode_payload."""
+    symbols, encoded_objects, encoded_links = payload
+    
+    objects = []
+    fields = iter(encoded_objects)
+    for name, class_name, attributes in zip(fields, fields, fields):
+        if attributes is not None:
+            values = iter(attributes)
+            attributes = {}
+            for attr_name, kind, value in zip(values, values, values):
+                if kind == _VALUE_INTERVAL:
+                    value = Interval(value[0], value[1])
+                elif kind == _VALUE_SET:
+                    value = ValueSet(value)
+                attributes[symbols[attr_name]] = value
+        objects.append(Object(symbols[name], symbols[class_name], attributes))
+    
+    fields = iter(encoded_links)
+    links = [
+        Link(symbols[source], symbols[target], _LINK_TYPES[code])
+        for source, target, code in zip(fields, fields, fields)
+    ]
+    return objects, links
+
+def encode_model(model: Model, serialization: Optional[int] = None) -> bytes:
+    """
+    Zakóduje model do binárnej podoby.
+    
+    Na rozdiel od to_dict + JSON sa zachovajú intervaly (n-tice), množiny
+    hodnôt aj typy spojení presne tak, ako sú v modeli.
+    
+    Args:
+        model: Model (alebo ArrayModel) na zakódovanie
+        serialization: FORMAT_MSGPACK alebo FORMAT_MARSHAL (predvolene msgpack, ak je dostupný)
+    
+    Returns:
+        Hlavička a zakódované dáta modelu
+    
+    Raises:
+        ModelCodecError: Ak model obsahuje hodnotu, ktorú nemožno zakódovať
+    """
+    if serialization is None:
+        serialization = FORMAT_MSGPACK if msgpack is not None else FORMAT_MARSHAL
+    if serialization == FORMAT_MSGPACK and msgpack is None:
+        raise ModelCodecError("Formát msgpack vyžaduje nainštalovaný balík msgpack")
+    
+    payload = _encode_payload(model)
+    try:
+        if serialization == FORMAT_MSGPACK:
+            data = _msgpack_dumps(payload)
+        elif serialization == FORMAT_MARSHAL:
+            data = marshal.dumps(payload)
+        else:
+            raise ModelCodecError(f"Neznámy formát serializácie {serialization}")
+    except (ValueError, TypeError, OverflowError) as e:
+        raise ModelCodecError(f"Model nemožno zakódovať: {e}") from e
+    
+    header = _HEADER.pack(_MAGIC, MODEL_CODEC_VERSION, serialization, marshal.version,
+                          len(payload[1]) // 3, len(payload[2]) // 3)
+    return header + data
+
+def decode_model(data: bytes, model_class: Type[Model] = Model) -> Model:
+    """
+    Obnoví model zakódovaný pomocou encode_model.
+    
+    Args:
+        data: Zakódovaný model
+        model_class: Trieda vytvoreného modelu (Model alebo ArrayModel)
+    
+    Returns:
+        Nový model
+    
+    Raises:
+        ModelCodecError: Ak dáta nie sú platný model tejto verzie formátu
+    """
+    if len(data) < _HEADER.size:
+        raise ModelCodecError("Neúplná hlavička modelu")
+    magic, version, serialization, marshal_version, object_count, link_count = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ModelCodecError("Dáta nie sú zakódovaný model")
+    if version != MODEL_CODEC_VERSION:
+        raise ModelCodecError(f"Nepodporovaná verzia formátu modelu {version}")
+    
+    # Pri hromadnom vytváraní objektov by cyklický GC opakovane prechádzal
+    # všetko doteraz vytvorené, preto sa počas dekódovania pozastaví
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if serialization == FORMAT_MSGPACK:
+            if msgpack is None:
+                raise ModelCodecError("Model bol uložený vo formáte msgpack, ktorý nie je nainštalovaný")
+            payload = _msgpack_loads(memoryview(data)[_HEADER.size:])
+        elif serialization == FORMAT_MARSHAL:
+            if marshal_version > marshal.version:
+                raise ModelCodecError(f"Model bol uložený novšou verziou marshal ({marshal_version})")
+            payload = marshal.loads(memoryview(data)[_HEADER.size:])
+        else:
+            raise ModelCodecError(f"Neznámy formát serializácie {serialization}")
+        
+        objects, links = _decode_payload(payload)
+    except ModelCodecError:
+        raise
+    except Exception as e:
+        # Poškodené dáta môžu zlyhať v serializácii aj pri skladaní modelu
+        raise ModelCodecError(f"Poškodený zakódovaný model: {e}") from e
+    finally:
+        if gc_enabled:
+            gc.enable()
+    
+    if len(objects) != object_count or len(links) != link_count:
+        raise ModelCodecError("Počet objektov alebo spojení nezodpovedá hlavičke")
+    return model_class(objects=objects, links=links)
+
+def save_model(path: str, model: Model) -> None:
+    """
+    Uloží model do súboru (zápis cez dočasný súbor, takže pôvodný súbor sa
+    pri chybe nepoškodí).
+    
+    Raises:
+        ModelCodecError: Ak model nemožno zakódovať
+        OSError: Pri chybe zápisu
+    """
+    data = encode_model(model)
+    temp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def load_model(path: str, model_class: Type[Model] = Model) -> Model:
+    """
+    Načíta model uložený pomocou save_model.
+    
+    Raises:
+        ModelCodecError: Ak súbor neobsahuje platný model
+        OSError: Pri chybe čítania
+    """
+    with open(path, "rb") as f:
+        return decode_model(f.read(), model_class)
@@ -0,0 +1,276 @@
+from array import array
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Iterator, Dict
+import hashlib
+import mmap
+import os
+import struct
+
+from backend.pl1_parser import DatasetExample, is_positive_name, split_example_header, build_dataset_example
+
+# Hlavička súboru s indexom: magic, verzia, veľkosť a mtime zdrojového súboru, počet príkladov
+_INDEX_MAGIC = b"PL1IDX"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<6sHQQQ")
+_INDEX_SUFFIX = ".idx"
+
+class PL1FileIndex:
+    """
+    Čítačka súboru .pl1 s náhodným prístupom k príkladom.
+    
+    Súbor je namapovaný do pamäte (mmap) a pre každý príklad sa drží len
+    štvorica bajtových posunov: začiatok bloku, začiatok formuly (za hlavičkovým
+    komentárom), koniec bloku a číslo riadku. Index sa uloží vedľa súboru
+    (prípona .idx) a pri ďalšom otvorení sa načíta, ak sa zdrojový súbor
+    medzitým nezmenil.
+    
+    Získanie príkladu N tak stojí jeden výrez a parsovanie jedného bloku
+    a hlavičku je možné prečítať bez parsovania predikátov.
+    """
+    
+    def __init__(self, path: str, use_cache: bool = True):
+        """
+        Otvorí súbor a načíta alebo vytvorí jeho index.
+        
+        Args:
+            path: Cesta k súboru .pl1
+            use_cache: Ak je True, index sa načíta/uloží do súboru path + ".idx"
+        """
+        self.path = path
+        self.index_path = path + _INDEX_SUFFIX
+        self._file = open(path, "rb")
+        
+        stat = os.fstat(self._file.fileno())
+        self._source_size = stat.st_size
+        self._source_mtime = stat.st_mtime_ns
+        
+        # Prázdny súbor nie je možné namapovať
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._source_size else b""
+        
+        self.block_starts = array("q")
+        self.text_starts = array("q")
+        self.block_ends = array("q")
+        self.line_numbers = array("q")
+        
+        if not (use_cache and self._load_index()):
+            self._build_index()
+            if use_cache:
+                self._save_index()
+    
+    def _build_index(self) -> None:
+        """Jedným prechodom nájde hranice príkladov (prázdne riadky) a koniec ich hlavičiek."""
+        data = self._data
+        size = len(data)
+        position = 0
+        line_number = 0
+        
+        block_start = -1
+        block_line = 0
+        text_start = -1
+        
+        while position < size:
+            line_end = data.find(b"\n", position)
+            line_end = size if line_end == -1 else line_end + 1
+            line = data[position:line_end].strip()
+            line_number += 1
+            
+            if line:
+                if block_start < 0:
+                    block_start = position
+                    block_line = line_number
+                if text_start < 0 and not line.startswith((b"#", b"%")):
+                    text_start = position
+            elif block_start >= 0:
+                self._add_block(block_start, text_start, position, block_line)
+                block_start = -1
+                text_start = -1
+            
+            position = line_end
+        
+        if block_start >= 0:
+            self._add_block(block_start, text_start, size, block_line)
+    
+    def _add_block(self, block_start: int, text_start: int, block_end: int, line_number: int) -> None:
+        """Pridá blok do indexu; bloky zložené len z komentárov sa preskočia."""
+        if text_start < 0:
+            return
+        self.block_starts.append(block_start)
+        self.text_starts.append(text_start)
+        self.block_ends.append(block_end)
+        self.line_numbers.append(line_number)
+    
+    def _load_index(self) -> bool:
+        """
+        Načíta index zo súboru vedľa datasetu.
+        
+        Returns:
+            True, ak index existuje a zodpovedá aktuálnemu stavu zdrojového súboru
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+                if len(header) != _INDEX_HEADER.size:
+                    return False
+                
+                magic, version, size, mtime, count = _INDEX_HEADER.unpack(header)
+                if (magic != _INDEX_MAGIC or version != _INDEX_VERSION or
+                        size != self._source_size or mtime != self._source_mtime):
+                    return False
+                
+                columns = [array("q") for _ in range(4)]
+                for column in columns:
+                    column.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            return False
+        
+        self.block_starts, self.text_starts, self.block_ends, self.line_numbers = columns
+        return True
+    
+    def _save_index(self) -> None:
+        """Uloží index vedľa datasetu; ak to nie je možné (napr. len na čítanie), nič sa nedeje."""
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(_INDEX_HEADER.pack(
+                    _INDEX_MAGIC, _INDEX_VERSION, self._source_size, self._source_mtime, len(self)
+                ))
+                for column in (self.block_starts, self.text_starts, self.block_ends, self.line_numbers):
+                    column.tofile(f)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    
+    def __len__(self) -> int:
+        return len(self.block_starts)
+    
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Príklad s indexom {index} neexistuje")
+        return index
+    
+    def header(self, index: int) -> List[str]:
+        """Vráti riadky hlavičkového komentára príkladu bez parsovania formuly."""
+        index = self._check_index(index)
+        raw = self._data[self.block_starts[index]:self.text_starts[index]].decode("utf-8")
+        header, _ = split_example_header(raw.splitlines(keepends=True))
+        return header
+    
+    def name(self, index: int) -> Optional[str]:
+        """Vráti názov príkladu (prvý riadok hlavičky) alebo None."""
+        header = self.header(index)
+        return header[0] if header else None
+    
+    def is_positive(self, index: int) -> bool:
+        """Určí z hlavičky, či je príklad pozitívny."""
+        return is_positive_name(self.name(index))
+    
+    def text(self, index: int) -> str:
+        """Vráti zdrojový text formuly príkladu bez hlavičky."""
+        index = self._check_index(index)
+        return self._data[self.text_starts[index]:self.block_ends[index]].decode("utf-8").strip()
+    
+    def block_hash(self, index: int) -> bytes:
+        """
+        Vráti hash celého bloku príkladu (hlavička aj formula).
+        
+        Koncové medzery a prázdne riadky sa do hashu nezapočítavajú.
+        """
+        index = self._check_index(index)
+        block = self._data[self.block_starts[index]:self.block_ends[index]].rstrip()
+        return hashlib.blake2b(block, digest_size=16).digest()
+    
+    def block_hashes(self) -> List[bytes]:
+        """Vráti hashe všetkých blokov v poradí súboru."""
+        return [self.block_hash(index) for index in range(len(self))]
+    
+    def get(self, index: int) -> DatasetExample:
+        """Sparsuje a vráti jediný príklad datasetu."""
+        index = self._check_index(index)
+        raw = self._data[self.block_starts[index]:self.block_ends[index]].decode("utf-8")
+        return build_dataset_example(index, raw.splitlines(keepends=True), self.line_numbers[index])
+    
+    def __getitem__(self, index: int) -> DatasetExample:
+        return self.get(index)
+    
+    def __iter__(self) -> Iterator[DatasetExample]:
+        for index in range(len(self)):
+            yield self.get(index)
+    
+    def close(self) -> None:
+        """Uvoľní mapovanie a zatvorí súbor."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+    
+    def __enter__(self) -> 'PL1FileIndex':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+@dataclass
+class BlockDiff:
+    """
+    Rozdiel medzi dvoma verziami datasetu podľa hashov blokov.
+    
+    Atributy:
+        retained: Nezmenené príklady ako mapa nové ID -> pôvodné ID
+        changed: ID príkladov novej verzie, ktoré sú zmenené alebo pridané
+        removed: ID príkladov pôvodnej verzie, ktoré v novej verzii nie sú
+    """
+    retained: Dict[int, int] = field(default_factory=dict)
+    changed: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    
+    @property
+    def moved(self) -> Dict[int, int]:
+        """Nezmenené príklady, ktorým sa zmenilo ID (nové ID -> pôvodné ID)."""
+        return {new_id: old_id for new_id, old_id in self.retained.items() if new_id != old_id}
+
+def diff_block_hashes(old_hashes: List[bytes], new_hashes: List[bytes]) -> BlockDiff:
+    """
+    Porovná hashe blokov dvoch verzií súboru.
+    
+    Najprv sa párujú bloky na rovnakej pozícii (úprava príkladu na mieste
+    nemení ID ostatných), potom zvyšné bloky s rovnakým obsahom v poradí
+    výskytu (vloženie alebo zmazanie príkladu posunie ID nasledujúcich).
+    
+    Args:
+        old_hashes: Hashe blokov predchádzajúcej verzie
+        new_hashes: Hashe blokov novej verzie
+    
+    Returns:
+        BlockDiff s nezmenenými, zmenenými a odstránenými príkladmi
+    """
+    diff = BlockDiff()
+    matched_old = set()
+    
+    for index in range(min(len(old_hashes), len(new_hashes))):
+        if old_hashes[index] == new_hashes[index]:
+            diff.retained[index] = index
+            matched_old.add(index)
+    
+    available = defaultdict(deque)
+    for old_id, block_hash in enumerate(old_hashes):
+        if old_id not in matched_old:
+            available[block_hash].append(old_id)
+    
+    for new_id, block_hash in enumerate(new_hashes):
+        if new_id in diff.retained:
+            continue
+        candidates = available.get(block_hash)
+        if candidates:
+            old_id = candidates.popleft()
+            diff.retained[new_id] = old_id
+            matched_old.add(old_id)
+        else:
+            diff.changed.append(new_id)
+    
+    diff.removed = [old_id for old_id in range(len(old_hashes)) if old_id not in matched_old]
+    return diff
@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import List, Set, Dict, Tuple, Optional, Union, Any
+from typing import List, Set, Dict, Tuple, Optional, Union, Any, Iterable, Iterator
 from dataclasses import dataclass, field
+import io
 import re
+import threading
 
 class PredicateType(Enum):
     """
@@ -12,14 +14,70 @@ class PredicateType(Enum):
     TERNARY = 3
     MULTI = 4
 
-@dataclass
+class SymbolTable:
+    """
+    Zdieľaná tabuľka symbolov, ktorá mapuje reťazce na celočíselné ID.
+    
+    Názvy predikátov a ich argumenty (Ι, BMW, power_kw, ...) sa opakujú
+    v tisícoch predikátov. Každý reťazec sa tak uloží len raz a predikáty
+    si držia iba jeho celočíselné ID.
+    """
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._lock = threading.Lock()
+    
+    def intern(self, symbol: str) -> int:
+        """
+        Vráti ID symbolu, pri prvom výskyte ho zaregistruje.
+        
+        Args:
+            symbol: Reťazec symbolu
+            
+        Returns:
+            Celočíselné ID symbolu
+        """
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            with self._lock:
+                symbol_id = self._ids.get(symbol)
+                if symbol_id is None:
+                    symbol_id = len(self._symbols)
+                    self._symbols.append(symbol)
+                    self._ids[symbol] = symbol_id
+        return symbol_id
+    
+    def lookup(self, symbol: str) -> Optional[int]:
+        """Vráti ID symbolu bez jeho registrácie, alebo None ak ešte neexistuje."""
+        return self._ids.get(symbol)
+    
+    def symbol(self, symbol_id: int) -> str:
+        """Vráti reťazec pre dané ID."""
+        return self._symbols[symbol_id]
+    
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+# Spoločná tabuľka symbolov pre všetky predikáty v procese
+SYMBOLS = SymbolTable()
+
+_PREDICATE_TYPES = {
+    1: PredicateType.UNARY,
+    2: PredicateType.BINARY,
+    3: PredicateType.TERNARY,
+}
+
 class Predicate:
     """
     Trieda reprezentujuca jeden predikat v predikátovej logike prvého rádu.
+    
+    Nazov a argumenty su internovane v tabulke SYMBOLS, predikat si drzi len
+    ich celociselne ID. Porovnanie dvoch predikatov je tak porovnanim cisel
+    a hash sa vypocita len raz pri vytvoreni. Trieda pouziva __slots__,
+    takze instancia nema vlastny __dict__.
     """
-    name: str            # Nazov predikatu (S₃, HE, MT, atd.)
-    arguments: List[str]  # Argumenty predikatu (list, lebo zoznamy nie su hashovatelne)
-    type: PredicateType  # Typ predikatu (UNARY, BINARY, TERNARY)
+    __slots__ = ("name_id", "argument_ids", "type", "_hash")
     
     def __init__(self, name: str, arguments: List[str]):
         """
@@ -29,18 +87,39 @@ class Predicate:
             name: Nazov predikatu
             arguments: Zoznam argumentov predikatu
         """
-        self.name = name
-        self.arguments = arguments
+        intern = SYMBOLS.intern
+        self.name_id = intern(name)
+        self.argument_ids = tuple(intern(argument) for argument in arguments)
         
         # Urcenie typu predikatu podla poctu argumentov
-        if len(arguments) == 1:
-            self.type = PredicateType.UNARY
-        elif len(arguments) == 2:
-            self.type = PredicateType.BINARY
-        elif len(arguments) == 3:
-            self.type = PredicateType.TERNARY
-        else:
-            self.type = PredicateType.MULTI
+        self.type = _PREDICATE_TYPES.get(len(self.argument_ids), PredicateType.MULTI)
+        self._hash = hash((self.name_id, self.argument_ids))
+
+    @classmethod
+    def from_symbol_ids(cls, name_id: int, argument_ids: Tuple[int, ...]) -> 'Predicate':
+        """
+        Vytvori predikat priamo z ID symbolov, ktore uz su v tabulke SYMBOLS.
+
+        Pouziva sa pri nacitani skompilovanej cache, kde sa retazce
+        internuju len raz pre cely subor.
+        """
+        predicate = cls.__new__(cls)
+        predicate.name_id = name_id
+        predicate.argument_ids = argument_ids
+        predicate.type = _PREDICATE_TYPES.get(len(argument_ids), PredicateType.MULTI)
+        predicate._hash = hash((name_id, argument_ids))
+        return predicate
+
+    @property
+    def name(self) -> str:
+        """Nazov predikatu (S₃, HE, MT, atd.)."""
+        return SYMBOLS._symbols[self.name_id]
+    
+    @property
+    def arguments(self) -> List[str]:
+        """Argumenty predikatu ako zoznam retazcov."""
+        symbols = SYMBOLS._symbols
+        return [symbols[argument_id] for argument_id in self.argument_ids]
     
     def __str__(self) -> str:
         """
@@ -52,6 +131,9 @@ class Predicate:
         args_str = ", ".join(self.arguments)
         return f"{self.name}({args_str})"
     
+    def __repr__(self) -> str:
+        return f"Predicate(name={self.name!r}, arguments={self.arguments!r}, type={self.type})"
+    
     def __eq__(self, other):
         """
         Porovnava dva predikaty na zaklade ich semantickej ekvivalencie.
@@ -65,18 +147,21 @@ class Predicate:
         if not isinstance(other, Predicate):
             return False
         
-        return (self.name == other.name and 
-                self.arguments == other.arguments)
+        return (self.name_id == other.name_id and
+                self.argument_ids == other.argument_ids)
     
     def __hash__(self):
         """
-        Vytvára hash hodnotu pre predikát, aby mohol byť použitý ako kľúč v množine alebo slovníku.
+        Vráti hash predikátu vypočítaný pri jeho vytvorení.
         
         Returns:
-            Hash hodnota predikátu založená na jeho názve a argumentoch
+            Hash hodnota predikátu založená na ID jeho názvu a argumentov
         """
-        # Vytvoríme tuple z názvu a argumentov, ktorý je hashable
-        return hash((self.name, tuple(self.arguments)))
+        return self._hash
+    
+    def __reduce__(self):
+        # ID symbolov platia len v rámci procesu, pri prenose sa posielajú reťazce
+        return (Predicate, (self.name, self.arguments))
 
 @dataclass
 class Formula:
@@ -102,20 +187,249 @@ class Formula:
             return f"¬({str(self.subformulas[0])})"
         
         if self.operator and self.subformulas:
-            return f"({' ' + self.operator + ' '.join([str(f) for f in self.subformulas])})"
+            return f"({f' {self.operator} '.join(str(f) for f in self.subformulas)})"
         
         # Ak máme len predikáty bez operátora, spojíme ich konjunkciou
         return " ∧ ".join(str(p) for p in self.predicates)
     
     def get_all_predicates(self) -> List[Predicate]:
-        """Vráti všetky predikáty vo formule vrátane tých v podformulách."""
-        all_predicates = list(self.predicates)
+        """Vráti všetky predikáty vo formule vrátane tých v podformulách (bez duplicít)."""
+        all_predicates = dict.fromkeys(self.predicates)
         
         if self.subformulas:
             for subformula in self.subformulas:
-                all_predicates.extend(subformula.get_all_predicates())
+                all_predicates.update(dict.fromkeys(subformula.get_all_predicates()))
+        
+        return list(all_predicates)
+
+# Tokeny lexera PL1 - jeden zlozeny regularny vyraz, ktory text prejde jedenkrat
+_TOKEN_PATTERN = re.compile(
+    r"(?P<SKIP>\s+|[#%][^\n]*)"
+    r"|(?P<OP>[∧∨¬→↔])"
+    r"|(?P<LPAREN>\()"
+    r"|(?P<RPAREN>\))"
+    r"|(?P<COMMA>,)"
+    r"|(?P<QUOTED>\"[^\"\n]*\"|'[^'\n]*')"
+    r"|(?P<NAME>[^\s(),∧∨¬→↔#%]+)"
+)
+
+# Priorita binarnych logickych spojok (vyssie cislo = silnejsia vazba)
+_BINARY_PRECEDENCE = {"↔": 1, "→": 2, "∨": 3, "∧": 4}
+
+# Najvacsia hlbka vnorenia pravych operandov (napr. "A ∧ (B ∧ (C ∧ ...))"),
+# hlbsia formula by vycerpala zasobnik rekurzivneho parsera
+_MAX_NESTING_DEPTH = 200
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """
+    Rozdeli text na tokeny jednym prechodom.
+    
+    Komentare (od '#' alebo '%' do konca riadku) a biele znaky sa preskocia.
+    
+    Args:
+        text: Text v symbolickej notacii PL1
+        
+    Returns:
+        Zoznam dvojic (typ tokenu, hodnota)
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind != "SKIP":
+            tokens.append((kind, match.group()))
+    return tokens
+
+class _FormulaParser:
+    """
+    Precedencny parser, ktory z tokenov zostavi strom formuly.
+    
+    Parser je zhovievavy rovnako ako povodna implementacia: susediace predikaty
+    bez spojky sa chapu ako konjunkcia, visiace spojky na konci riadku alebo
+    formuly sa ignoruju a nepriradene zatvorky sa preskocia.
+    
+    Retazce negacii, zatvoriek a samostatnych slov pred operandom sa citaju
+    cyklom, rekurzia sa vnara len pri pravych operandoch binarnych spojok.
+    """
+    
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+    
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+    
+    def _starts_operand(self) -> bool:
+        """Zisti, ci aktualny token moze zacinat operand."""
+        token = self._peek()
+        if token is None:
+            return False
+        kind, value = token
+        return kind in ("NAME", "QUOTED", "LPAREN") or value == "¬"
+    
+    def parse(self) -> Optional[Formula]:
+        """Sparsuje vsetky tokeny a vrati koren stromu formuly (alebo None)."""
+        result = None
+        while self.pos < len(self.tokens):
+            formula = self._parse_binary(0)
+            if formula is not None:
+                result = formula if result is None else _combine("∧", result, formula)
+            elif self.pos < len(self.tokens):
+                # Nepriradena zatvorka alebo ciarka na najvyssej urovni
+                self.pos += 1
+        return result
+    
+    def _parse_binary(self, min_precedence: int) -> Optional[Formula]:
+        """Precedence climbing pre binarne spojky vratane implicitnej konjunkcie."""
+        return self._parse_binary_rest(min_precedence, self._parse_unary())
+    
+    def _parse_binary_rest(self, min_precedence: int, left: Optional[Formula]) -> Optional[Formula]:
+        """Pokracuje v precedence climbing za uz sparsovanym lavym operandom."""
+        self.depth += 1
+        if self.depth > _MAX_NESTING_DEPTH:
+            raise ValueError(f"Formula je vnorená hlbšie ako {_MAX_NESTING_DEPTH} úrovní")
+        
+        while True:
+            token = self._peek()
+            if token is None:
+                break
+            kind, value = token
+            
+            if kind == "OP" and value in _BINARY_PRECEDENCE:
+                operator = value
+                explicit = True
+            elif self._starts_operand():
+                # Dva operandy za sebou bez spojky - implicitna konjunkcia
+                operator = "∧"
+                explicit = False
+            else:
+                break
+            
+            precedence = _BINARY_PRECEDENCE[operator]
+            if precedence < min_precedence:
+                break
+            
+            if explicit:
+                self.pos += 1
+            
+            # Implikacia je pravostranne asociativna, ostatne spojky lavostranne
+            next_min = precedence if operator == "→" else precedence + 1
+            right = self._parse_binary(next_min)
+            
+            if right is None:
+                # Visiaca spojka, napr. "... ∧" na konci formuly
+                continue
+            left = right if left is None else _combine(operator, left, right)
+        
+        self.depth -= 1
+        return left
+    
+    def _parse_unary(self) -> Optional[Formula]:
+        """Sparsuje negaciu, zatvorkovu skupinu alebo predikat."""
+        # Negacie a otvorene zatvorky pred operandom (zvonka dnu)
+        prefixes = []
+        operand = None
+        while True:
+            token = self._peek()
+            if token is None:
+                break
+            kind, value = token
+        
+            if value == "¬" or kind == "LPAREN":
+                self.pos += 1
+                prefixes.append(kind)
+                continue
+        
+            if kind in ("NAME", "QUOTED"):
+                self.pos += 1
+                next_token = self._peek()
+                if next_token is not None and next_token[0] == "LPAREN":
+                    self.pos += 1
+                    predicate = Predicate(_unquote(value), self._parse_arguments())
+                    operand = Formula(predicates={predicate})
+                    break
+                # Samostatne slovo bez argumentov nie je predikat - preskocime ho
+                if self._starts_operand():
+                    continue
+            break
+        
+        # Negacia bez operandu sa zahodi, zatvorka pokracuje obsahom az po pravu zatvorku
+        for prefix in reversed(prefixes):
+            if prefix == "LPAREN":
+                operand = self._parse_binary_rest(0, operand)
+                if self._peek() is not None and self._peek()[0] == "RPAREN":
+                    self.pos += 1
+            elif operand is not None:
+                operand = Formula(predicates=set(operand.predicates), operator="¬", subformulas=[operand])
+        return operand
+    
+    def _parse_arguments(self) -> List[str]:
+        """Nacita argumenty predikatu az po zodpovedajucu pravu zatvorku."""
+        arguments = []
+        current = []
+        depth = 0
         
-        return all_predicates
+        while self.pos < len(self.tokens):
+            kind, value = self.tokens[self.pos]
+            self.pos += 1
+            
+            if kind == "RPAREN":
+                if depth == 0:
+                    break
+                depth -= 1
+                current.append(value)
+            elif kind == "LPAREN":
+                depth += 1
+                current.append(value)
+            elif kind == "COMMA" and depth == 0:
+                arguments.append(_join_argument(current))
+                current = []
+            elif kind == "COMMA":
+                current.append(", ")
+            else:
+                current.append(value)
+        
+        if current or arguments:
+            arguments.append(_join_argument(current))
+        
+        return arguments
+
+def _unquote(value: str) -> str:
+    """Odstrani uvodzovky z hodnoty, ak ich obsahuje."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+        return value[1:-1]
+    return value
+
+def _join_argument(parts: List[str]) -> str:
+    """Spoji tokeny jedneho argumentu, vnorene n-tice zachova v tvare '(a, b)'."""
+    if len(parts) == 1:
+        return _unquote(parts[0])
+    
+    text = ""
+    for part in parts:
+        if text and part not in (")", ", ") and not text.endswith(("(", ", ")):
+            text += " "
+        text += part
+    return text
+
+def _combine(operator: str, left: Formula, right: Formula) -> Formula:
+    """
+    Spoji dve formuly spojkou.
+    
+    Retazce rovnakej asociativnej spojky (∧, ∨) sa sploštia do jedneho n-arneho
+    uzla, aby dlhe konjunkcie nevytvarali hlboky strom a zostavenie ostalo linearne.
+    Mnozina predicates zlozenej formuly obsahuje vsetky predikaty jej podformul.
+    """
+    if operator in ("∧", "∨") and left.operator == operator:
+        left.subformulas.append(right)
+        left.predicates.update(right.predicates)
+        return left
+    
+    predicates = set(left.predicates)
+    predicates.update(right.predicates)
+    return Formula(predicates=predicates, operator=operator, subformulas=[left, right])
 
 def parse_pl1_formula(text: str) -> Formula:
     """
@@ -128,6 +442,11 @@ def parse_pl1_formula(text: str) -> Formula:
     - Μ(x,y) - x musí mať časť y (must_have_part)
     - Ν(x,y) - x nesmie mať časť y (must_not_have_part)
     
+    Text sa spracuje jedným prechodom lexera a precedenčným parserom, ktorý
+    zostaví strom formuly (spojka + podformuly) v lineárnom čase. Priorita
+    spojok od najsilnejšej: ¬, ∧, ∨, →, ↔. Množina predicates výslednej formuly
+    obsahuje všetky predikáty stromu.
+    
     Args:
         text: Text v symbolickej notacii PL1
         
@@ -137,137 +456,165 @@ def parse_pl1_formula(text: str) -> Formula:
     if not text or not text.strip():
         raise ValueError("Prázdna formula")
     
-    # Odstranenie komentarov a prazdnych riadkov
-    lines = []
-    for line in text.split('\n'):
-        line = line.strip()
-        if line and not line.startswith('%') and not line.startswith('#'):
-            # Odstranenie komentarov za vyrazom
-            if '%' in line:
-                line = line.split('%')[0].strip()
-            if '#' in line:
-                line = line.split('#')[0].strip()
-            lines.append(line)
-    
-    if not lines:
+    tokens = _tokenize(text)
+    
+    if not tokens:
         raise ValueError("Formula neobsahuje žiadne platné riadky po odstránení komentárov")
     
-    # Spojenie riadkov a nahradenie viacnasobnych medzier jednou
-    text = ' '.join(lines)
-    text = re.sub(r'\s+', ' ', text)
+    formula = _FormulaParser(tokens).parse()
     
-    # Nahradenie logickych spojok medzerami pre jednoduchsie parsovanie
-    text = text.replace('∧', ' ∧ ')
-    text = text.replace('∨', ' ∨ ')
-    text = text.replace('¬', ' ¬ ')
-    text = text.replace('→', ' → ')
-    text = text.replace('↔', ' ↔ ')
+    if formula is None or not formula.predicates:
+        raise ValueError("Neboli nájdené žiadne platné predikáty vo formule")
     
-    # Rozdelenie textu na tokeny
-    tokens = text.split()
+    return formula
+
+@dataclass
+class DatasetExample:
+    """
+    Jeden príklad datasetu spolu s metadátami z jeho hlavičkového komentára.
     
-    if not tokens:
-        raise ValueError("Formula neobsahuje žiadne tokeny po spracovaní")
-    
-    # Parsovanie predikatov
-    predicates = set()
-    
-    # Najprv spojíme tokeny, ktoré môžu byť rozdelené
-    i = 0
-    while i < len(tokens):
-        if '(' in tokens[i] and ')' not in tokens[i] and i + 1 < len(tokens):
-            # Spojíme tokeny, ktoré patria k jednému predikátu
-            j = i + 1
-            while j < len(tokens) and ')' not in tokens[j]:
-                tokens[i] += ' ' + tokens[j]
-                j += 1
-            
-            if j < len(tokens):
-                tokens[i] += ' ' + tokens[j]
-                # Odstránime spojené tokeny
-                tokens = tokens[:i+1] + tokens[j+1:]
-        i += 1
-    
-    # Teraz spracujeme predikáty
-    predicate_pattern = r'([^\s(]+)\s*\(\s*([^)]*)\s*\)'
-    
-    for token in tokens:
-        # Preskočíme logické spojky
-        if token in ['∧', '∨', '¬', '→', '↔']:
-            continue
+    Atributy:
+        index: Poradové číslo príkladu v datasete (od 0)
+        formula: Sparsovaná formula príkladu
+        text: Zdrojový text formuly bez hlavičkového komentára
+        header: Riadky komentára '#' pred formulou (bez znaku '#')
+        line_number: Číslo riadku (od 1), na ktorom blok príkladu začína
+    """
+    index: int
+    formula: Formula
+    text: str
+    header: List[str] = field(default_factory=list)
+    line_number: int = 1
+    
+    @property
+    def name(self) -> Optional[str]:
+        """Názov príkladu - prvý riadok hlavičky, rovnako ako vo frontende."""
+        return self.header[0] if self.header else None
+    
+    @property
+    def is_positive(self) -> bool:
+        """Príklad je negatívny len vtedy, ak to hlavička explicitne uvádza."""
+        return is_positive_name(self.name)
+
+def is_positive_name(name: Optional[str]) -> bool:
+    """
+    Určí z názvu príkladu (prvého riadku hlavičky), či je príklad pozitívny.
+    
+    Pravidlo zodpovedá frontendu: negatívny je len príklad, ktorého názov
+    obsahuje slovo "negatívny" a neobsahuje "pozitívny".
+    """
+    name = (name or "").lower()
+    return "pozitívny" in name or "negatívny" not in name
+
+def split_example_header(lines: List[str]) -> Tuple[List[str], str]:
+    """
+    Oddelí hlavičkový komentár bloku od textu formuly.
+    
+    Args:
+        lines: Riadky jedného bloku datasetu
         
-        # Hľadáme predikáty v tokene
-        matches = re.findall(predicate_pattern, token)
+    Returns:
+        Dvojica (riadky hlavičky bez znaku '#', text formuly)
+    """
+    header = []
+    position = 0
+    while position < len(lines) and lines[position].lstrip().startswith(('#', '%')):
+        line = lines[position].strip().lstrip('#%').strip()
+        if line:
+            header.append(line)
+        position += 1
+    
+    return header, "".join(lines[position:]).strip()
+
+def build_dataset_example(index: int, lines: List[str], line_number: int) -> Optional[DatasetExample]:
+    """
+    Vytvorí príklad z riadkov jedného bloku datasetu.
+    
+    Úvodné riadky komentára tvoria hlavičku, zvyšok bloku je formula.
+    Blok zložený len z komentárov (napr. legenda na začiatku súboru) sa preskočí.
+    """
+    header, text = split_example_header(lines)
+    if not text:
+        return None
+    
+    try:
+        formula = parse_pl1_formula(text)
+    except ValueError as e:
+        raise ValueError(f"Chyba v príklade na riadku {line_number}: {str(e)}") from e
+    
+    return DatasetExample(
+        index=index,
+        formula=formula,
+        text=text,
+        header=header,
+        line_number=line_number
+    )
+
+def iter_pl1_blocks(fileobj: Iterable[Union[str, bytes]]) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Postupne číta dataset po riadkoch a vracia bloky oddelené prázdnymi riadkami.
+    
+    Bloky sa neparsujú, takže chyba vo formule jedného bloku nezastaví
+    čítanie ďalších.
+    
+    Args:
+        fileobj: Otvorený súbor (textový alebo binárny v UTF-8) alebo iný iterátor riadkov
         
-        for match in matches:
-            pred_name = match[0].strip()
-            args_str = match[1].strip()
-            
-            # Rozdelenie argumentov
-            if args_str:
-                # Odstránime úvodzovky z argumentov, ak existujú
-                args = []
-                for arg in args_str.split(','):
-                    arg = arg.strip()
-                    if arg.startswith('"') and arg.endswith('"'):
-                        arg = arg[1:-1]
-                    elif arg.startswith("'") and arg.endswith("'"):
-                        arg = arg[1:-1]
-                    args.append(arg)
-            else:
-                args = []
-            
-            try:
-                # Vytvorenie predikátu
-                pred = Predicate(pred_name, args)
-                predicates.add(pred)
-            except Exception as e:
-                print(f"Chyba pri vytváraní predikátu {pred_name}({args_str}): {str(e)}")
-    
-    if not predicates:
-        # Skúsime alternatívny prístup - hľadáme všetky predikáty v celom texte
-        all_matches = re.findall(r'([^\s(]+)\s*\(\s*([^)]*)\s*\)', text)
+    Yields:
+        Dvojice (číslo riadku začiatku bloku od 1, riadky bloku)
+    """
+    block = []
+    block_start = 1
+    
+    for line_number, line in enumerate(fileobj, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
         
-        for match in all_matches:
-            pred_name = match[0].strip()
-            args_str = match[1].strip()
-            
-            if args_str:
-                args = [arg.strip() for arg in args_str.split(',')]
-            else:
-                args = []
-            
-            try:
-                pred = Predicate(pred_name, args)
-                predicates.add(pred)
-            except Exception as e:
-                print(f"Chyba pri vytváraní predikátu {pred_name}({args_str}): {str(e)}")
+        if line.strip():
+            if not block:
+                block_start = line_number
+            block.append(line)
+            continue
+        
+        if block:
+            yield block_start, block
+            block = []
     
-    if not predicates:
-        raise ValueError("Neboli nájdené žiadne platné predikáty vo formule")
+    if block:
+        yield block_start, block
+
+def iter_pl1_dataset(fileobj: Iterable[Union[str, bytes]]) -> Iterator[DatasetExample]:
+    """
+    Postupne číta dataset po riadkoch a vracia príklady hneď, ako narazí na ich koniec.
+    
+    Príklady sú oddelené prázdnymi riadkami. V pamäti sa drží vždy len aktuálny
+    blok, takže aj viacgigabajtové súbory .pl1 je možné spracovať bez ich
+    načítania celých naraz.
     
-    # Vytvorenie formuly
-    return Formula(predicates=predicates)
+    Args:
+        fileobj: Otvorený súbor (textový alebo binárny v UTF-8) alebo iný iterátor riadkov
+        
+    Yields:
+        DatasetExample pre každý blok obsahujúci formulu
+    """
+    index = 0
+    for block_start, block in iter_pl1_blocks(fileobj):
+        example = build_dataset_example(index, block, block_start)
+        if example is not None:
+            index += 1
+            yield example
 
 def parse_pl1_dataset(text: str) -> List[Formula]:
     """
     Parsuje text obsahujuci viacero formul oddelených prázdnymi riadkami.
     
+    Pre veľké súbory je vhodnejšie použiť iter_pl1_dataset, ktorý nedrží
+    celý text ani všetky výsledky v pamäti.
+    
     Args:
         text: Text obsahujuci viacero formul
         
     Returns:
         Zoznam formul
     """
-    # Rozdelenie textu na jednotlive formuly
-    formula_texts = re.split(r'\n\s*\n', text)
-    
-    # Parsovanie kazdej formuly
-    formulas = []
-    for formula_text in formula_texts:
-        if formula_text.strip():
-            formula = parse_pl1_formula(formula_text)
-            if formula.predicates:
-                formulas.append(formula)
-    
-    return formulas 
\ No newline at end of file
+    return [example.formula for example in iter_pl1_dataset(io.StringIO(text))]
@@ -0,0 +1,212 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.model import ClassificationTree
+
+def _bit_ids(bits: int) -> Iterator[int]:
+    """Prejde čísla nastavených bitov od najnižšieho."""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+class Taxonomy(ClassificationTree):
+    """
+    Taxonómia tried s viacnásobnou dedičnosťou (acyklický graf).
+    
+    Trieda môže mať viac rodičov. Každá trieda má číslo (bit) a množinu
+    predkov aj potomkov uloženú ako bitovú množinu (Python int, trieda
+    vrátane seba), takže test podtriedy, spoloční predkovia aj všetky
+    triedy pod danou triedou sú bitové operácie. Množiny sa pri pridaní
+    vzťahu doplnia len pre dotknuté triedy.
+    
+    Na stromových vstupoch sa is_subclass, find_common_ancestor, get_parent
+    a get_children správajú rovnako ako v ClassificationTree. parent_map
+    obsahuje prvého rodiča triedy, všetci rodičia sú v parents_map.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.parents_map: Dict[str, List[str]] = {}  # Mapa trieda -> zoznam rodičov v poradí pridania
+        self._class_ids: Dict[str, int] = {}
+        self._classes: List[str] = []
+        self._ancestor_bits: List[int] = []  # Predkovia triedy vrátane nej samej
+        self._descendant_bits: List[int] = []  # Potomkovia triedy vrátane nej samej
+    
+    def _class_id(self, class_name: str) -> int:
+        class_id = self._class_ids.get(class_name)
+        if class_id is None:
+            class_id = len(self._classes)
+            self._class_ids[class_name] = class_id
+            self._classes.append(class_name)
+            self._ancestor_bits.append(1 << class_id)
+            self._descendant_bits.append(1 << class_id)
+        return class_id
+    
+    def _names(self, bits: int) -> List[str]:
+        return [self._classes[class_id] for class_id in _bit_ids(bits)]
+    
+    def add_relationship(self, child: str, parent: Optional[str]) -> None:
+        """
+        Pridá vzťah rodič-dieťa do taxonómie.
+        
+        Na rozdiel od ClassificationTree nový rodič pôvodného rodiča nenahradí,
+        ale pribudne k nemu.
+        
+        Parametre:
+            child: Názov detskej triedy
+            parent: Názov rodičovskej triedy, alebo None ak je to koreňová trieda
+        
+        Raises:
+            ValueError: Ak by vzťah vytvoril cyklus
+        """
+        self.version += 1
+        self._class_id(child)
+        self.parents_map.setdefault(child, [])
+        if parent is None:
+            self.parent_map.setdefault(child, None)
+        else:
+            self._add_parent(child, parent)
+    
+    def _add_parent(self, child: str, parent: str) -> None:
+        child_id = self._class_id(child)
+        parent_id = self._class_id(parent)
+        if (self._ancestor_bits[parent_id] >> child_id) & 1:
+            raise ValueError(f"Vzťah {child} -> {parent} by vytvoril cyklus v taxonómii")
+        
+        parents = self.parents_map.setdefault(child, [])
+        if parent in parents:
+            return
+        parents.append(parent)
+        if self.parent_map.get(child) is None:
+            self.parent_map[child] = parent
+        
+        children = self.children_map.setdefault(parent, [])
+        if child not in children:
+            children.append(child)
+        
+        # Potomkovia child získajú predkov parent a naopak
+        ancestors = self._ancestor_bits[parent_id]
+        descendants = self._descendant_bits[child_id]
+        for class_id in _bit_ids(descendants):
+            self._ancestor_bits[class_id] |= ancestors
+        for class_id in _bit_ids(ancestors):
+            self._descendant_bits[class_id] |= descendants
+    
+    def add_union_class(self, union_class: str, component_classes: List[str]) -> None:
+        """
+        Vytvorí novú triedu, ktorá je zjednotením existujúcich tried.
+        
+        Zjednotená trieda sa stane ďalším rodičom komponentových tried,
+        ich pôvodní rodičia zostanú. Komponent, ktorý je sám spoločným
+        predkom ostatných, sa pod zjednotenú triedu nepridá (vznikol by cyklus).
+        
+        Parametre:
+            union_class: Názov novej zjednotenej triedy
+            component_classes: Zoznam tried, ktoré tvoria zjednotenie
+        """
+        common_ancestor = None
+        if len(component_classes) > 1:
+            common_ancestor = self.find_common_ancestor(component_classes[0], component_classes[1])
+            for component in component_classes[2:]:
+                if common_ancestor is None:
+                    break
+                common_ancestor = self.find_common_ancestor(common_ancestor, component)
+        
+        self.add_relationship(union_class, common_ancestor)
+        union_id = self._class_ids[union_class]
+        for component in component_classes:
+            component_id = self._class_id(component)
+            if (self._ancestor_bits[union_id] >> component_id) & 1:
+                continue
+            self.parents_map.setdefault(component, [])
+            self._add_parent(component, union_class)
+        self.version += 1
+    
+    def get_parents(self, class_name: str) -> List[str]:
+        """Vráti všetkých rodičov triedy v poradí pridania."""
+        return self.parents_map.get(class_name, [])
+    
+    def is_subclass(self, child: str, parent: str) -> bool:
+        """
+        Skontroluje, či je jedna trieda podtriedou druhej (cez ktoréhokoľvek rodiča).
+        
+        Parametre:
+            child: Názov potenciálnej podtriedy
+            parent: Názov potenciálnej nadtriedy
+        
+        Návratová hodnota:
+            True ak je child podtriedou parent, inak False
+        """
+        if child == parent:
+            return True
+        if child not in self.parent_map:
+            return False
+        parent_id = self._class_ids.get(parent)
+        return parent_id is not None and (self._ancestor_bits[self._class_ids[child]] >> parent_id) & 1 == 1
+    
+    def ancestors(self, class_name: str) -> List[str]:
+        """Vráti všetkých predkov triedy (bez nej samej)."""
+        class_id = self._class_ids.get(class_name)
+        if class_id is None:
+            return []
+        return self._names(self._ancestor_bits[class_id] & ~(1 << class_id))
+    
+    def descendants(self, class_name: str) -> List[str]:
+        """Vráti všetky triedy pod danou triedou (bez nej samej)."""
+        class_id = self._class_ids.get(class_name)
+        if class_id is None:
+            return []
+        return self._names(self._descendant_bits[class_id] & ~(1 << class_id))
+    
+    def common_ancestors(self, class1: str, class2: str) -> List[str]:
+        """
+        Vráti všetky spoločné nadtriedy dvoch tried (trieda je sama sebe nadtriedou).
+        """
+        if class1 not in self._class_ids or class2 not in self._class_ids:
+            return []
+        return self._names(self._ancestor_bits[self._class_ids[class1]] & self._ancestor_bits[self._class_ids[class2]])
+    
+    def find_common_ancestor(self, class1: str, class2: str) -> Optional[str]:
+        """
+        Nájde najbližšieho spoločného predka dvoch tried.
+        
+        Ak je najbližších predkov viac (rôzne vetvy dedičnosti), vráti toho,
+        ku ktorému sa od class1 dá dostať najskôr (prehľadávanie do šírky cez
+        rodičov v poradí pridania).
+        
+        Parametre:
+            class1: Názov prvej triedy
+            class2: Názov druhej triedy
+        
+        Návratová hodnota:
+            Názov najbližšieho spoločného predka, alebo None ak neexistuje
+        """
+        if class1 not in self.parent_map or class2 not in self.parent_map:
+            return None
+        if class1 == class2:
+            return class1
+        
+        common = self._ancestor_bits[self._class_ids[class1]] & self._ancestor_bits[self._class_ids[class2]]
+        if not common:
+            return None
+        # Najnižší spoloční predkovia nemajú pod sebou iného spoločného predka
+        lowest = [class_id for class_id in _bit_ids(common) if self._descendant_bits[class_id] & common == 1 << class_id]
+        if len(lowest) == 1:
+            return self._classes[lowest[0]]
+        
+        lowest_bits = sum(1 << class_id for class_id in lowest)
+        queue = [class1]
+        # Trieda dosiahnuteľná viacerými cestami (diamant) sa do frontu pridá raz
+        seen = {class1}
+        for class_name in queue:
+            if (lowest_bits >> self._class_ids[class_name]) & 1:
+                return class_name
+            for parent in self.parents_map.get(class_name, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    queue.append(parent)
+        return None
+    
+    def find_common_ancestors(self, pairs: Iterable[Tuple[str, str]]) -> List[Optional[str]]:
+        """Nájde najbližšieho spoločného predka pre každú dvojicu tried."""
+        return [self.find_common_ancestor(class1, class2) for class1, class2 in pairs]
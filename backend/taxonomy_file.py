@@ -0,0 +1,350 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import gc
+import marshal
+import os
+import re
+import struct
+
+from backend.model import ClassificationTree
+from backend.taxonomy import Taxonomy
+from backend.dataset_cache import content_hash, prune_cache_dir
+from backend.logs import get_logger
+
+log = get_logger("parser")
+
+# Verzia formátu - pri zmene rozloženia skompilovanej taxonómie ju treba zvýšiť
+TAXONOMY_CACHE_VERSION = 1
+TAXONOMY_CACHE_SUFFIX = ".pl1t"
+
+# V súbore .pl1 sú triedy v komentároch "% class Child < Parent" (napr. v úvodnej legende)
+PL1_CLASS_DIRECTIVE = "class"
+
+# Hlavička: magic, verzia formátu, verzia marshal, hash obsahu, druh stromu, počet tried, dĺžka dát
+_HEADER = struct.Struct("<4sHH32sBIQ")
+_MAGIC = b"PL1T"
+
+_KIND_TREE = 0  # ClassificationTree s Euler-tour uzáverom a skokmi pre LCA
+_KIND_TAXONOMY = 1  # Taxonomy (viacnásobná dedičnosť) s bitovými množinami predkov
+
+_CLASS_NAME = re.compile(r"[^\s<,#%]+")
+
+class TaxonomyFileError(ValueError):
+    """Súbor taxonómie má chybnú syntax alebo obsahuje cyklus."""
+
+def parse_taxonomy(text: str, pl1: bool = False) -> List[Tuple[str, Optional[str]]]:
+    """
+    Prečíta vzťahy tried z textu taxonómie.
+    
+    Každý riadok je "Child" (trieda bez rodiča) alebo "Child < Parent",
+    prípadne "Child < Parent1, Parent2" pri viacnásobnej dedičnosti.
+    Text za '#' je komentár. V súbore .pl1 (pl1=True) sa čítajú len riadky
+    "% class ..." a ostatný obsah súboru sa ignoruje.
+    
+    Args:
+        text: Obsah súboru
+        pl1: True pre súbor datasetu .pl1
+    
+    Returns:
+        Dvojice (trieda, rodič alebo None) v poradí súboru
+    
+    Raises:
+        TaxonomyFileError: Pri neplatnom riadku
+    """
+    edges = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if pl1:
+            line = line.strip()
+            if not line.startswith('%'):
+                continue
+            directive, _, line = line.lstrip('%').strip().partition(' ')
+            if directive != PL1_CLASS_DIRECTIVE:
+                continue
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        
+        child, separator, parents = line.partition('<')
+        child = child.strip()
+        names = [child] + ([parent.strip() for parent in parents.split(',')] if separator else [])
+        if not all(_CLASS_NAME.fullmatch(name) for name in names):
+            raise TaxonomyFileError(f"Neplatný riadok taxonómie {line_number}: {line}")
+        
+        if separator:
+            edges.extend((child, parent) for parent in names[1:])
+        else:
+            edges.append((child, None))
+    return edges
+
+def build_taxonomy(edges: List[Tuple[str, Optional[str]]]) -> ClassificationTree:
+    """
+    Zostaví strom tried zo vzťahov a predpočíta jeho uzáver predkov.
+    
+    Ak má niektorá trieda viac rodičov, vznikne Taxonomy, inak
+    ClassificationTree. Trieda bez rodiča ("Child") triedu len deklaruje,
+    rodiča uvedeného na inom riadku neodstráni.
+    
+    Raises:
+        TaxonomyFileError: Ak vzťahy obsahujú cyklus
+    """
+    parents_of = {}
+    for child, parent in edges:
+        if parent is not None:
+            parents_of.setdefault(child, set()).add(parent)
+    
+    if any(len(parents) > 1 for parents in parents_of.values()):
+        taxonomy = Taxonomy()
+        try:
+            for child, parent in edges:
+                taxonomy.add_relationship(child, parent)
+        except ValueError as e:
+            raise TaxonomyFileError(str(e)) from e
+        return taxonomy
+    
+    # Mapy sa skladajú priamo - add_relationship kontroluje duplicitu detí
+    # prechodom zoznamu, čo je pri široko rozvetvených taxonómiách kvadratické
+    tree = ClassificationTree()
+    children = {}
+    for child, parent in edges:
+        if parent is None:
+            tree.parent_map.setdefault(child, None)
+        else:
+            tree.parent_map[child] = parent
+            children.setdefault(parent, {})[child] = None
+    tree.children_map = {parent: list(parent_children) for parent, parent_children in children.items()}
+    tree.version += 1
+    
+    tour = tree._ancestor_closure()
+    if len(tour) != len(tree.parent_map.keys() | children.keys()):
+        in_cycle = next(class_name for class_name in tree.parent_map if class_name not in tour)
+        raise TaxonomyFileError(f"Trieda {in_cycle} je v cykle rodičov")
+    return tree
+
+def _pack(values: Iterable[int]) -> bytes:
+    return array("q", values).tobytes()
+
+def _unpack(data: bytes) -> array:
+    values = array("q")
+    values.frombytes(data)
+    return values
+
+def _pack_lists(lists: Iterable[List[int]]) -> Tuple[bytes, bytes]:
+    """Zbalí zoznamy čísel do dvojice (konce zoznamov, všetky čísla za sebou)."""
+    ends = []
+    flat = []
+    for values in lists:
+        flat.extend(values)
+        ends.append(len(flat))
+    return _pack(ends), _pack(flat)
+
+def _unpack_lists(packed: Tuple[bytes, bytes], classes: List[str]) -> Iterator[List[str]]:
+    ends, flat = _unpack(packed[0]), _unpack(packed[1])
+    start = 0
+    for end in ends:
+        yield [classes[class_id] for class_id in flat[start:end]]
+        start = end
+
+class _StoredJumps(dict):
+    """
+    Skoky pre LCA (_tour_jumps) načítané z cache.
+    
+    Zoznam predkov triedy sa vytvorí až pri prvom dotaze na ňu - pri veľkej
+    taxonómii by vytvorenie všetkých zoznamov trvalo dlhšie než celé načítanie.
+    """
+    
+    def __init__(self, classes: List[str], class_ids: Dict[str, int], packed: Tuple[bytes, bytes]):
+        super().__init__()
+        self._classes = classes
+        self._class_ids = class_ids
+        self._ends = _unpack(packed[0])
+        self._flat = _unpack(packed[1])
+    
+    def __missing__(self, class_name: str) -> List[str]:
+        class_id = self._class_ids[class_name]
+        start = self._ends[class_id - 1] if class_id else 0
+        jumps = [self._classes[ancestor] for ancestor in self._flat[start:self._ends[class_id]]]
+        self[class_name] = jumps
+        return jumps
+
+def _encode_tree(tree: ClassificationTree) -> Tuple[int, List[str], Any]:
+    """
+    Prevedie strom aj s uzáverom na čísla tried zbalené do bajtov (array).
+    
+    Returns:
+        Trojica (druh stromu, názvy tried, dáta pre marshal)
+    """
+    if isinstance(tree, Taxonomy):
+        classes = tree._classes
+    else:
+        classes = list(tree._ancestor_closure())
+    ids = {class_name: class_id for class_id, class_name in enumerate(classes)}
+    
+    maps = (
+        _pack(ids[child] for child in tree.parent_map),
+        _pack(-1 if parent is None else ids[parent] for parent in tree.parent_map.values()),
+        _pack(ids[parent] for parent in tree.children_map),
+        _pack_lists([ids[child] for child in children] for children in tree.children_map.values()),
+    )
+    if isinstance(tree, Taxonomy):
+        parents = (
+            _pack(ids[child] for child in tree.parents_map),
+            _pack_lists([ids[parent] for parent in parents] for parents in tree.parents_map.values()),
+        )
+        return _KIND_TAXONOMY, classes, (maps, parents, tree._ancestor_bits, tree._descendant_bits)
+    
+    tour = tree._tour
+    closure = (
+        _pack(tour[class_name][0] for class_name in classes),
+        _pack(tour[class_name][1] for class_name in classes),
+        _pack(tree._tour_last[class_name] for class_name in classes),
+        _pack_lists([ids[ancestor] for ancestor in tree._tour_jumps[class_name]] for class_name in classes),
+        tree._tour_end,
+    )
+    return _KIND_TREE, classes, (maps, closure)
+
+def _decode_tree(kind: int, classes: List[str], data: Any) -> ClassificationTree:
+    """Obnoví strom z výstupu _encode_tree bez prepočítania uzáveru."""
+    child_ids, parent_ids, children_keys, children = data[0]
+    tree = Taxonomy() if kind == _KIND_TAXONOMY else ClassificationTree()
+    tree.parent_map = {
+        classes[child_id]: None if parent_id < 0 else classes[parent_id]
+        for child_id, parent_id in zip(_unpack(child_ids), _unpack(parent_ids))
+    }
+    tree.children_map = dict(zip((classes[parent_id] for parent_id in _unpack(children_keys)),
+                                 _unpack_lists(children, classes)))
+    tree.version = 1
+    class_ids = {class_name: class_id for class_id, class_name in enumerate(classes)}
+    
+    if kind == _KIND_TAXONOMY:
+        (parents_keys, parents), tree._ancestor_bits, tree._descendant_bits = data[1:]
+        tree.parents_map = dict(zip((classes[child_id] for child_id in _unpack(parents_keys)),
+                                    _unpack_lists(parents, classes)))
+        tree._classes = classes
+        tree._class_ids = class_ids
+        return tree
+    
+    enters, exits, lasts, jumps, tour_end = data[1]
+    tree._tour = dict(zip(classes, zip(_unpack(enters), _unpack(exits))))
+    tree._tour_last = dict(zip(classes, _unpack(lasts)))
+    tree._tour_jumps = _StoredJumps(classes, class_ids, jumps)
+    tree._tour_end = tour_end
+    tree._closure_version = tree.version
+    return tree
+
+def taxonomy_cache_path(cache_dir: str, key: bytes) -> str:
+    """Vráti cestu k skompilovanej taxonómii pre daný hash obsahu."""
+    return os.path.join(cache_dir, key.hex() + TAXONOMY_CACHE_SUFFIX)
+
+def save_compiled_taxonomy(path: str, key: bytes, tree: ClassificationTree) -> bool:
+    """
+    Uloží strom tried aj s uzáverom predkov a tabuľkami pre LCA do súboru .pl1t.
+    
+    Args:
+        path: Cesta k súboru cache
+        key: Hash obsahu zdrojového súboru taxonómie
+        tree: ClassificationTree bez cyklov alebo Taxonomy
+    
+    Returns:
+        True, ak sa cache podarilo uložiť
+    """
+    kind, classes, data = _encode_tree(tree)
+    payload = marshal.dumps((classes, data))
+    
+    temp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, TAXONOMY_CACHE_VERSION, marshal.version, key, kind,
+                                 len(classes), len(payload)))
+            f.write(payload)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+    
+    prune_cache_dir(os.path.dirname(path), TAXONOMY_CACHE_SUFFIX)
+    return True
+
+def load_compiled_taxonomy(path: str, key: bytes) -> Optional[ClassificationTree]:
+    """
+    Načíta skompilovanú taxonómiu zo súboru .pl1t.
+    
+    Returns:
+        Strom tried s platným uzáverom, alebo None ak cache neexistuje,
+        je zastaraná alebo poškodená (vtedy ju treba prebudovať)
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, version, marshal_version, stored_key, kind, count, payload_size = _HEADER.unpack(header)
+            if (magic != _MAGIC or version != TAXONOMY_CACHE_VERSION or
+                    marshal_version != marshal.version or stored_key != key):
+                return None
+            
+            payload = f.read(payload_size)
+            if len(payload) != payload_size:
+                return None
+        
+        # Pri hromadnom vytváraní slovníkov by cyklický GC opakovane prechádzal
+        # všetko doteraz načítané, preto sa počas dekódovania pozastaví
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            classes, data = marshal.loads(payload)
+            if len(classes) != count:
+                return None
+            tree = _decode_tree(kind, classes, data)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    except (OSError, EOFError, ValueError, TypeError, IndexError, KeyError):
+        return None
+    
+    # Obnovená časová pečiatka - pri čistení cache sa súbor považuje za nedávno použitý
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    
+    return tree
+
+def load_taxonomy(path: str, cache_dir: Optional[str] = None) -> ClassificationTree:
+    """
+    Načíta taxonómiu zo súboru (zoznam vzťahov alebo hlavička .pl1).
+    
+    Ak je zadaný cache_dir, skompilovaný strom sa hľadá podľa hashu obsahu
+    súboru a po zostavení sa uloží, takže pri ďalšom štarte sa taxonómia
+    načíta bez skladania vzťahov a prepočtu uzáveru.
+    
+    Args:
+        path: Cesta k súboru taxonómie (.pl1 alebo textový zoznam vzťahov)
+        cache_dir: Adresár skompilovaných taxonómií (None = bez cache)
+    
+    Returns:
+        ClassificationTree, alebo Taxonomy ak má niektorá trieda viac rodičov
+    
+    Raises:
+        TaxonomyFileError: Pri chybe syntaxe alebo cykle
+        OSError: Pri chybe čítania súboru
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    pl1 = path.endswith(".pl1")
+    
+    key = content_hash(["pl1" if pl1 else "edges", text])
+    if cache_dir is not None:
+        cached_path = taxonomy_cache_path(cache_dir, key)
+        tree = load_compiled_taxonomy(cached_path, key)
+        if tree is not None:
+            log.debug("Taxonómia %s načítaná zo skompilovanej cache", path)
+            return tree
+    
+    tree = build_taxonomy(parse_taxonomy(text, pl1))
+    if cache_dir is not None and not save_compiled_taxonomy(cached_path, key, tree):
+        log.warning("Skompilovanú taxonómiu %s sa nepodarilo uložiť", path)
+    return tree
@@ -0,0 +1,106 @@
+from backend.model import Model, Object, Link, LinkType, is_valid_example
+from backend.array_model import ArrayModel, convert_model, numpy_available
+from backend.learner import WinstonLearner
+from test_heuristics import (
+    initialize_tree, create_high_end_phone, create_mid_range_phone, create_budget_phone,
+    create_laptop_with_numeric_attributes, create_laptop_variant
+)
+import copy
+import time
+
+def test_interface():
+    """Overí, že ArrayModel sa správa rovnako ako Model."""
+    model = ArrayModel(
+        objects=[Object("car", "X5"), Object("engine", "PetrolEngine", {"power": 250})],
+        links=[Link("car", "engine"), Link("car", "X5", LinkType.MUST_BE_A)]
+    )
+    assert model.get_object("engine").attributes == {"power": 250}
+    assert model.get_object("car").attributes is None
+    assert model.has_link(Link("car", "engine"))
+    assert model.links_from("car") == [Link("car", "engine"), Link("car", "X5", LinkType.MUST_BE_A)]
+    
+    model.add_link(Link("engine", "car", LinkType.MUST))
+    model.add_link(Link("engine", "car", LinkType.MUST))
+    assert len(model.links) == 3
+    model.remove_link(Link("car", "engine"))
+    assert not model.has_link(Link("car", "engine"))
+    
+    model.update_object_class("car", "BMW")
+    assert model.get_object("car").class_name == "BMW"
+    assert model.has_link(Link("car", "BMW", LinkType.MUST_BE_A))
+    
+    model.set_attribute_interval("engine", "power", (200, 300))
+    assert model.get_attribute_value("engine", "power") == (200, 300)
+    
+    model.objects.append(Object("wheel", "Wheel"))
+    removed = model.objects.pop(0)
+    assert removed == Object("car", "BMW")
+    assert not model.has_object("car")
+    assert model.get_object("wheel") == Object("wheel", "Wheel")
+    
+    # Obe implementácie sú zameniteľné a porovnateľné
+    assert convert_model(model, "list") == model
+    assert convert_model(convert_model(model, "list"), "array") == model
+    assert copy.deepcopy(model) == model
+    print("Rozhranie ArrayModel: OK")
+
+def test_copy():
+    """Overí, že kópia nevidí zmeny originálu ani meniteľných hodnôt atribútov."""
+    model = ArrayModel(objects=[Object("proc", "CPU", {"cores": {4, 8}})])
+    snapshot = model.copy()
+    proc = model.writable_object(model.get_object("proc"))
+    proc.attributes["cores"].add(16)
+    proc.class_name = "GPU"
+    assert snapshot.get_object("proc") == Object("proc", "CPU", {"cores": {4, 8}})
+    assert model.get_object("proc") == Object("proc", "GPU", {"cores": {4, 8, 16}})
+    print("Kópia ArrayModel: OK")
+
+def run_learner(backend):
+    """Prejde niekoľko krokov učenia s modelom zadanej implementácie."""
+    tree = initialize_tree()
+    learner = WinstonLearner(tree)
+    model = convert_model(Model(objects=[], links=[]), backend)
+    steps = [
+        (create_high_end_phone(), None),
+        (create_high_end_phone(), create_mid_range_phone()),
+        (create_mid_range_phone(), create_budget_phone()),
+        (create_laptop_with_numeric_attributes(), None),
+        (create_laptop_variant(), None)
+    ]
+    for good, near_miss in steps:
+        model = learner.update_model(model, convert_model(good, backend),
+                                     convert_model(near_miss, backend) if near_miss else None)
+    return model, tree
+
+def test_learner_parity():
+    """Overí, že učenie dá rovnaký model s oboma implementáciami."""
+    list_model, tree = run_learner("list")
+    array_model, _ = run_learner("array")
+    assert array_model == list_model
+    
+    example = create_budget_phone()
+    assert (is_valid_example(convert_model(array_model, "array"), example, tree)
+            == is_valid_example(list_model, example, tree))
+    print("Zhoda učenia s Model a ArrayModel: OK")
+
+def benchmark(size=5000, rounds=50):
+    """Porovná čas kópie a vyhľadávania v oboch implementáciách na väčšom modeli."""
+    objects = [Object(f"o{i}", f"C{i % 50}", {"value": i}) for i in range(size)]
+    links = [Link(f"o{i}", f"o{(i * 7) % size}") for i in range(size)]
+    for backend in ("list", "array"):
+        model = convert_model(Model(objects=objects, links=links), backend)
+        start = time.perf_counter()
+        for i in range(0, size, size // rounds):
+            copied = model.copy()
+            copied.has_link(Link(f"o{i}", f"o{(i * 7) % size}"))
+            copied.get_object(f"o{i}")
+        print(f"{backend}: {rounds}x copy + has_link + get_object {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    if not numpy_available():
+        print("NumPy nie je nainštalovaná - test ArrayModel preskočený")
+    else:
+        test_interface()
+        test_copy()
+        test_learner_parity()
+        benchmark()
@@ -0,0 +1,107 @@
+from backend.batch_compare import BatchExample, iter_batch_examples, compare_examples
+from backend.model import Model, Object, Link, LinkType, ClassificationTree, is_valid_example
+from backend.pl1_parser import parse_pl1_formula
+from backend.ingest import ParseCache
+from backend.domains import Interval
+import time
+
+DATASET = """# Legenda - blok len z komentárov sa preskočí
+
+# Pozitívny príklad: X5
+Ι(c, X5) ∧ Π(c, e) ∧ Ι(e, PetrolEngine) ∧ Α(e, power, 250)
+
+# Negatívny príklad: slabý motor
+Ι(c, X5) ∧ Π(c, e) ∧ Ι(e, DieselEngine) ∧ Α(e, power, 90)
+
+# Pozitívny príklad: chybná formula
+toto nie je formula
+
+Ι(c, Series3) ∧ Π(c, e) ∧ Ι(e, HybridEngine) ∧ Α(e, power, 200)
+"""
+
+def formula_to_model(formula):
+    """Zjednodušená konverzia symbolických predikátov Ι, Π a Α (ako v backend.app)."""
+    predicates = formula.get_all_predicates()
+    objects = {}
+    for predicate in predicates:
+        if predicate.name == "Ι":
+            objects.setdefault(predicate.arguments[0], Object(predicate.arguments[0], predicate.arguments[1]))
+    links = []
+    for predicate in predicates:
+        if predicate.name == "Π" and all(name in objects for name in predicate.arguments):
+            links.append(Link(predicate.arguments[0], predicate.arguments[1]))
+        elif predicate.name == "Α" and predicate.arguments[0] in objects:
+            obj_name, attr_name, value = predicate.arguments
+            obj = objects[obj_name]
+            obj.attributes = {**(obj.attributes or {}), attr_name: int(value) if value.isdigit() else value}
+    return Model(objects=list(objects.values()), links=links)
+
+def build_tree():
+    tree = ClassificationTree()
+    for child, parent in [("Vehicle", None), ("BMW", "Vehicle"), ("X5", "BMW"), ("Series3", "BMW"),
+                          ("Engine", None), ("PetrolEngine", "Engine"), ("DieselEngine", "Engine"),
+                          ("HybridEngine", "Engine")]:
+        tree.add_relationship(child, parent)
+    return tree
+
+def build_model():
+    return Model(
+        objects=[Object("c", "BMW"), Object("e", "Engine", {"power": Interval(150, 300)})],
+        links=[Link("c", "e", LinkType.MUST)]
+    )
+
+def test_batch_examples():
+    """Overí rozdelenie textu .pl1 na príklady a ich názvy."""
+    examples = list(iter_batch_examples(DATASET))
+    assert [example.name for example in examples] == [
+        "Pozitívny príklad: X5", "Negatívny príklad: slabý motor", "Pozitívny príklad: chybná formula", None
+    ]
+    assert [example.is_positive for example in examples] == [True, False, True, True]
+    assert examples[0].text.startswith("Ι(c, X5)")
+    print("Rozdelenie dávky: OK")
+
+def test_compare_examples():
+    """Overí výsledky dávky oproti is_valid_example a súhrn na konci."""
+    tree = build_tree()
+    model = build_model()
+    examples = list(iter_batch_examples(DATASET))
+    records = list(compare_examples(model.matcher(tree), examples, formula_to_model, chunk_size=2))
+    
+    assert [record["index"] for record in records[:-1]] == [0, 1, 2, 3]
+    assert "error" in records[2] and "is_valid" not in records[2]
+    for record, example in zip(records, examples):
+        if "error" not in record:
+            expected = is_valid_example(model, formula_to_model(parse_pl1_formula(example.text)), tree)
+            assert (record["is_valid"], record["differences"]) == expected
+    assert [record.get("is_valid") for record in records[:-1]] == [True, False, None, True]
+    
+    summary = records[-1]
+    assert summary["summary"] and summary["total"] == 4 and summary["errors"] == 1
+    assert summary["valid"] == 2 and summary["invalid"] == 1 and summary["matching_expected"] == 3
+    
+    # Prázdna dávka vráti len súhrn
+    assert [record["total"] for record in compare_examples(model.matcher(tree), [], formula_to_model)] == [0]
+    print("Dávkové porovnanie: OK")
+
+def benchmark(count=3000):
+    """Porovná dávku s porovnávaním príkladov po jednom (parsovanie + is_valid_example)."""
+    tree = build_tree()
+    model = build_model()
+    examples = [
+        BatchExample(text=f"Ι(c, X5) ∧ Π(c, e) ∧ Ι(e, PetrolEngine) ∧ Α(e, power, {100 + i % 50 * 5})")
+        for i in range(count)
+    ]
+    
+    start = time.perf_counter()
+    single = [is_valid_example(model, formula_to_model(parse_pl1_formula(example.text)), tree) for example in examples]
+    print(f"Po jednom: {time.perf_counter() - start:.3f}s")
+    
+    start = time.perf_counter()
+    records = list(compare_examples(model.matcher(tree), examples, formula_to_model, cache=ParseCache()))
+    print(f"Dávka: {time.perf_counter() - start:.3f}s ({records[-1]['examples_per_second']} príkladov/s)")
+    assert [(record["is_valid"], record["differences"]) for record in records[:-1]] == single
+
+if __name__ == "__main__":
+    test_batch_examples()
+    test_compare_examples()
+    benchmark()
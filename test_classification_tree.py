@@ -0,0 +1,323 @@
+from backend.model import ClassificationTree
+from backend.taxonomy import Taxonomy
+from backend.taxonomy_file import (parse_taxonomy, build_taxonomy, load_taxonomy, TaxonomyFileError,
+                                   TAXONOMY_CACHE_SUFFIX)
+import os
+import random
+import tempfile
+import time
+
+def walk_is_subclass(tree, child, parent):
+    """Pôvodná implementácia is_subclass prechodom ku koreňu (so zastavením na cykle)."""
+    if child == parent:
+        return True
+    if child not in tree.parent_map:
+        return False
+    current = tree.parent_map.get(child)
+    seen = set()
+    while current and current not in seen:
+        if current == parent:
+            return True
+        seen.add(current)
+        current = tree.parent_map.get(current)
+    return False
+
+def walk_common_ancestor(tree, class1, class2):
+    """Pôvodná implementácia find_common_ancestor porovnaním ciest ku koreňu."""
+    if class1 not in tree.parent_map or class2 not in tree.parent_map:
+        return None
+    path1 = []
+    current = class1
+    while current:
+        path1.append(current)
+        current = tree.parent_map.get(current)
+    current = class2
+    while current:
+        if current in path1:
+            return current
+        current = tree.parent_map.get(current)
+    return None
+
+def check_tree(tree, names, acyclic=True):
+    for child in names:
+        for parent in names:
+            assert tree.is_subclass(child, parent) == walk_is_subclass(tree, child, parent), (child, parent)
+            assert tree.are_related(child, parent) == (walk_is_subclass(tree, child, parent)
+                                                       or walk_is_subclass(tree, parent, child))
+    if acyclic:
+        pairs = [(class1, class2) for class1 in names for class2 in names]
+        assert tree.find_common_ancestors(pairs) == [walk_common_ancestor(tree, *pair) for pair in pairs]
+
+def test_ancestor_closure():
+    """Porovná is_subclass s prechodom stromu pri náhodných zmenách stromu."""
+    rng = random.Random(3)
+    for _ in range(30):
+        tree = ClassificationTree()
+        names = [f"C{i}" for i in range(25)] + ["Unknown"]
+        for step in range(60):
+            action = rng.random()
+            child = rng.choice(names[:-1])
+            if action < 0.1:
+                tree.add_relationship(child, None)
+            elif action < 0.8:
+                parent = rng.choice(names[:-1])
+                # find_common_ancestor (add_union_class) cyklus rodičov nezvláda, preto sa cykly netvoria
+                if not walk_is_subclass(tree, parent, child):
+                    tree.add_relationship(child, parent)
+            else:
+                components = rng.sample(names[:-1], 2)
+                if not walk_is_subclass(tree, *components) and not walk_is_subclass(tree, *components[::-1]):
+                    tree.add_union_class(f"U{step}", components)
+                    names.insert(0, f"U{step}")
+            if step % 7 == 0:
+                check_tree(tree, names)
+        check_tree(tree, names)
+    
+    # Cyklus rodičov: triedy v cykle sa overia prechodom
+    tree = ClassificationTree()
+    for child, parent in [("A", "B"), ("B", "C"), ("C", "A"), ("D", "A"), ("E", None), ("F", "E")]:
+        tree.add_relationship(child, parent)
+    check_tree(tree, ["A", "B", "C", "D", "E", "F", "G"], acyclic=False)
+    assert tree.find_common_ancestor("D", "B") in ("A", "B", "C")
+    assert tree.find_common_ancestor("D", "F") is None
+    print("Uzáver predkov: OK")
+
+def test_incremental_patch():
+    """Overí, že pridávanie listov do platného uzáveru ho neprepočítava."""
+    tree = ClassificationTree()
+    tree.add_relationship("Device", None)
+    tree.add_relationship("Phone", "Device")
+    assert tree.is_subclass("Phone", "Device")
+    
+    for i in range(20):
+        tree.add_relationship(f"Model{i}", "Phone")
+        tree.add_relationship(f"Variant{i}", f"Model{i}")
+    tree.add_relationship("Laptop", None)
+    assert tree._closure_version == tree.version
+    assert tree.is_subclass("Variant7", "Device") and not tree.is_subclass("Variant7", "Model8")
+    assert not tree.is_subclass("Laptop", "Device") and not tree.is_subclass("Device", "Phone")
+    
+    # Presun existujúcej triedy zmení jej podstrom - uzáver sa prepočíta pri dotaze
+    tree.add_relationship("Phone", "Laptop")
+    assert tree._closure_version != tree.version
+    assert tree.is_subclass("Variant7", "Laptop") and not tree.is_subclass("Variant7", "Device")
+    assert tree.find_common_ancestor("Variant7", "Model3") == "Phone"
+    tree.add_relationship("Tablet", "Laptop")
+    assert tree._closure_version == tree.version
+    assert tree.find_common_ancestor("Variant7", "Tablet") == "Laptop"
+    print("Inkrementálna úprava uzáveru: OK")
+
+def test_taxonomy_matches_tree():
+    """Na stromových vstupoch sa Taxonomy správa rovnako ako ClassificationTree."""
+    rng = random.Random(5)
+    for _ in range(20):
+        tree = ClassificationTree()
+        taxonomy = Taxonomy()
+        names = [f"C{i}" for i in range(30)] + ["Unknown"]
+        order = names[:-1]
+        rng.shuffle(order)
+        for i, child in enumerate(order):
+            parent = rng.choice(order[:i]) if i and rng.random() < 0.85 else None
+            tree.add_relationship(child, parent)
+            taxonomy.add_relationship(child, parent)
+        check_tree(taxonomy, names)
+        for class1 in names:
+            assert taxonomy.get_parent(class1) == tree.get_parent(class1)
+            assert taxonomy.get_children(class1) == tree.get_children(class1)
+            for class2 in names:
+                assert taxonomy.is_subclass(class1, class2) == tree.is_subclass(class1, class2)
+                assert taxonomy.find_common_ancestor(class1, class2) == tree.find_common_ancestor(class1, class2)
+        for class_name in names:
+            assert set(taxonomy.descendants(class_name)) == {
+                other for other in names if other != class_name and tree.is_subclass(other, class_name)}
+    print("Taxonómia na strome: OK")
+
+def test_taxonomy_multiple_inheritance():
+    """Overí viacnásobnú dedičnosť, zjednotenie tried a odmietnutie cyklu."""
+    taxonomy = Taxonomy()
+    for child, parent in [("Device", None), ("Phone", "Device"), ("Camera", "Device"),
+                          ("CameraPhone", "Phone"), ("CameraPhone", "Camera"), ("Selfie", "CameraPhone")]:
+        taxonomy.add_relationship(child, parent)
+    assert taxonomy.get_parent("CameraPhone") == "Phone"
+    assert taxonomy.get_parents("CameraPhone") == ["Phone", "Camera"]
+    assert taxonomy.is_subclass("Selfie", "Camera") and taxonomy.is_subclass("Selfie", "Phone")
+    assert not taxonomy.is_subclass("Phone", "Camera")
+    assert taxonomy.ancestors("Selfie") == ["Device", "Phone", "Camera", "CameraPhone"]
+    assert taxonomy.descendants("Camera") == ["CameraPhone", "Selfie"]
+    assert taxonomy.common_ancestors("Selfie", "Camera") == ["Device", "Camera"]
+    assert taxonomy.find_common_ancestor("Selfie", "Camera") == "Camera"
+    assert taxonomy.find_common_ancestor("Phone", "Camera") == "Device"
+    
+    # Dvaja rovnako blízki predkovia - rozhodne poradie rodičov prvej triedy
+    taxonomy.add_relationship("Tablet", "Phone")
+    taxonomy.add_relationship("Tablet", "Camera")
+    assert taxonomy.find_common_ancestor("Tablet", "CameraPhone") == "Phone"
+    assert taxonomy.find_common_ancestors([("Selfie", "Tablet"), ("Device", "Unknown")]) == ["Phone", None]
+    
+    # Reťaz diamantov pod dvoma rovnako blízkymi predkami - každú triedu prejde raz
+    diamonds = Taxonomy()
+    for child, parent in [("Root", None), ("Left", "Root"), ("Right", "Root"),
+                          ("Top", "Left"), ("Top", "Right"), ("Other", "Right"), ("Other", "Left")]:
+        diamonds.add_relationship(child, parent)
+    for level in range(60):
+        upper = "Top" if level == 0 else f"D{level - 1}"
+        diamonds.add_relationship(f"L{level}", upper)
+        diamonds.add_relationship(f"R{level}", upper)
+        diamonds.add_relationship(f"D{level}", f"L{level}")
+        diamonds.add_relationship(f"D{level}", f"R{level}")
+    assert diamonds.find_common_ancestor("D59", "Other") == "Left"
+    
+    # Zjednotenie pridá rodiča, pôvodní rodičia zostanú
+    taxonomy.add_union_class("Handheld", ["Phone", "Camera"])
+    assert taxonomy.get_parent("Handheld") == "Device"
+    assert taxonomy.get_parents("Phone") == ["Device", "Handheld"]
+    assert taxonomy.is_subclass("Selfie", "Handheld") and taxonomy.is_subclass("Phone", "Device")
+    
+    version = taxonomy.version
+    try:
+        taxonomy.add_relationship("Device", "Selfie")
+        assert False, "Cyklus mal byť odmietnutý"
+    except ValueError:
+        pass
+    assert not taxonomy.is_subclass("Device", "Selfie") and taxonomy.version == version + 1
+    print("Viacnásobná dedičnosť: OK")
+
+def same_tree(loaded, built, names):
+    """Porovná načítaný strom so zostaveným vrátane dotazov nad uzáverom."""
+    assert type(loaded) is type(built)
+    assert loaded.parent_map == built.parent_map and list(loaded.parent_map) == list(built.parent_map)
+    assert loaded.children_map == built.children_map
+    pairs = [(class1, class2) for class1 in names for class2 in names]
+    assert [loaded.is_subclass(*pair) for pair in pairs] == [built.is_subclass(*pair) for pair in pairs]
+    assert loaded.find_common_ancestors(pairs) == built.find_common_ancestors(pairs)
+
+def test_taxonomy_file():
+    """Overí načítanie taxonómie zo súboru a zo skompilovanej cache."""
+    text = """
+# Komentár
+Device
+Phone < Device   # telefóny
+Camera < Device
+Smartphone < Phone
+Laptop
+"""
+    edges = parse_taxonomy(text)
+    assert edges == [("Device", None), ("Phone", "Device"), ("Camera", "Device"),
+                     ("Smartphone", "Phone"), ("Laptop", None)]
+    expected = ClassificationTree()
+    for child, parent in edges:
+        expected.add_relationship(child, parent)
+    names = ["Device", "Phone", "Camera", "Smartphone", "Laptop", "Unknown"]
+    built = build_taxonomy(edges)
+    same_tree(built, expected, names)
+    
+    # Hlavička súboru .pl1 - triedy sú v komentároch "% class", ostatné riadky sa ignorujú
+    pl1_text = "% class Device\n% class Phone < Device\n# Phone < Laptop\nΙ(p, Phone)\n"
+    assert parse_taxonomy(pl1_text, pl1=True) == [("Device", None), ("Phone", "Device")]
+    
+    # Viac rodičov jednej triedy - vznikne Taxonomy
+    dag = build_taxonomy(parse_taxonomy(text + "CameraPhone < Phone, Camera\n"))
+    assert isinstance(dag, Taxonomy) and dag.get_parents("CameraPhone") == ["Phone", "Camera"]
+    
+    for bad_text in ("A < \n", "A B < C\n", "A < B\nB < A\n", "A < B, C\nB < A\n"):
+        try:
+            build_taxonomy(parse_taxonomy(bad_text))
+            assert False, bad_text
+        except TaxonomyFileError:
+            pass
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache_dir = os.path.join(directory, ".cache")
+        for content, tree in ((text, built), (text + "CameraPhone < Phone, Camera\n", dag)):
+            path = os.path.join(directory, "taxonomy.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            first = load_taxonomy(path, cache_dir=cache_dir)
+            cached = load_taxonomy(path, cache_dir=cache_dir)
+            same_tree(first, tree, names + ["CameraPhone"])
+            same_tree(cached, tree, names + ["CameraPhone"])
+        assert len([name for name in os.listdir(cache_dir) if name.endswith(TAXONOMY_CACHE_SUFFIX)]) == 2
+        
+        # Načítaný strom sa dá ďalej meniť
+        cached.add_relationship("Tablet", "Camera")
+        assert cached.is_subclass("Tablet", "Device") and cached.descendants("Camera") == ["CameraPhone", "Tablet"]
+        assert not load_taxonomy(path, cache_dir=cache_dir).is_subclass("Tablet", "Device")
+        
+        # Poškodená cache sa prebuduje
+        for name in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, name), "r+b") as f:
+                f.truncate(60)
+        same_tree(load_taxonomy(path, cache_dir=cache_dir), dag, names)
+    
+    # Taxonómia aplikácie zodpovedá pôvodnému stromu BMW tried
+    bmw = load_taxonomy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "taxonomy.txt"))
+    assert bmw.is_subclass("XDrive", "Component") and bmw.get_parent("X5") == "BMW"
+    assert bmw.find_common_ancestor("DieselEngine", "ManualTransmission") == "Component"
+    assert len(bmw.parent_map) == 19
+    print("Súbor taxonómie: OK")
+
+def benchmark(depth=12, width=3, queries=200000):
+    """Porovná is_subclass s prechodom stromu na hlbokom strome."""
+    tree = ClassificationTree()
+    level = ["Root"]
+    tree.add_relationship("Root", None)
+    names = ["Root"]
+    for d in range(depth):
+        next_level = []
+        for parent in level[:50]:
+            for w in range(width):
+                child = f"{parent}.{w}"
+                tree.add_relationship(child, parent)
+                next_level.append(child)
+        names.extend(next_level)
+        level = next_level
+    rng = random.Random(1)
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(queries)]
+    
+    start = time.perf_counter()
+    walked = [walk_is_subclass(tree, child, parent) for child, parent in pairs]
+    print(f"Prechod stromu: {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    closure = [tree.is_subclass(child, parent) for child, parent in pairs]
+    print(f"Uzáver predkov: {time.perf_counter() - start:.3f}s")
+    assert walked == closure
+    
+    # Dlhá reťaz tried a spoločný predok mnohých dvojíc naraz
+    tree = ClassificationTree()
+    tree.add_relationship("C0", None)
+    for i in range(1, 3000):
+        tree.add_relationship(f"C{i}", f"C{i - 1}")
+        tree.add_relationship(f"L{i}", f"C{i}")
+    pairs = [(f"L{rng.randrange(1, 3000)}", f"L{rng.randrange(1, 3000)}") for _ in range(300)]
+    start = time.perf_counter()
+    walked = [walk_common_ancestor(tree, *pair) for pair in pairs]
+    print(f"Spoločný predok prechodom ciest: {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    lifted = tree.find_common_ancestors(pairs)
+    print(f"Spoločný predok skokmi: {time.perf_counter() - start:.3f}s")
+    assert walked == lifted
+
+    # Taxonómia so 100 000 triedami - zostavenie zo súboru a načítanie zo skompilovanej cache
+    lines = ["C0"] + [f"C{i} < C{rng.randrange(max(0, i - 50), i)}" for i in range(1, 100000)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "taxonomy.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        cache_dir = os.path.join(directory, ".cache")
+        start = time.perf_counter()
+        built = load_taxonomy(path, cache_dir=cache_dir)
+        print(f"Taxonómia zo súboru (100 000 tried): {time.perf_counter() - start:.3f}s")
+        start = time.perf_counter()
+        cached = load_taxonomy(path, cache_dir=cache_dir)
+        print(f"Taxonómia zo skompilovanej cache: {time.perf_counter() - start:.3f}s")
+        pairs = [(f"C{rng.randrange(100000)}", f"C{rng.randrange(100000)}") for _ in range(1000)]
+        assert cached._closure_version == cached.version
+        assert cached.find_common_ancestors(pairs) == built.find_common_ancestors(pairs)
+
+if __name__ == "__main__":
+    test_ancestor_closure()
+    test_incremental_patch()
+    test_taxonomy_matches_tree()
+    test_taxonomy_multiple_inheritance()
+    test_taxonomy_file()
+    benchmark()
@@ -0,0 +1,86 @@
+from backend.domains import Interval, ValueSet, as_interval, as_value_set
+from backend.model import Model, Object, ClassificationTree, is_valid_example
+from backend.learner import WinstonLearner
+import copy
+import pickle
+
+def test_interval():
+    """Overí operácie s intervalom a zhodu s obyčajnou dvojicou."""
+    interval = Interval(2, 5.5)
+    assert interval == (2, 5.5) and hash(interval) == hash((2, 5.5))
+    assert repr(interval) == "(2, 5.5)"
+    low, high = interval
+    assert (low, high) == (interval.low, interval.high)
+    
+    assert interval.contains(2) and interval.contains(5.5) and not interval.contains(6)
+    assert interval.widen(3) is interval
+    assert interval.widen(7) == (2, 7) and interval.widen(0) == (0, 5.5)
+    assert interval.union(Interval(6, 8)) == (2, 8)
+    assert interval.intersection(Interval(4, 8)) == (4, 5.5)
+    assert interval.intersection(Interval(6, 8)) is None
+    assert Interval.around(100, 0.05, 0.1) == (95.0, 105.0)
+    
+    assert as_interval((1, 2)) == Interval(1, 2) and type(as_interval((1, 2))) is Interval
+    assert as_interval(interval) is interval
+    assert as_interval((1, 2, 3)) is None and as_interval(5) is None
+    
+    for restored in (pickle.loads(pickle.dumps(interval)), copy.deepcopy(interval)):
+        assert type(restored) is Interval and restored == interval
+    print("Interval: OK")
+
+def test_value_set():
+    """Overí operácie s množinou hodnôt a zhodu s obyčajnou množinou."""
+    colors = ValueSet(["red", "black"])
+    assert "red" in colors and "blue" not in colors and [1] not in colors
+    assert len(colors) == 2 and list(colors) == ["red", "black"]
+    assert colors == {"red", "black"} and colors == frozenset({"red", "black"})
+    assert colors != {"red"} and hash(colors) == hash(frozenset({"red", "black"}))
+    
+    wider = colors.widen("blue")
+    assert wider == {"red", "black", "blue"} and colors == {"red", "black"}
+    assert colors.widen("red") is colors
+    assert (wider & ValueSet(["blue", "green"])) == {"blue"}
+    assert (wider - colors) == {"blue"}
+    assert (colors | {"green"}) == {"red", "black", "green"}
+    assert colors <= wider and wider >= colors and not wider <= colors
+    assert not ValueSet() and repr(ValueSet()) == "ValueSet()"
+    
+    try:
+        colors._bits = 0
+        assert False, "ValueSet by mala byť nemenná"
+    except AttributeError:
+        pass
+    
+    assert as_value_set({"a"}) == ValueSet(["a"]) and as_value_set(colors) is colors
+    assert as_value_set("a") is None
+    for restored in (pickle.loads(pickle.dumps(colors)), copy.deepcopy(colors)):
+        assert type(restored) is ValueSet and restored == colors
+    print("ValueSet: OK")
+
+def test_no_shared_sets():
+    """Overí, že rozšírenie množiny v jednom modeli nezmení iný model ani iný objekt."""
+    tree = ClassificationTree()
+    tree.add_relationship("Device", "Phone")
+    learner = WinstonLearner(tree)
+    
+    model = Model(objects=[Object("p1", "Phone", {"color": "red"}), Object("p2", "Phone", {"color": "red"})], links=[])
+    first = learner._apply_enlarge_set(model, Model(objects=[Object("x", "Phone", {"color": "black"})], links=[]))
+    assert first.get_object("p1").attributes["color"] == {"red", "black"}
+    
+    second = learner._apply_enlarge_set(first, Model(objects=[Object("x", "Phone", {"color": "white"})], links=[]))
+    assert second.get_object("p1").attributes["color"] == {"red", "black", "white"}
+    assert second.get_object("p2").attributes["color"] == {"red", "black", "white"}
+    assert first.get_object("p1").attributes["color"] == {"red", "black"}
+    assert first.get_object("p2").attributes["color"] == {"red", "black"}
+    
+    # Množina v modeli sa pri overovaní príkladu správa ako zoznam povolených hodnôt
+    example = Model(objects=[Object("p1", "Phone", {"color": "black"}), Object("p2", "Phone", {"color": "red"})], links=[])
+    assert is_valid_example(first, example, tree)[0]
+    example.get_object("p1").attributes["color"] = "white"
+    assert not is_valid_example(first, example, tree)[0]
+    print("Zdieľané množiny hodnôt: OK")
+
+if __name__ == "__main__":
+    test_interval()
+    test_value_set()
+    test_no_shared_sets()
@@ -1,5 +1,6 @@
 from backend.model import Model, ClassificationTree, Object, Link, LinkType
 from backend.learner import WinstonLearner
+from backend.domains import ValueSet
 import copy
 
 def initialize_tree():
@@ -430,7 +431,7 @@ def run_heuristic_tests():
     # Hledáme objekt displeje s množinou hodnot pro atribut resolution
     for obj in model.objects:
         if obj.class_name == "AMOLEDDisplay" and obj.attributes:
-            if "resolution" in obj.attributes and isinstance(obj.attributes["resolution"], set):
+            if "resolution" in obj.attributes and isinstance(obj.attributes["resolution"], (set, ValueSet)):
                 if "4K" in obj.attributes["resolution"] and len(obj.attributes["resolution"]) > 1:
                     enlarge_set_applied = True
                     break
@@ -440,7 +441,7 @@ def run_heuristic_tests():
         for obj in model.objects:
             if obj.attributes:
                 for attr_name, attr_value in obj.attributes.items():
-                    if isinstance(attr_value, set) and len(attr_value) > 1:
+                    if isinstance(attr_value, (set, ValueSet)) and len(attr_value) > 1:
                         enlarge_set_applied = True
                         break
                 if enlarge_set_applied:
@@ -0,0 +1,105 @@
+from backend.model import Model, Object, Link, LinkType, MISSING
+from backend.history import ModelHistory
+import pickle
+import random
+
+def build_model():
+    return Model(
+        objects=[Object("car", "X5", {"price": (40000, 60000)}), Object("engine", "PetrolEngine", {"power": 250})],
+        links=[Link("car", "engine"), Link("car", "X5", LinkType.MUST_BE_A)]
+    )
+
+def test_diff_apply_revert():
+    """Overí, že apply(diff) dá cieľový model a revert vráti pôvodný."""
+    old = build_model()
+    new = build_model()
+    new.update_object_class("car", "BMW")
+    engine = new.writable_object(new.get_object("engine"))
+    engine.attributes["fuel"] = {"petrol", "diesel"}
+    del engine.attributes["power"]
+    new.objects.append(Object("wheel", "Wheel"))
+    new.links.append(Link("car", "wheel", LinkType.MUST))
+    new.links.append(Link("car", "wheel", LinkType.MUST))
+    
+    patch = old.diff(new)
+    assert len(patch.changed_objects) == 2
+    assert patch.changed_objects[1].attributes["power"] == (250, MISSING)
+    assert patch.added_links.count(Link("car", "wheel", LinkType.MUST)) == 2
+    
+    restored = old.copy().apply(patch)
+    assert restored == new
+    assert restored.revert(patch) == old
+    assert old.diff(old).is_empty()
+    
+    # Rozdiel sa dá uložiť (pickle) a aplikovať aj potom
+    assert old.copy().apply(pickle.loads(pickle.dumps(patch))) == new
+    print("Rozdiel modelov: OK")
+
+def random_step(model, rng):
+    """Náhodná úprava modelu (pridanie/odobratie objektu, spojenia alebo atribútu)."""
+    model = model.copy()
+    names = [obj.name for obj in model.objects]
+    action = rng.randrange(4)
+    if action == 0 or not names:
+        name = f"o{rng.randrange(50)}"
+        model.objects.append(Object(name, f"C{rng.randrange(5)}", {"value": rng.randrange(10)} if rng.random() < 0.5 else None))
+    elif action == 1:
+        model.objects.remove(model.get_object(rng.choice(names)))
+    elif action == 2:
+        model.add_link(Link(rng.choice(names), rng.choice(names), rng.choice(list(LinkType))))
+    else:
+        model.set_attribute_interval(rng.choice(names), "range", (rng.random(), 1 + rng.random()))
+    return model
+
+def test_history():
+    """Overí obnovenie ľubovoľného stavu histórie a krok späť/vpred."""
+    rng = random.Random(7)
+    history = ModelHistory(keyframe_interval=5)
+    states = []
+    model = build_model()
+    for _ in range(40):
+        model = random_step(model, rng)
+        states.append(model)
+        history.append(model, {"step": len(states)})
+    
+    for index in list(range(len(states))) + [3, 2, 1, 30, 29, 31, 0]:
+        assert history.model_at(index) == states[index]
+        assert history.metadata(index)["step"] == index + 1
+    
+    # Vrátený model je kópia - jeho zmena históriu neovplyvní
+    history.model_at(10).objects.clear()
+    assert history.model_at(10) == states[10]
+    
+    history.truncate(20)
+    history.pop_oldest()
+    assert len(history) == 19
+    assert history.model_at(0) == states[1]
+    assert history.model_at(18) == states[19]
+    history.append(states[-1])
+    assert history.model_at(19) == states[-1]
+    print("História modelu: OK")
+
+def test_history_size():
+    """Porovná veľkosť histórie s uložením úplného stavu v každom kroku."""
+    model = Model(
+        objects=[Object(f"o{i}", f"C{i % 10}", {"value": i}) for i in range(500)],
+        links=[Link(f"o{i}", f"o{i + 1}") for i in range(499)]
+    )
+    history = ModelHistory()
+    snapshots = []
+    for step in range(30):
+        model = model.copy()
+        model.set_attribute_interval(f"o{step}", "value", (step, step + 1))
+        model.add_link(Link(f"o{step}", "o0", LinkType.MUST))
+        history.append(model)
+        snapshots.append(model.to_dict())
+    full_size = len(pickle.dumps(snapshots))
+    delta_size = sum(len(pickle.dumps(entry.snapshot if entry.snapshot is not None else entry.patch))
+                     for entry in history._entries)
+    print(f"Veľkosť histórie: snímky {full_size} B, snímky + rozdiely {delta_size} B")
+    assert delta_size * 5 < full_size
+
+if __name__ == "__main__":
+    test_diff_apply_revert()
+    test_history()
+    test_history_size()
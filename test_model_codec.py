@@ -0,0 +1,107 @@
+from backend.model import Model, Object, Link, LinkType
+from backend.domains import Interval, ValueSet
+from backend.model_codec import (
+    encode_model, decode_model, save_model, load_model, msgpack_available,
+    ModelCodecError, FORMAT_MARSHAL, FORMAT_MSGPACK
+)
+import json
+import os
+import pickle
+import tempfile
+import time
+
+def build_model():
+    return Model(
+        objects=[
+            Object("car", "X5", {"price": (40000, 60000.5), "colors": {"red", "black"}, "tags": frozenset({"suv"})}),
+            Object("engine", "PetrolEngine", {"power": 250, "turbo": True, "layout": ["V", (8, 4)]}),
+            Object("wheel", "Wheel", {"size": Interval(17, 19.5), "brands": ValueSet(["Pirelli", "Michelin"])}),
+            Object("seat", "Seat")
+        ],
+        links=[Link("car", "engine")] + [Link("car", "wheel", link_type) for link_type in LinkType]
+    )
+
+def formats():
+    return [FORMAT_MARSHAL, FORMAT_MSGPACK] if msgpack_available() else [FORMAT_MARSHAL]
+
+def test_round_trip():
+    """Overí, že intervaly, množiny hodnôt a typy spojení prežijú kódovanie presne."""
+    model = build_model()
+    for serialization in formats():
+        decoded = decode_model(encode_model(model, serialization))
+        assert decoded == model
+        assert decoded.links == model.links
+        car = decoded.get_object("car").attributes
+        assert type(car["price"]) is tuple and type(car["colors"]) is set and type(car["tags"]) is frozenset
+        assert decoded.get_object("engine").attributes["layout"] == ["V", (8, 4)]
+        wheel = decoded.get_object("wheel").attributes
+        assert type(wheel["size"]) is Interval and type(wheel["brands"]) is ValueSet
+        assert wheel == model.get_object("wheel").attributes
+        assert decoded.get_object("seat").attributes is None
+        assert decoded.fingerprint() == model.fingerprint()
+    
+    # Slovník modelu s množinou sa do JSON uložiť nedá
+    try:
+        json.dumps(model.to_dict())
+        assert False, "JSON by nemal zvládnuť množinu"
+    except TypeError:
+        pass
+    print("Kódovanie modelu: OK")
+
+def test_errors():
+    """Overí odmietnutie poškodených dát a nepodporovaných hodnôt."""
+    data = encode_model(build_model())
+    for broken in (b"", b"XXXX" + data[4:], data[:4] + b"\x63" + data[5:], data[:-5]):
+        try:
+            decode_model(broken)
+            assert False, "Poškodené dáta by sa nemali načítať"
+        except ModelCodecError:
+            pass
+    
+    try:
+        encode_model(Model(objects=[Object("x", "X", {"type": LinkType.MUST})], links=[]))
+        assert False, "Enum nie je podporovaná hodnota atribútu"
+    except ModelCodecError:
+        pass
+    print("Chyby kódovania: OK")
+
+def test_persistence():
+    """Overí uloženie modelu do súboru a jeho načítanie."""
+    model = build_model()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "models", "model.pl1m")
+        save_model(path, model)
+        assert load_model(path) == model
+        assert os.listdir(os.path.dirname(path)) == ["model.pl1m"]
+    print("Uloženie modelu: OK")
+
+def benchmark(size=20000, rounds=5):
+    """Porovná kódovanie s cestou cez to_dict/from_dict (a pickle slovníka)."""
+    model = Model(
+        objects=[Object(f"o{i}", f"C{i % 50}", {"value": i, "range": (i, i + 1.5), "set": {i % 3, i % 7}})
+                 for i in range(size)],
+        links=[Link(f"o{i}", f"o{(i * 7) % size}", LinkType.MUST if i % 3 else LinkType.REGULAR)
+               for i in range(size)]
+    )
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        data = pickle.dumps(model.to_dict())
+        restored = Model.from_dict(pickle.loads(data))
+    print(f"to_dict + pickle + from_dict: {(time.perf_counter() - start) / rounds:.3f}s, {len(data)} B")
+    assert restored == model
+    
+    for serialization in formats():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            data = encode_model(model, serialization)
+            restored = decode_model(data)
+        name = "msgpack" if serialization == FORMAT_MSGPACK else "marshal"
+        print(f"encode_model + decode_model ({name}): {(time.perf_counter() - start) / rounds:.3f}s, {len(data)} B")
+        assert restored == model
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_errors()
+    test_persistence()
+    benchmark()
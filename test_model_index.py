@@ -0,0 +1,545 @@
+from backend.model import (Model, Object, Link, LinkType, ClassificationTree, is_valid_example, fingerprint_of,
+                           compile_model, MatchNetwork, Violation, SharedElementError)
+from backend.learner import WinstonLearner
+from backend.domains import Interval, ValueSet, as_interval, as_value_set
+import copy
+import pickle
+import random
+import time
+
+def build_model():
+    return Model(
+        objects=[Object("car", "X5"), Object("engine", "PetrolEngine", {"power": 250})],
+        links=[Link("car", "engine"), Link("car", "X5", LinkType.MUST_BE_A)]
+    )
+
+def test_link_index():
+    """Overí, že index spojení sleduje úpravy zoznamu aj priame zmeny spojení."""
+    model = build_model()
+    assert model.has_link(Link("car", "engine"))
+    assert not model.has_link(Link("car", "engine", LinkType.MUST))
+
+    model.add_link(Link("car", "engine"))
+    assert len(model.links) == 2
+
+    model.links.append(Link("engine", "car", LinkType.MUST))
+    assert model.links_to("car") == [Link("engine", "car", LinkType.MUST)]
+
+    model.remove_link(Link("car", "engine"))
+    assert not model.has_link(Link("car", "engine"))
+    assert model.links_from("car") == [Link("car", "X5", LinkType.MUST_BE_A)]
+
+    # Priama zmena spojenia mimo modelu
+    other = build_model()
+    assert other.has_link(Link("car", "engine"))
+    model.links[0].target = "BMW"
+    assert model.has_link(Link("car", "BMW", LinkType.MUST_BE_A))
+    assert not model.has_link(Link("car", "X5", LinkType.MUST_BE_A))
+    # Zmena sa týka len indexu modelu, v ktorom spojenie je
+    assert other._index_is_current()
+
+    # Zmenené spojenie zostane v indexe na svojom mieste v poradí
+    model.links.append(Link("car", "wheel"))
+    model.links[0].source = "engine"
+    model.links[0].source = "car"
+    assert model.links_from("car") == [link for link in model.links if link.source == "car"]
+
+    model.links = [link for link in model.links if link.link_type != LinkType.MUST]
+    assert model.links_to("car") == []
+    print("Index spojení: OK")
+
+def test_object_index():
+    """Overí vyhľadanie objektu podľa názvu a update_object_class."""
+    model = build_model()
+    assert model.get_object("engine").class_name == "PetrolEngine"
+    assert model.get_attribute_value("engine", "power") == 250
+
+    model.update_object_class("car", "BMW")
+    assert model.get_object("car").class_name == "BMW"
+    assert model.has_link(Link("car", "BMW", LinkType.MUST_BE_A))
+
+    model.objects.pop(0)
+    assert not model.has_object("car")
+
+    model.objects.append(Object("wheel", "Wheel"))
+    assert model.get_object("wheel") is model.objects[-1]
+    print("Index objektov: OK")
+
+def test_copies():
+    """Overí, že kópie modelu majú vlastné indexy."""
+    model = build_model()
+    for other in (model.copy(), copy.deepcopy(model), pickle.loads(pickle.dumps(model))):
+        assert other == model
+        other.links.append(Link("engine", "car"))
+        assert other.has_link(Link("engine", "car"))
+        assert not model.has_link(Link("engine", "car"))
+    print("Kópie modelu: OK")
+
+def test_copy_on_write():
+    """Overí, že úpravy cez writable_* nevidí pôvodný model ani ďalšie kópie."""
+    model = build_model()
+    snapshot = model.copy()
+    assert snapshot.objects[0] is model.objects[0]
+
+    engine = model.writable_object(model.get_object("engine"))
+    engine.attributes["power"] = 300
+    assert model.get_attribute_value("engine", "power") == 300
+    assert snapshot.get_attribute_value("engine", "power") == 250
+    assert model.writable_object(engine) is engine
+
+    model.update_object_class("car", "BMW")
+    assert model.has_link(Link("car", "BMW", LinkType.MUST_BE_A))
+    assert snapshot.has_link(Link("car", "X5", LinkType.MUST_BE_A))
+    assert snapshot.get_object("car").class_name == "X5"
+    assert model.links_from("car")[-1] is model.links[1]
+
+    # Zápis do kópie nesmie zmeniť pôvodný model
+    snapshot.set_attribute_interval("car", "price", (1.0, 2.0))
+    assert model.get_attribute_value("car", "price") is None
+
+    # Prvky zdieľané s kópiou sú len na čítanie v oboch modeloch
+    model = build_model()
+    snapshot = model.copy()
+    for shared in (model, snapshot):
+        for write in (lambda: setattr(shared.get_object("car"), "class_name", "BMW"),
+                      lambda: setattr(shared.links[0], "target", "wheel"),
+                      lambda: setattr(shared.get_object("engine"), "attributes", None),
+                      lambda: shared.get_object("engine").attributes.update(power=300)):
+            try:
+                write()
+                assert False, "zápis do zdieľaného prvku musí zlyhať"
+            except SharedElementError:
+                pass
+    assert model == build_model() and snapshot == build_model()
+
+    # Prvok odobratý z kópie ani z modelu sa znova meniť nedá, nový prvok kópie áno
+    link = snapshot.links.pop(0)
+    try:
+        link.target = "wheel"
+        assert False, "spojenie je stále v pôvodnom modeli"
+    except SharedElementError:
+        pass
+    added = Object("wheel", "Wheel")
+    snapshot.objects.append(added)
+    added.class_name = "Tyre"
+    assert snapshot.get_object("wheel").class_name == "Tyre"
+    assert not model.has_object("wheel")
+
+    # Model bez kópie mení svoje prvky priamo, prvok vo dvoch modeloch je zdieľaný
+    model = build_model()
+    model.objects[0].class_name = "BMW"
+    assert model.objects_of_class("BMW") == [model.objects[0]]
+    other = Model(objects=list(model.objects))
+    try:
+        other.objects[0].name = "auto"
+        assert False, "objekt je v dvoch modeloch"
+    except SharedElementError:
+        pass
+    other.writable_object(other.objects[0]).name = "auto"
+    assert other.has_object("auto") and model.has_object("car")
+    print("Kopírovanie pri zápise: OK")
+
+def test_class_index():
+    """Overí index tried s podtriedami a validáciu príkladu nad ním."""
+    tree = ClassificationTree()
+    tree.add_relationship("Car", None)
+    tree.add_relationship("BMW", "Car")
+    tree.add_relationship("Engine", None)
+    tree.add_relationship("PetrolEngine", "Engine")
+
+    example = Model(
+        objects=[Object("car", "BMW"), Object("engine", "PetrolEngine"), Object("car2", "Car")],
+        links=[Link("car", "engine")]
+    )
+    assert example.objects_of_class("Car") == [Object("car2", "Car")]
+    assert [obj.name for obj in example.objects_of_class("Car", tree)] == ["car", "car2"]
+
+    # Zmena stromu, triedy objektu aj pridanie objektu sa prejaví v indexe
+    tree.add_relationship("Diesel", "Engine")
+    example.objects.append(Object("engine2", "Diesel"))
+    assert [obj.name for obj in example.objects_of_class("Engine", tree)] == ["engine", "engine2"]
+    example.objects[0].class_name = "Engine"
+    assert [obj.name for obj in example.objects_of_class("Car", tree)] == ["car2"]
+    example.objects[0].class_name = "BMW"
+
+    model = Model(
+        objects=[Object("Car", "Car"), Object("Engine", "Engine")],
+        links=[Link("Car", "Engine", LinkType.MUST)]
+    )
+    is_valid, differences = is_valid_example(model, example, tree)
+    assert not is_valid
+    assert differences == ["Objekt car2 (triedy Car) musí byť spojený s objektom triedy Engine"]
+    example.links.append(Link("car2", "engine2"))
+    assert is_valid_example(model, example, tree) == (True, [])
+    print("Index tried: OK")
+
+def test_fingerprint():
+    """Overí, že priebežne udržiavaný odtlačok zodpovedá obsahu modelu."""
+    model = build_model()
+    reordered = Model(
+        objects=[Object("engine", "PetrolEngine", {"power": 250.0}), Object("car", "X5")],
+        links=list(reversed(model.links))
+    )
+    assert model.fingerprint() == reordered.fingerprint()
+    assert model == reordered
+
+    snapshot = model.copy()
+    model.links.append(Link("engine", "car"))
+    model.writable_object(model.get_object("engine")).attributes["power"] = 300
+    model.update_object_class("car", "BMW")
+    model.objects.pop(0)
+    assert model.fingerprint() == fingerprint_of(list(model.objects) + list(model.links))
+    assert snapshot.fingerprint() == reordered.fingerprint()
+    assert model != snapshot
+
+    model.remove_link(Link("engine", "car"))
+    model.objects.insert(0, Object("car", "BMW"))
+    assert model.fingerprint() == fingerprint_of(list(model.objects) + list(model.links))
+
+    # Priamy zápis do slovníka atribútov zmení odtlačok aj porovnanie
+    model = build_model()
+    model.fingerprint()
+    model.objects[1].attributes["power"] = 300
+    assert model != build_model()
+    assert model.fingerprint() == fingerprint_of(list(model.objects) + list(model.links))
+    model.objects[1].attributes.update(power=250)
+    assert model == build_model()
+    model.objects[1].attributes.setdefault("fuel", "petrol")
+    model.objects[1].attributes.pop("power")
+    assert model.fingerprint() == fingerprint_of(list(model.objects) + list(model.links))
+    model.objects[1].attributes.clear()
+    model.objects[1].attributes["power"] = 250
+    assert model == build_model()
+
+    # Slovník prevzatý z iného objektu patrí novému objektu (zmena ho neovplyvní)
+    engine = build_model().objects[1]
+    model.objects.append(Object("engine2", "PetrolEngine", engine.attributes))
+    model.objects[-1].attributes["power"] = 100
+    assert engine.attributes == {"power": 250}
+
+    # Uložený matcher aj cache platnosti príkladov v learneri vidia zmenu
+    tree = ClassificationTree()
+    model = Model(objects=[Object("engine", "Engine", {"power": 250})])
+    example = Model(objects=[Object("engine", "Engine", {"power": 250})])
+    learner = WinstonLearner(tree)
+    assert model.matcher(tree).accepts(example)
+    assert learner._is_example_valid(model, example)
+    model.objects[0].attributes["power"] = 300
+    assert not model.matcher(tree).accepts(example)
+    assert not learner._is_example_valid(model, example)
+    print("Odtlačok modelu: OK")
+
+def random_matcher_case(rng, classes, names):
+    """Náhodný model a príklad s generickými aj konkrétnymi pravidlami a atribútmi."""
+    values = [Interval(100, 200), ValueSet(["red", "blue"]), "red", 150, 250, "blue", {"red", "blue"}, (1, 2, 3)]
+
+    def random_model(objects_count, links_count, link_types):
+        objects = []
+        for _ in range(objects_count):
+            attributes = {attr: rng.choice(values) for attr in rng.sample(["power", "color"], rng.randrange(3))}
+            objects.append(Object(rng.choice(names + classes), rng.choice(classes), attributes or None))
+        links = [
+            Link(rng.choice(names + classes), rng.choice(names + classes), rng.choice(link_types))
+            for _ in range(links_count)
+        ]
+        return Model(objects=objects, links=links)
+
+    model = random_model(6, 8, [LinkType.MUST, LinkType.MUST_NOT, LinkType.REGULAR])
+    example = random_model(8, 10, [LinkType.REGULAR, LinkType.MUST])
+    return model, example
+
+def reference_validation(model, example, tree):
+    """
+    Pôvodné interpretované overenie príkladu (pred prekladom modelu na ModelMatcher).
+
+    Prechádza zoznamy bez indexov modelu, aby test porovnával ModelMatcher
+    s nezávislou implementáciou pravidiel.
+    """
+    differences = []
+
+    def first_object(objects, name):
+        return next((obj for obj in objects if obj.name == name), None)
+
+    for example_obj in example.objects:
+        model_obj = first_object(model.objects, example_obj.name)
+        if (model_obj and model_obj.class_name != example_obj.class_name
+                and not tree.is_subclass(example_obj.class_name, model_obj.class_name)):
+            differences.append(f"Objekt {example_obj.name} má triedu {example_obj.class_name},"
+                               f" ale mal by mať triedu {model_obj.class_name} alebo jej podtriedu")
+
+    model_classes = {obj.class_name for obj in model.objects}
+    for rule in model.links:
+        if rule.link_type != LinkType.MUST:
+            continue
+        if rule.source in model_classes and rule.target in model_classes:
+            # Generické pravidlo: každý objekt zdrojovej triedy so spojením na objekt cieľovej triedy
+            if not any(tree.is_subclass(obj.class_name, rule.target) for obj in example.objects):
+                continue
+            for source_obj in example.objects:
+                if not tree.is_subclass(source_obj.class_name, rule.source):
+                    continue
+                targets = [first_object(example.objects, link.target) for link in example.links if link.source == source_obj.name]
+                if not any(target and tree.is_subclass(target.class_name, rule.target) for target in targets):
+                    differences.append(f"Objekt {source_obj.name} (triedy {source_obj.class_name}) musí byť spojený s objektom triedy {rule.target}")
+        elif not any(link.source == rule.source and link.target == rule.target for link in example.links):
+            differences.append(f"Chýba požadované spojenie: {rule.source} → {rule.target}")
+
+    for rule in model.links:
+        if rule.link_type == LinkType.MUST_NOT:
+            differences.extend(f"Obsahuje zakázané spojenie: {rule.source} → {rule.target}"
+                               for link in example.links if link.source == rule.source and link.target == rule.target)
+
+    for model_obj in model.objects:
+        example_obj = first_object(example.objects, model_obj.name)
+        if not model_obj.attributes or not example_obj or not example_obj.attributes:
+            continue
+        for attr_name, expected in model_obj.attributes.items():
+            if attr_name not in example_obj.attributes:
+                differences.append(f"Chýba atribút {attr_name} objektu {model_obj.name}")
+                continue
+            actual = example_obj.attributes[attr_name]
+            interval = as_interval(expected)
+            value_set = as_value_set(expected) if interval is None else None
+            if interval is not None:
+                if isinstance(actual, (int, float)) and not interval.contains(actual):
+                    differences.append(f"Hodnota atribútu {attr_name} objektu {model_obj.name} musí byť"
+                                       f" v intervale [{interval[0]}, {interval[1]}], ale je {actual}")
+            elif value_set is not None and as_value_set(actual) is None:
+                if actual not in value_set:
+                    differences.append(f"Hodnota atribútu {attr_name} objektu {model_obj.name} musí byť jedna z {value_set}, ale je {actual}")
+            elif expected != actual:
+                differences.append(f"Hodnota atribútu {attr_name} objektu {model_obj.name} musí byť {expected}, ale je {actual}")
+
+    return not differences, differences
+
+def test_compiled_matcher():
+    """Overí, že preložený model overuje príklady rovnako ako pôvodné interpretované pravidlá."""
+    tree = ClassificationTree()
+    for child, parent in [("Vehicle", None), ("Car", "Vehicle"), ("BMW", "Car"), ("X5", "BMW"),
+                          ("Engine", None), ("Diesel", "Engine"), ("Petrol", "Engine")]:
+        tree.add_relationship(child, parent)
+    classes = ["Vehicle", "Car", "BMW", "X5", "Engine", "Diesel", "Petrol", "Wheel"]
+    names = ["car", "engine", "wheel", "x"]
+
+    rng = random.Random(7)
+    learner = WinstonLearner(tree)
+    for _ in range(3000):
+        model, example = random_matcher_case(rng, classes, names)
+        matcher = compile_model(model, tree)
+        is_valid, differences = reference_validation(model, example, tree)
+        assert matcher.match(example) == (is_valid, differences)
+        assert is_valid_example(model, example, tree) == (is_valid, differences)
+        assert [violation.message for violation in matcher.violations(example)] == differences
+        # Booleovský režim (aj v learneri) hodnotí rovnako ako vysvetľujúci
+        assert matcher.accepts(example) == is_valid
+        assert learner._is_example_valid(model, example) == is_valid
+
+    # Matcher sa použije znova, kým sa nezmení model alebo strom
+    model = Model(
+        objects=[Object("Car", "Car"), Object("Engine", "Engine", {"power": Interval(100, 200)})],
+        links=[Link("Car", "Engine", LinkType.MUST)]
+    )
+    example = Model(objects=[Object("car", "X5"), Object("Engine", "Diesel", {"power": 150})], links=[])
+    matcher = model.matcher(tree)
+    assert model.matcher(tree) is matcher
+    assert matcher.match(example) == reference_validation(model, example, tree)
+
+    model.writable_object(model.get_object("Engine")).attributes["power"] = Interval(160, 200)
+    assert model.matcher(tree) is not matcher
+    assert model.matcher(tree).match(example) == reference_validation(model, example, tree)
+    matcher = model.matcher(tree)
+    model.links.append(Link("Car", "Wheel", LinkType.MUST_NOT))
+    assert model.matcher(tree) is not matcher
+    matcher = model.matcher(tree)
+    tree.add_relationship("Hybrid", "Engine")
+    assert model.matcher(tree) is not matcher
+    example.objects.append(Object("Engine2", "Hybrid"))
+    assert model.matcher(tree).match(example) == reference_validation(model, example, tree)
+    print("Preložený model: OK")
+
+def test_violations():
+    """Overí štruktúrované porušenia a ich text."""
+    tree = ClassificationTree()
+    for child, parent in [("Vehicle", None), ("Car", "Vehicle"), ("Engine", None), ("Diesel", "Engine")]:
+        tree.add_relationship(child, parent)
+    model = Model(
+        objects=[Object("car", "Car", {"power": Interval(100, 200), "color": ValueSet(["red", "blue"])}),
+                 Object("engine", "Diesel"), Object("Car", "Car"), Object("Engine", "Engine")],
+        links=[Link("car", "engine", LinkType.MUST), Link("Car", "Engine", LinkType.MUST),
+               Link("car", "wheel", LinkType.MUST_NOT)]
+    )
+    example = Model(
+        objects=[Object("car", "Car", {"power": 250, "color": "green"}), Object("engine", "Engine")],
+        links=[Link("car", "wheel")]
+    )
+    violations = compile_model(model, tree).violations(example)
+    assert violations == [
+        Violation("class", "engine", "Diesel", "Engine"),
+        Violation("missing_link", "car", "engine"),
+        Violation("class_link", "car", "Engine", "Car"),
+        Violation("forbidden_link", "car", actual="wheel"),
+        Violation("interval", "car", Interval(100, 200), 250, "power"),
+        Violation("value_set", "car", ValueSet(["red", "blue"]), "green", "color"),
+    ]
+    assert str(violations[0]) == "Objekt engine má triedu Engine, ale mal by mať triedu Diesel alebo jej podtriedu"
+    assert violations[3].message == "Obsahuje zakázané spojenie: car → wheel"
+    assert violations[4].message == "Hodnota atribútu power objektu car musí byť v intervale [100, 200], ale je 250"
+    assert [violation.message for violation in violations] == reference_validation(model, example, tree)[1]
+
+    # Booleovský režim skončí pri prvom porušení
+    assert not compile_model(model, tree).accepts(example)
+    assert compile_model(model, tree).accepts(Model(
+        objects=[Object("car", "Car", {"power": 150, "color": "red"}), Object("engine", "Diesel")],
+        links=[Link("car", "engine")]
+    ))
+    print("Štruktúrované porušenia: OK")
+
+def test_match_network():
+    """Overí, že tabuľka verdiktov siete zodpovedá pôvodným pravidlám po každej zmene modelu."""
+    tree = ClassificationTree()
+    for child, parent in [("Vehicle", None), ("Car", "Vehicle"), ("BMW", "Car"), ("X5", "BMW"),
+                          ("Engine", None), ("Diesel", "Engine"), ("Petrol", "Engine")]:
+        tree.add_relationship(child, parent)
+    classes = ["Vehicle", "Car", "BMW", "X5", "Engine", "Diesel", "Petrol", "Wheel"]
+    names = ["car", "engine", "wheel", "x"]
+    values = [Interval(100, 200), ValueSet(["red", "blue"]), "red", 150, 150.0, 250, {"red", "blue"}]
+
+    rng = random.Random(11)
+    model, _ = random_matcher_case(rng, classes, names)
+    examples = {i: random_matcher_case(rng, classes, names)[1] for i in range(80)}
+    network = MatchNetwork()
+    for example_id, example in examples.items():
+        network.add_example(example_id, example)
+
+    def check():
+        for example_id, example in examples.items():
+            assert network.verdicts[example_id] == reference_validation(model, example, tree)
+
+    network.update(model, tree)
+    check()
+    for step in range(400):
+        action = rng.randrange(8)
+        if action == 0 and model.links:
+            model.links.remove(rng.choice(model.links))
+        elif action == 1:
+            model.links.append(Link(rng.choice(names + classes), rng.choice(names + classes),
+                                    rng.choice([LinkType.MUST, LinkType.MUST_NOT])))
+        elif action == 2 and model.links:
+            model.links.append(copy.copy(rng.choice(model.links)))
+        elif action == 3 and model.objects:
+            obj = model.writable_object(rng.choice(model.objects))
+            obj.attributes = {**(obj.attributes or {}), rng.choice(["power", "color"]): rng.choice(values)}
+        elif action == 4:
+            model.objects.append(Object(rng.choice(names + classes), rng.choice(classes)))
+        elif action == 5 and len(model.objects) > 1:
+            model.objects.remove(rng.choice(model.objects))
+        elif action == 6:
+            example_id = rng.randrange(100)
+            if example_id in examples and rng.random() < 0.5:
+                network.remove_example(example_id)
+                del examples[example_id]
+            else:
+                examples[example_id] = random_matcher_case(rng, classes, names)[1]
+                network.add_example(example_id, examples[example_id])
+        elif action == 7 and step % 50 == 0:
+            tree.add_relationship(f"Sub{step}", rng.choice(classes))
+            classes.append(f"Sub{step}")
+        network.update(model, tree)
+        check()
+
+    # Nezmenený model nič nevyhodnocuje, nové zakázané spojenie len príklady s týmto spojením
+    assert not network.update(model, tree)
+    assert network.last_update["checks"] == 0
+    model.links.append(Link("nowhere", "else", LinkType.MUST_NOT))
+    assert not network.update(model, tree)
+    assert network.last_update == {"added_rules": 1, "removed_rules": 0, "reevaluated_examples": 0, "checks": 0}
+    assert sorted(network.invalid_examples()) == sorted(i for i, e in examples.items() if not reference_validation(model, e, tree)[0])
+    print("Inkrementálna sieť pravidiel: OK")
+
+def benchmark_matcher(examples=2000):
+    """Porovná is_valid_example s preloženým modelom pri opakovanom porovnávaní."""
+    tree = ClassificationTree()
+    tree.add_relationship("Vehicle", None)
+    classes = ["Vehicle"]
+    for i in range(200):
+        tree.add_relationship(f"K{i}", classes[i // 3])
+        classes.append(f"K{i}")
+    rng = random.Random(2)
+    objects = [Object(f"o{i}", rng.choice(classes), {"power": Interval(0, rng.randrange(1, 500))}) for i in range(60)]
+    objects += [Object(name, name) for name in classes[:20]]
+    links = [Link(f"o{rng.randrange(60)}", f"o{rng.randrange(60)}", rng.choice([LinkType.MUST, LinkType.MUST_NOT]))
+             for _ in range(120)]
+    links += [Link(rng.choice(classes[:20]), rng.choice(classes[:20]), LinkType.MUST) for _ in range(20)]
+    model = Model(objects=objects, links=links)
+    batch = [
+        Model(objects=[Object(f"o{i}", rng.choice(classes), {"power": rng.randrange(500)}) for i in range(60)],
+              links=[Link(f"o{rng.randrange(60)}", f"o{rng.randrange(60)}") for _ in range(80)])
+        for _ in range(examples)
+    ]
+
+    start = time.perf_counter()
+    interpreted = [is_valid_example(model, example, tree) for example in batch]
+    print(f"is_valid_example: {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    compiled = [model.matcher(tree).match(example) for example in batch]
+    print(f"Preložený model: {time.perf_counter() - start:.3f}s")
+    assert interpreted == compiled
+    start = time.perf_counter()
+    accepted = [model.matcher(tree).accepts(example) for example in batch]
+    print(f"Booleovský režim: {time.perf_counter() - start:.3f}s")
+    assert accepted == [is_valid for is_valid, _ in compiled]
+
+def benchmark_match_network(examples=2000, steps=50):
+    """Porovná opakované overenie celého datasetu s inkrementálnou sieťou počas trénovania."""
+    tree = ClassificationTree()
+    tree.add_relationship("Vehicle", None)
+    rng = random.Random(3)
+    objects = [Object(f"o{i}", "Vehicle", {"power": Interval(0, 400)}) for i in range(60)]
+    links = [Link(f"o{rng.randrange(60)}", f"o{rng.randrange(60)}", LinkType.MUST) for _ in range(100)]
+    model = Model(objects=objects, links=links)
+    # Príklady datasetu väčšinou spĺňajú model, ako pri trénovaní na skutočných dátach
+    batch = [
+        Model(objects=[Object(f"o{i}", "Vehicle", {"power": rng.randrange(420)}) for i in range(60)],
+              links=[Link(link.source, link.target) for link in links if rng.random() < 0.99]
+              + [Link(f"o{rng.randrange(60)}", f"o{rng.randrange(60)}") for _ in range(20)])
+        for _ in range(examples)
+    ]
+    models = []
+    for _ in range(steps):
+        model = model.copy()
+        action = rng.randrange(3)
+        if action == 0:
+            model.links.pop(rng.randrange(len(model.links)))
+        elif action == 1:
+            model.links.append(Link(f"o{rng.randrange(60)}", f"o{rng.randrange(60)}", LinkType.MUST_NOT))
+        else:
+            obj = model.writable_object(model.objects[rng.randrange(60)])
+            obj.attributes["power"] = Interval(0, rng.randrange(380, 420))
+        models.append(model)
+
+    start = time.perf_counter()
+    full = [[model.matcher(tree).match(example) for example in batch] for model in models]
+    print(f"Celý dataset po každom kroku: {time.perf_counter() - start:.3f}s")
+    network = MatchNetwork()
+    for i, example in enumerate(batch):
+        network.add_example(i, example)
+    start = time.perf_counter()
+    incremental = []
+    for model in models:
+        network.update(model, tree)
+        incremental.append([network.verdicts[i] for i in range(examples)])
+    print(f"Inkrementálna sieť: {time.perf_counter() - start:.3f}s")
+    assert full == incremental
+
+if __name__ == "__main__":
+    test_link_index()
+    test_object_index()
+    test_copies()
+    test_copy_on_write()
+    test_class_index()
+    test_fingerprint()
+    test_compiled_matcher()
+    test_violations()
+    test_match_network()
+    benchmark_matcher()
+    benchmark_match_network()
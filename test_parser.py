@@ -0,0 +1,202 @@
+from backend.pl1_parser import parse_pl1_formula, parse_pl1_dataset, iter_pl1_dataset
+from backend.pl1_index import PL1FileIndex, diff_block_hashes
+from backend.dataset_cache import content_hash, cache_path, load_compiled_dataset, save_compiled_dataset
+from backend.model import formula_to_model
+from backend.ingest import ingest_examples, ParseCache
+import io
+import os
+import tempfile
+
+DATASET = """# Legenda symbolov:
+# Ι(x,y) - x je typu y
+
+# Pozitívny príklad 1: BMW X5
+Ι(c₁, X5) ∧
+Π(c₁, e₁) ∧ Ι(e₁, PetrolEngine) ∧
+Α(e₁, power_kw, 250)
+
+# KONTRASTNÝ NEGATÍVNY príklad
+# BMW X5 bez xDrive
+Ι(c₂, X5) ∧ Π(c₂, d₂) ∧ Ι(d₂, RWD) ∧
+# Explicitný zákaz
+Ν(X5, RWD)
+"""
+
+def test_iter_dataset():
+    """Overí, že generátor vracia príklady s hlavičkou a preskočí legendu."""
+    examples = list(iter_pl1_dataset(io.StringIO(DATASET)))
+
+    assert len(examples) == 2
+    assert examples[0].index == 0
+    assert examples[0].name == "Pozitívny príklad 1: BMW X5"
+    assert examples[0].is_positive
+    assert examples[0].line_number == 4
+    assert len(examples[0].formula.predicates) == 4
+
+    assert examples[1].header == ["KONTRASTNÝ NEGATÍVNY príklad", "BMW X5 bez xDrive"]
+    assert not examples[1].is_positive
+    assert len(examples[1].formula.predicates) == 4
+    print("iter_pl1_dataset: OK")
+
+def test_iter_dataset_is_lazy():
+    """Overí, že prvý príklad je k dispozícii skôr, než sa prečíta zvyšok súboru."""
+    read_lines = []
+
+    def lines():
+        for line in io.StringIO(DATASET):
+            read_lines.append(line)
+            yield line
+
+    first = next(iter_pl1_dataset(lines()))
+    assert first.index == 0
+    assert len(read_lines) < len(DATASET.splitlines())
+    print("iter_pl1_dataset (lenivé čítanie): OK")
+
+def test_parse_dataset_compatibility():
+    """Overí, že parse_pl1_dataset vracia rovnaké formuly ako generátor."""
+    formulas = parse_pl1_dataset(DATASET)
+    assert [f.predicates for f in formulas] == [e.formula.predicates for e in iter_pl1_dataset(io.StringIO(DATASET))]
+
+    with open("data/sample_dataset.pl1", "rb") as f:
+        examples = list(iter_pl1_dataset(f))
+    assert examples and all(e.formula.predicates for e in examples)
+    print("parse_pl1_dataset: OK")
+
+def test_formula_tree():
+    """Overí precedenciu spojok a implicitnú konjunkciu."""
+    formula = parse_pl1_formula("Ι(a, B) ∧ ¬Π(a, b) ∨ Ι(c, D)")
+    assert formula.operator == "∨"
+    assert formula.subformulas[0].operator == "∧"
+    assert formula.subformulas[0].subformulas[1].operator == "¬"
+
+    formula = parse_pl1_formula("Ι(a, B)\nΠ(a, b) ∧\n")
+    assert formula.operator == "∧" and len(formula.subformulas) == 2
+    print("parse_pl1_formula: OK")
+
+def test_deep_formulas():
+    """Overí, že dlhé reťazce negácií, zátvoriek a slov nevyčerpajú zásobník."""
+    formula = parse_pl1_formula("(" * 500 + "Ι(a, B)" + ")" * 500)
+    assert formula.operator is None and len(formula.predicates) == 1
+
+    formula = parse_pl1_formula("¬" * 1000 + "Ι(a, B)")
+    depth = 0
+    while formula.operator == "¬":
+        formula = formula.subformulas[0]
+        depth += 1
+    assert depth == 1000
+
+    formula = parse_pl1_formula("¬(" * 500 + "Ι(a, B)" + ")" * 500)
+    assert formula.operator == "¬" and len(formula.predicates) == 1
+
+    for text in (" ".join(["slovo"] * 5000), "Ι(a, B) ∧ (" * 500 + "Π(a, b)" + ")" * 500):
+        try:
+            parse_pl1_formula(text)
+            assert False, "formula musí zlyhať s ValueError"
+        except ValueError:
+            pass
+    assert parse_pl1_formula(" ".join(["slovo"] * 5000) + " Ι(a, B)").operator is None
+    print("Hlboko vnorené formuly: OK")
+
+def test_file_index():
+    """Overí náhodný prístup k príkladom cez index a jeho obnovu po zmene súboru."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dataset.pl1")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(DATASET)
+
+        with PL1FileIndex(path) as index:
+            assert len(index) == 2
+            assert os.path.exists(index.index_path)
+            assert index.header(1) == ["KONTRASTNÝ NEGATÍVNY príklad", "BMW X5 bez xDrive"]
+            assert not index.is_positive(1)
+            assert index.get(1).formula.predicates == parse_pl1_dataset(DATASET)[1].predicates
+
+        # Index uložený vedľa súboru sa použije znova
+        with PL1FileIndex(path) as index:
+            assert index.text(0).startswith("Ι(c₁, X5)")
+
+        # Zmenený súbor musí index prebudovať
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n# Negatívny príklad 3\nΙ(c₃, X7)\n")
+        with PL1FileIndex(path) as index:
+            assert len(index) == 3
+            assert index.name(2) == "Negatívny príklad 3"
+    print("PL1FileIndex: OK")
+
+def test_block_diff():
+    """Overí, že po úprave súboru sa nájdu len zmenené, pridané a odstránené príklady."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dataset.pl1")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(DATASET + "\n# Pozitívny príklad 3\nΙ(c₃, X7)\n")
+        with PL1FileIndex(path, use_cache=False) as index:
+            old_hashes = index.block_hashes()
+
+        # Úprava druhého príkladu na mieste
+        edited = DATASET.replace("Ν(X5, RWD)", "Ν(X5, AWD)") + "\n# Pozitívny príklad 3\nΙ(c₃, X7)\n"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(edited)
+        with PL1FileIndex(path, use_cache=False) as index:
+            diff = diff_block_hashes(old_hashes, index.block_hashes())
+        assert diff.changed == [1] and diff.removed == [1]
+        assert diff.retained == {0: 0, 2: 2} and not diff.moved
+
+        # Zmazanie prvého príkladu posunie ID ostatných
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(DATASET.split("# Pozitívny príklad 1")[0] + DATASET.split("Α(e₁, power_kw, 250)\n")[1] + "\n# Pozitívny príklad 3\nΙ(c₃, X7)\n")
+        with PL1FileIndex(path, use_cache=False) as index:
+            diff = diff_block_hashes(old_hashes, index.block_hashes())
+        assert diff.changed == [] and diff.removed == [0]
+        assert diff.moved == {0: 1, 1: 2}
+    print("diff_block_hashes: OK")
+
+def test_compiled_cache():
+    """Overí, že skompilovaná cache vráti rovnaké formuly a modely a zastaraná sa odmietne."""
+    texts = [example.text for example in iter_pl1_dataset(io.StringIO(DATASET))]
+    formulas = [parse_pl1_formula(text) for text in texts]
+    models = [formula_to_model(formula).to_dict() for formula in formulas]
+    models[0]["objects"].append({"name": "x", "class_name": "Car", "attributes": {"power": (150, 250.5), "colors": {"red"}}})
+
+    with tempfile.TemporaryDirectory() as directory:
+        key = content_hash(texts)
+        path = cache_path(directory, key)
+        assert load_compiled_dataset(path, key) is None
+        assert save_compiled_dataset(path, key, [(formulas[0], models[0]), (None, models[1])])
+
+        cached = load_compiled_dataset(path, key)
+        assert cached[0].formula.predicates == formulas[0].predicates
+        assert str(cached[0].formula) == str(formulas[0])
+        assert cached[0].model == models[0]
+        assert cached[1].formula is None and cached[1].model == models[1]
+
+        # Iný obsah datasetu má iný kľúč, cache pre neho neplatí
+        assert load_compiled_dataset(path, content_hash(texts[:1])) is None
+    print("Skompilovaná cache datasetu: OK")
+
+def test_parse_cache():
+    """Overí, že opätovné nahratie parsuje len zmenené príklady."""
+    texts = [example.text for example in iter_pl1_dataset(io.StringIO(DATASET))]
+    cache = ParseCache(max_size=2)
+
+    first = ingest_examples(texts, formula_to_model, cache=cache)
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 0
+
+    # Iné odsadenie je rovnaká formula, tretí príklad je nový
+    changed = ["  " + texts[0].replace("\n", "\n   ") + "\n", texts[1], "Ι(c₃, X7)"]
+    second = ingest_examples(changed, formula_to_model, cache=cache)
+    assert cache.hits == 2 and cache.misses == 3
+    assert second[0].model == first[0].model and second[0].model is not first[0].model
+    assert [result.index for result in second] == [0, 1, 2]
+    assert len(cache) == 2
+    print("ParseCache: OK")
+
+if __name__ == "__main__":
+    test_iter_dataset()
+    test_iter_dataset_is_lazy()
+    test_parse_dataset_compatibility()
+    test_formula_tree()
+    test_deep_formulas()
+    test_file_index()
+    test_block_diff()
+    test_compiled_cache()
+    test_parse_cache()